@@ -1,11 +1,13 @@
-from .connection import RedisConnection, create_connection
+from .connection import RedisConnection, RedisProtocol, create_connection
 from .commands import (
     Redis, create_redis,
     create_reconnecting_redis,
+    AutoPipeline,
     GeoPoint, GeoMember,
     )
 from .pool import RedisPool, create_pool
 from .pubsub import Channel
+from .stats import ConnectionStats, PoolStats
 from .errors import (
     ConnectionClosedError,
     MultiExecError,
@@ -16,18 +18,20 @@ from .errors import (
     ChannelClosedError,
     WatchVariableError,
     PoolClosedError,
+    PoolExhaustedError,
     )
 
 
 __version__ = '0.2.9'
 
 # make pyflakes happy
-(create_connection, RedisConnection,
- create_redis, create_reconnecting_redis, Redis,
+(create_connection, RedisConnection, RedisProtocol,
+ create_redis, create_reconnecting_redis, Redis, AutoPipeline,
  create_pool, RedisPool, Channel,
+ ConnectionStats, PoolStats,
  RedisError, ProtocolError, ReplyError,
  PipelineError, MultiExecError, ConnectionClosedError,
  ChannelClosedError, WatchVariableError,
- PoolClosedError,
+ PoolClosedError, PoolExhaustedError,
  GeoPoint, GeoMember,
  )
@@ -146,6 +146,10 @@ class AbcChannel(ABC):
         Called by RedisConnection when new message received.
         For pattern subscriptions data will be a tuple of
         channel name and message itself.
+
+        May return future connection must wait for before reading
+        more data (if it is done with exception connection is closed
+        with it) or None.
         """
 
     @abc.abstractmethod
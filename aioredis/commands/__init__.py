@@ -1,7 +1,12 @@
 import asyncio
 
-from aioredis.connection import create_connection
-from aioredis.util import _NOTSET
+from aioredis.connection import (
+    create_connection,
+    MAX_CHUNK_SIZE,
+    _PUBSUB_COMMANDS,
+    )
+from aioredis.util import _NOTSET, create_future
+from aioredis.stats import PoolStats
 from .generic import GenericCommandsMixin
 from .string import StringCommandsMixin
 from .hash import HashCommandsMixin
@@ -17,7 +22,7 @@ from .cluster import ClusterCommandsMixin
 from .geo import GeoCommandsMixin, GeoPoint, GeoMember
 
 __all__ = [
-    'create_redis', 'Redis',
+    'create_redis', 'Redis', 'AutoPipeline',
     'Pipeline', 'MultiExec',
     'GeoPoint', 'GeoMember',
 ]
@@ -32,10 +37,18 @@ class AutoConnector(object):
         self._conn = None
         self._loop = conn_kwargs.get('loop')
         self._lock = asyncio.Lock(loop=self._loop)
+        self._stats = PoolStats()
 
     def __repr__(self):
         return '<AutoConnector {!r}>'.format(self._conn)
 
+    @property
+    def stats(self):
+        """:class:`~aioredis.stats.PoolStats` aggregated over
+        all connections opened.
+        """
+        return self._stats
+
     @asyncio.coroutine
     def execute(self, *args, **kwargs):
         conn = yield from self.get_atomic_connection()
@@ -48,10 +61,129 @@ class AutoConnector(object):
                 if self._conn is None or self._conn.closed:
                     conn = yield from create_connection(
                         *self._conn_args, **self._conn_kwargs)
+                    if self._conn is not None:
+                        self._stats.connections_lost += 1
+                        self._stats.reconnects += 1
+                    self._stats.add_connection(conn.stats)
                     self._conn = conn
         return self._conn
 
 
+class AutoPipeline:
+    """Connection wrapper implicitly pipelining commands.
+
+    Commands executed by all tasks within one event loop iteration
+    (or within *flush_interval* seconds) are encoded into single buffer
+    and sent to connection with one write.
+    Batch is sent earlier when it reaches *max_batch_size* commands.
+
+    Usage:
+
+    >>> conn = await aioredis.create_connection(('localhost', 6379))
+    >>> redis = Redis(AutoPipeline(conn, max_batch_size=500))
+    >>> await asyncio.gather(redis.get('foo'), redis.get('bar'))
+    """
+
+    def __init__(self, connection, *, max_batch_size=1000, flush_interval=0):
+        assert isinstance(max_batch_size, int) and max_batch_size > 0, (
+            "max_batch_size must be int > 0", max_batch_size)
+        assert flush_interval >= 0, (
+            "flush_interval must be >= 0", flush_interval)
+        self._conn = connection
+        self._loop = connection._loop
+        self._max_batch_size = max_batch_size
+        self._flush_interval = flush_interval
+        self._pending = []
+        self._flush_handle = None
+        self._batch_count = 0
+        self._command_count = 0
+
+    def __repr__(self):
+        return '<AutoPipeline {!r}>'.format(self._conn)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    @property
+    def batch_count(self):
+        """Number of batches sent."""
+        return self._batch_count
+
+    @property
+    def command_count(self):
+        """Number of commands sent in batches."""
+        return self._command_count
+
+    @property
+    def avg_batch_size(self):
+        """Average number of commands per batch."""
+        if not self._batch_count:
+            return 0
+        return self._command_count / self._batch_count
+
+    def execute(self, command, *args, encoding=_NOTSET, timeout=_NOTSET):
+        if timeout is not _NOTSET or (
+                command is not None and
+                command.upper().strip() in _PUBSUB_COMMANDS):
+            self.flush()
+            return self._conn.execute(command, *args, encoding=encoding,
+                                      timeout=timeout)
+        fut = create_future(loop=self._loop)
+        self._pending.append((fut, command, args, encoding))
+        if len(self._pending) >= self._max_batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            if self._flush_interval:
+                self._flush_handle = self._loop.call_later(
+                    self._flush_interval, self.flush)
+            else:
+                self._flush_handle = self._loop.call_soon(self.flush)
+        return fut
+
+    @asyncio.coroutine
+    def execute_throttled(self, command, *args, **kwargs):
+        yield from self._conn.wait_capacity()
+        return (yield from self.execute(command, *args, **kwargs))
+
+    def execute_into(self, target, command, *args, timeout=_NOTSET):
+        self.flush()
+        return self._conn.execute_into(target, command, *args,
+                                       timeout=timeout)
+
+    def execute_pubsub(self, command, *channels):
+        self.flush()
+        return self._conn.execute_pubsub(command, *channels)
+
+    def flush(self):
+        """Sends all pending commands to connection."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self._batch_count += 1
+        self._command_count += len(batch)
+        self._conn._execute_batch(batch)
+
+    def select(self, db):
+        self.flush()
+        return self._conn.select(db)
+
+    def auth(self, password):
+        self.flush()
+        return self._conn.auth(password)
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    @asyncio.coroutine
+    def get_atomic_connection(self):
+        self.flush()
+        return (yield from self._conn.get_atomic_connection())
+
+
 class Redis(GenericCommandsMixin, StringCommandsMixin,
             HyperLogLogCommandsMixin, SetCommandsMixin,
             HashCommandsMixin, TransactionsCommandsMixin,
@@ -134,22 +266,49 @@ class Redis(GenericCommandsMixin, StringCommandsMixin,
 @asyncio.coroutine
 def create_redis(address, *, db=None, password=None, ssl=None,
                  encoding=None, commands_factory=Redis,
-                 loop=None):
+                 buffered=False, batch_writes=False,
+                 large_arg_size=MAX_CHUNK_SIZE, parser=None,
+                 command_timeout=None, max_in_flight=None,
+                 write_high_water=None, tcp_keepalive=None,
+                 autopipeline=False, autopipeline_max_batch_size=1000,
+                 autopipeline_flush_interval=0, loop=None):
     """Creates high-level Redis interface.
 
+    When autopipeline is True connection is wrapped with AutoPipeline
+    so commands issued within one event loop iteration are sent
+    as single batch; autopipeline_max_batch_size and
+    autopipeline_flush_interval are passed to it as max_batch_size
+    and flush_interval.
+
     This function is a coroutine.
     """
     conn = yield from create_connection(address, db=db,
                                         password=password,
                                         ssl=ssl,
                                         encoding=encoding,
+                                        buffered=buffered,
+                                        batch_writes=batch_writes,
+                                        large_arg_size=large_arg_size,
+                                        parser=parser,
+                                        command_timeout=command_timeout,
+                                        max_in_flight=max_in_flight,
+                                        write_high_water=write_high_water,
+                                        tcp_keepalive=tcp_keepalive,
                                         loop=loop)
+    if autopipeline:
+        conn = AutoPipeline(conn,
+                            max_batch_size=autopipeline_max_batch_size,
+                            flush_interval=autopipeline_flush_interval)
     return commands_factory(conn)
 
 
 @asyncio.coroutine
 def create_reconnecting_redis(address, *, db=None, password=None, ssl=None,
                               encoding=None, commands_factory=Redis,
+                              buffered=False, batch_writes=False,
+                              large_arg_size=MAX_CHUNK_SIZE, parser=None,
+                              command_timeout=None, max_in_flight=None,
+                              write_high_water=None, tcp_keepalive=None,
                               loop=None):
     """Creates high-level Redis interface.
 
@@ -160,7 +319,13 @@ def create_reconnecting_redis(address, *, db=None, password=None, ssl=None,
     # coroutine for forward compatibility
     conn = AutoConnector(address,
                          db=db, password=password, ssl=ssl,
-                         encoding=encoding, loop=loop)
+                         encoding=encoding, buffered=buffered,
+                         batch_writes=batch_writes,
+                         large_arg_size=large_arg_size, parser=parser,
+                         command_timeout=command_timeout,
+                         max_in_flight=max_in_flight,
+                         write_high_water=write_high_water,
+                         tcp_keepalive=tcp_keepalive, loop=loop)
     return commands_factory(conn)
 
 
@@ -1,8 +1,16 @@
 import asyncio
+import collections
 import functools
+import itertools
+import random
 
-from ..errors import RedisError, PipelineError, MultiExecError
-from ..util import wait_ok, async_task, create_future
+from ..errors import (
+    PipelineError,
+    MultiExecError,
+    WatchVariableError,
+    )
+from ..log import logger
+from ..util import wait_ok, async_task, create_future, _NOTSET, PY_35
 
 
 class TransactionsCommandsMixin:
@@ -52,12 +60,93 @@ class TransactionsCommandsMixin:
         return MultiExec(self._conn, self.__class__,
                          loop=self._conn._loop)
 
-    def pipeline(self):
+    @asyncio.coroutine
+    def transaction(self, func, *watch_keys, max_retries=10, backoff=.01):
+        """Executes optimistic-locking transaction re-trying it
+        when watched keys are changed.
+
+        Keys are watched on dedicated connection acquired from pool
+        if client uses one; single connection is locked so concurrent
+        transactions on it are run one by one (plain MULTI/EXEC or
+        WATCH on the same connection must not be used meanwhile).
+        Then ``func(redis, tr)`` is called
+        (it can be coroutine function) with client bound to this connection
+        to read current values and :class:`MultiExec` object
+        to buffer writes.
+        If any of watch_keys is changed before MULTI/EXEC is executed
+        whole cycle is repeated after random delay
+        (up to ``backoff * 2 ** retry`` seconds).
+        :exc:`~aioredis.WatchVariableError` is raised after max_retries
+        retries.
+
+        Returns MULTI/EXEC results.
+        Number of retries is counted in ``watch_retries`` of
+        connection stats.
+
+        Usage:
+
+        >>> async def incr(redis, tr):
+        ...     value = await redis.get('foo')
+        ...     tr.set('foo', int(value or 0) + 1)
+        >>> await redis.transaction(incr, 'foo')
+        [True]
+        """
+        assert max_retries >= 0, max_retries
+        pool = self._conn if hasattr(self._conn, 'acquire') else None
+        if pool is not None:
+            acquired = yield from pool.acquire()
+            conn = getattr(acquired, 'connection', acquired)
+        else:
+            conn = yield from self._conn.get_atomic_connection()
+            lock = conn._watch_lock
+            yield from lock.acquire()
+        redis = self.__class__(conn)
+        try:
+            for retry in itertools.count():
+                if watch_keys:
+                    yield from redis.watch(*watch_keys)
+                tr = redis.multi_exec()
+                try:
+                    res = func(redis, tr)
+                    if asyncio.iscoroutine(res):
+                        yield from res
+                except BaseException:
+                    if watch_keys and not conn.closed:
+                        yield from redis.unwatch()
+                    raise
+                if not tr._pipeline:
+                    # nothing to execute, EXEC won't be sent
+                    if watch_keys:
+                        yield from redis.unwatch()
+                    return (yield from tr.execute())
+                try:
+                    return (yield from tr.execute())
+                except WatchVariableError:
+                    if retry >= max_retries:
+                        raise
+                conn.stats.watch_retries += 1
+                logger.debug("Watched keys %r changed, retry %d",
+                             watch_keys, retry + 1)
+                yield from asyncio.sleep(
+                    random.uniform(0, backoff * 2 ** min(retry, 10)),
+                    loop=conn._loop)
+        finally:
+            if pool is not None:
+                pool.release(acquired)
+            else:
+                lock.release()
+
+    def pipeline(self, *, parallel=1):
         """Returns :class:`Pipeline` object to execute bulk of commands.
 
         It is provided for convenience.
         Commands can be pipelined without it.
 
+        When client uses :class:`~aioredis.RedisPool` and parallel
+        is more than 1 buffered commands are split into up to parallel
+        slices executed concurrently on separate pool connections
+        (commands order is kept only within a slice).
+
         Example:
 
         >>> pipe = redis.pipeline()
@@ -77,7 +166,35 @@ class TransactionsCommandsMixin:
         [2, 2]
         """
         return Pipeline(self._conn, self.__class__,
-                        loop=self._conn._loop)
+                        parallel=parallel, loop=self._conn._loop)
+
+    if PY_35:
+        def bulk(self, commands, *, chunk_size=1000, window=10000,
+                 encoding=_NOTSET, return_exceptions=False):
+            """Executes stream of commands with bounded memory usage.
+
+            Commands (sequences of command name and arguments) are taken
+            from iterable or async iterable and sent in chunks of
+            chunk_size commands (each chunk with single write);
+            not more than window commands are waiting for reply at once.
+            Replies are returned by async iterator in commands order.
+
+            When return_exceptions is True error replies are returned
+            in place of results, otherwise first error is raised
+            and iteration ends (replies of commands already sent
+            are discarded, no more commands are taken).
+
+            Usage example:
+
+            >>> commands = (('HSET', 'key:{}'.format(i), 'field', i)
+            ...             for i in range(5000000))
+            >>> async for res in redis.bulk(commands, chunk_size=500):
+            ...     pass
+            """
+            return _BulkIter(self._conn, commands, chunk_size=chunk_size,
+                             window=window, encoding=encoding,
+                             return_exceptions=return_exceptions,
+                             loop=self._conn._loop)
 
 
 class _RedisBuffer:
@@ -88,9 +205,9 @@ class _RedisBuffer:
         self._pipeline = pipeline
         self._loop = loop
 
-    def execute(self, cmd, *args, **kw):
+    def execute(self, cmd, *args, encoding=_NOTSET):
         fut = create_future(loop=self._loop)
-        self._pipeline.append((fut, cmd, args, kw))
+        self._pipeline.append((fut, cmd, args, encoding))
         return fut
 
     # TODO: add here or remove in connection methods like `select`, `auth` etc
@@ -99,6 +216,13 @@ class _RedisBuffer:
 class Pipeline:
     """Commands pipeline.
 
+    Commands are buffered without creating a task per command:
+    command methods returning future of connection's reply are
+    recorded as is, coroutines converting reply (eg wait_ok)
+    are stepped by pipeline itself.
+    On execute() all commands are encoded into single buffer
+    written to connection at once.
+
     Usage:
 
     >>> pipe = redis.pipeline()
@@ -114,11 +238,14 @@ class Pipeline:
     error_class = PipelineError
 
     def __init__(self, connection, commands_factory=lambda conn: conn,
-                 *, loop=None):
+                 *, parallel=1, loop=None):
+        assert isinstance(parallel, int) and parallel > 0, (
+            "parallel must be int > 0", parallel)
         if loop is None:
             loop = asyncio.get_event_loop()
         self._conn = connection
         self._loop = loop
+        self._parallel = parallel
         self._pipeline = []
         self._results = []
         self._buffer = _RedisBuffer(self._pipeline, loop=loop)
@@ -129,16 +256,29 @@ class Pipeline:
         assert not self._done, "Pipeline already executed. Create new one."
         attr = getattr(self._redis, name)
         if callable(attr):
+            loop = self._loop
+            results = self._results
 
             @functools.wraps(attr)
             def wrapper(*args, **kw):
+                assert not self._done, (
+                    "Pipeline already executed. Create new one.")
                 try:
-                    task = async_task(attr(*args, **kw), loop=self._loop)
+                    res = attr(*args, **kw)
+                    if isinstance(res, asyncio.Future):
+                        fut = res
+                    elif asyncio.iscoroutine(res):
+                        fut = create_future(loop=loop)
+                        _step_coro(res, fut, loop)
+                    else:
+                        fut = async_task(res, loop=loop)
                 except Exception as exc:
-                    task = create_future(loop=self._loop)
-                    task.set_exception(exc)
-                self._results.append(task)
-                return task
+                    fut = create_future(loop=loop)
+                    fut.set_exception(exc)
+                results.append(fut)
+                return fut
+            # next lookups don't get here
+            self.__dict__[name] = wrapper
             return wrapper
         return attr
 
@@ -161,19 +301,51 @@ class Pipeline:
 
     @asyncio.coroutine
     def _do_execute(self, *, return_exceptions=False):
-        conn = yield from self._conn.get_atomic_connection()
-        yield from asyncio.gather(*self._send_pipeline(conn),
-                                  loop=self._loop,
-                                  return_exceptions=True)
+        commands = self._pipeline
+        parallel = min(self._parallel, len(commands))
+        # only pool can provide several connections
+        if parallel > 1 and hasattr(self._conn, 'acquire'):
+            parallel = min(parallel, self._conn.maxsize)
+            size = -(-len(commands) // parallel)
+            yield from asyncio.gather(*[
+                self._execute_slice(commands[i:i + size])
+                for i in range(0, len(commands), size)],
+                loop=self._loop)
+        else:
+            conn = yield from self._conn.get_atomic_connection()
+            # buffered futures are resolved by connection as replies arrive
+            conn._execute_batch(commands)
         return (yield from self._gather_result(return_exceptions))
 
+    @asyncio.coroutine
+    def _execute_slice(self, commands):
+        # each slice holds single connection so concurrent pipelines
+        # can not deadlock acquiring connections
+        try:
+            conn = yield from self._conn.acquire()
+        except Exception as exc:
+            for fut, *spam in commands:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        try:
+            getattr(conn, 'connection', conn)._execute_batch(commands)
+            # replies come in order, so it's enough to wait for last one
+            for fut, *spam in reversed(commands):
+                if not fut.done():
+                    yield from asyncio.wait((fut,), loop=self._loop)
+                    break
+        finally:
+            self._conn.release(conn)
+
     @asyncio.coroutine
     def _gather_result(self, return_exceptions):
         errors = []
         results = []
         for fut in self._results:
             try:
-                res = yield from fut
+                # most results are ready, don't step into them
+                res = fut.result() if fut.done() else (yield from fut)
                 results.append(res)
             except Exception as exc:
                 errors.append(exc)
@@ -182,24 +354,99 @@ class Pipeline:
             raise self.error_class(errors)
         return results
 
-    def _send_pipeline(self, conn):
-        for fut, cmd, args, kw in self._pipeline:
+
+if PY_35:
+    class _BulkIter:
+        """Async iterator sending commands in chunks and returning
+        their replies.
+        """
+
+        def __init__(self, connection, commands, *, chunk_size, window,
+                     encoding, return_exceptions, loop):
+            assert isinstance(chunk_size, int) and chunk_size > 0, (
+                "chunk_size must be int > 0", chunk_size)
+            assert window >= chunk_size, (
+                "window must not be less than chunk_size", window)
+            self._conn = connection
+            if hasattr(commands, '__aiter__'):
+                self._commands = commands.__aiter__()
+                self._is_async = True
+            else:
+                self._commands = iter(commands)
+                self._is_async = False
+            self._chunk_size = chunk_size
+            self._window = window
+            self._encoding = encoding
+            self._return_exceptions = return_exceptions
+            self._loop = loop
+            self._atomic_conn = None
+            self._pending = collections.deque()
+            self._exhausted = False
+
+        def __aiter__(self):
+            return self
+
+        @asyncio.coroutine
+        def __anext__(self):
+            pending = self._pending
+            if (not self._exhausted and
+                    len(pending) + self._chunk_size <= self._window):
+                yield from self._fill()
+            if not pending:
+                raise StopAsyncIteration  # noqa
+            fut = pending.popleft()
             try:
-                result_fut = conn.execute(cmd, *args, **kw)
-                result_fut.add_done_callback(
-                    functools.partial(self._check_result, waiter=fut))
+                return fut.result() if fut.done() else (yield from fut)
             except Exception as exc:
-                fut.set_exception(exc)
-            else:
-                yield result_fut
-
-    def _check_result(self, fut, waiter):
-        if fut.cancelled():
-            waiter.cancel()
-        elif fut.exception():
-            waiter.set_exception(fut.exception())
-        else:
-            waiter.set_result(fut.result())
+                if self._return_exceptions:
+                    return exc
+                self._abort()
+                raise
+
+        def _abort(self):
+            # iteration ends with error: replies still in flight are
+            # dropped and their errors are marked as retrieved
+            self._exhausted = True
+            pending, self._pending = self._pending, collections.deque()
+            for fut in pending:
+                if not fut.done():
+                    fut.cancel()
+                elif not fut.cancelled():
+                    fut.exception()
+
+        @asyncio.coroutine
+        def _fill(self):
+            pending = self._pending
+            while len(pending) + self._chunk_size <= self._window:
+                chunk = yield from self._next_chunk()
+                if not chunk:
+                    self._exhausted = True
+                    return
+                conn = self._atomic_conn
+                if conn is None or conn.closed:
+                    conn = yield from self._conn.get_atomic_connection()
+                    self._atomic_conn = conn
+                batch = []
+                for command in chunk:
+                    fut = create_future(loop=self._loop)
+                    batch.append((fut, command[0] if command else None,
+                                  tuple(command[1:]), self._encoding))
+                    pending.append(fut)
+                conn._execute_batch(batch)
+
+        @asyncio.coroutine
+        def _next_chunk(self):
+            if not self._is_async:
+                return list(itertools.islice(self._commands,
+                                             self._chunk_size))
+            chunk = []
+            anext = self._commands.__anext__
+            for _ in range(self._chunk_size):
+                try:
+                    chunk.append((yield from anext().__await__()))
+                except StopAsyncIteration:  # noqa
+                    break
+            return chunk
 
 
 class MultiExec(Pipeline):
@@ -241,54 +488,71 @@ class MultiExec(Pipeline):
 
     @asyncio.coroutine
     def _do_execute(self, *, return_exceptions=False):
-        self._waiters = waiters = []
         conn = yield from self._conn.get_atomic_connection()
-        multi = conn.execute('MULTI')
-        coros = list(self._send_pipeline(conn))
-        exec_ = conn.execute('EXEC')
-        gather = asyncio.gather(multi, *coros, loop=self._loop,
-                                return_exceptions=True)
-        try:
-            yield from asyncio.shield(gather, loop=self._loop)
-        except asyncio.CancelledError:
-            yield from gather
-        finally:
-            if conn.closed:
-                for fut in waiters:
-                    fut.cancel()
-                for fut in self._results:
-                    if not fut.done():
-                        fut.cancel()
-            else:
-                try:
-                    results = yield from exec_
-                except RedisError as err:
-                    for fut in waiters:
-                        fut.set_exception(err)
-                else:
-                    assert len(results) == len(waiters), (
-                        "Results does not match waiters", results, waiters)
-                    self._resolve_waiters(results, return_exceptions)
-            return (yield from self._gather_result(return_exceptions))
-
-    def _resolve_waiters(self, results, return_exceptions):
-        errors = []
-        for val, fut in zip(results, self._waiters):
-            if isinstance(val, RedisError):
+        # MULTI, commands and EXEC are sent with single write,
+        # only EXEC reply has its own future
+        exec_, queued = conn._execute_transaction(self._pipeline)
+        # resolve futures even if execute() gets cancelled
+        exec_.add_done_callback(
+            functools.partial(self._resolve_waiters, queued))
+        yield from asyncio.wait((exec_,), loop=self._loop)
+        if (not return_exceptions and not exec_.cancelled() and
+                exec_.exception() is None):
+            errors = [val for val in exec_.result()
+                      if isinstance(val, Exception)]
+            if errors:
+                # errors are raised together, so futures' exceptions
+                # must not be reported as never retrieved
+                yield from self._gather_result(True)
+                raise self.error_class(errors)
+        return (yield from self._gather_result(return_exceptions))
+
+    def _resolve_waiters(self, queued, exec_):
+        if exec_.cancelled():
+            for fut in queued:
+                fut.cancel()
+            return
+        exc = exec_.exception()
+        if exc is not None:
+            for fut in queued:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        results = exec_.result()
+        assert len(results) == len(queued), (
+            "Results does not match waiters", results, queued)
+        # EXEC returned nil, all results are WatchVariableError
+        if results and isinstance(results[0], WatchVariableError):
+            self.error_class = WatchVariableError
+        for val, fut in zip(results, queued):
+            if fut.done():
+                continue
+            if isinstance(val, Exception):
                 fut.set_exception(val)
-                errors.append(val)
             else:
                 fut.set_result(val)
-        if errors and not return_exceptions:
-            raise MultiExecError(errors)
-
-    def _check_result(self, fut, waiter):
-        assert waiter not in self._waiters, (fut, waiter, self._waiters)
-        assert not waiter.done(), waiter
-        if fut.cancelled():     # yield from gather was cancelled
-            waiter.cancel()
-        elif fut.exception():   # server replied with error
-            waiter.set_exception(fut.exception())
-        elif fut.result() in {b'QUEUED', 'QUEUED'}:
-            # got result, it should be QUEUED
-            self._waiters.append(waiter)
+
+
+def _step_coro(coro, fut, loop):
+    """Runs coroutine until it waits for a future, resumes it when
+    the future is done and sets its result to fut (like asyncio.Task
+    but with no event loop iteration per step).
+    """
+    if fut.cancelled():
+        coro.close()
+        return
+    try:
+        waiting = coro.send(None)
+    except StopIteration as exc:
+        fut.set_result(exc.value)
+    except asyncio.CancelledError:
+        fut.cancel()
+    except Exception as exc:
+        fut.set_exception(exc)
+    else:
+        if waiting is None:
+            # bare yield
+            loop.call_soon(_step_coro, coro, fut, loop)
+        else:
+            waiting.add_done_callback(
+                lambda waiting: _step_coro(coro, fut, loop))
@@ -1,12 +1,14 @@
 import types
 import asyncio
-import hiredis
+import heapq
 import socket
 from functools import partial
 from collections import deque
 
 from .util import (
     encode_command,
+    encode_command_buffers,
+    join_buffers,
     wait_ok,
     _NOTSET,
     _set_result,
@@ -15,6 +17,7 @@ from .util import (
     decode,
     async_task,
     create_future,
+    _encode_args,
     )
 from .errors import (
     ConnectionClosedError,
@@ -23,12 +26,14 @@ from .errors import (
     ReplyError,
     WatchVariableError,
     )
+from .parser import Reader
 from .pubsub import Channel
+from .stats import ConnectionStats
 from .abc import AbcChannel
 from .log import logger
 
 
-__all__ = ['create_connection', 'RedisConnection']
+__all__ = ['create_connection', 'RedisConnection', 'RedisProtocol']
 
 MAX_CHUNK_SIZE = 65536
 
@@ -39,10 +44,24 @@ _PUBSUB_COMMANDS = (
     'PUNSUBSCRIBE', b'PUNSUBSCRIBE',
     )
 
+# commands blocking connection until reply,
+# last argument is server-side timeout (0 blocks forever)
+_BLOCKING_COMMANDS = frozenset([
+    'BLPOP', b'BLPOP',
+    'BRPOP', b'BRPOP',
+    'BRPOPLPUSH', b'BRPOPLPUSH',
+    ])
+
+_MULTI = encode_command(b'MULTI')
+_EXEC = encode_command(b'EXEC')
+
 
 @asyncio.coroutine
 def create_connection(address, *, db=None, password=None, ssl=None,
-                      encoding=None, loop=None):
+                      encoding=None, buffered=False, batch_writes=False,
+                      large_arg_size=MAX_CHUNK_SIZE, parser=None,
+                      command_timeout=None, max_in_flight=None,
+                      write_high_water=None, tcp_keepalive=None, loop=None):
     """Creates redis connection.
 
     Opens connection to Redis server specified by address argument.
@@ -57,31 +76,76 @@ def create_connection(address, *, db=None, password=None, ssl=None,
     Encoding argument can be used to decode byte-replies to strings.
     By default no decoding is done.
 
+    Buffered argument switches connection from StreamReader-based
+    reader task to RedisProtocol which feeds parser directly
+    from event loop callbacks.
+
+    Batch_writes argument enables write coalescing: commands issued
+    within one event loop iteration are sent with single transport write.
+
+    Large_arg_size argument sets size (in bytes) starting from which
+    command arguments are written to transport as separate buffers
+    instead of being copied into encoded command.
+
+    Parser argument is a protocol parser class with hiredis.Reader
+    interface (hiredis.Reader or aioredis.parser.PyReader);
+    by default hiredis.Reader is used if hiredis is installed.
+
+    Command_timeout argument sets default timeout (in seconds)
+    for commands executed on this connection.
+    Blocking commands (BLPOP, BRPOP, BRPOPLPUSH) get their server-side
+    timeout added to it and no default timeout when blocking forever.
+
+    Max_in_flight and write_high_water arguments limit number of
+    commands waiting for reply and size of transport write buffer
+    (in bytes); see RedisConnection.wait_capacity().
+
+    Tcp_keepalive argument enables TCP keepalive probes on TCP connection
+    after given number of seconds of inactivity.
+
     Return value is RedisConnection instance.
 
     This function is a coroutine.
     """
     assert isinstance(address, (tuple, list, str)), "tuple or str expected"
+    if loop is None:
+        loop = asyncio.get_event_loop()
 
     if isinstance(address, (list, tuple)):
         host, port = address
         logger.debug("Creating tcp connection to %r", address)
-        reader, writer = yield from asyncio.open_connection(
-            host, port, ssl=ssl, loop=loop)
+        if buffered:
+            _, reader = yield from loop.create_connection(
+                partial(RedisProtocol, loop=loop), host, port, ssl=ssl)
+            writer = reader
+        else:
+            reader, writer = yield from asyncio.open_connection(
+                host, port, ssl=ssl, loop=loop)
         sock = writer.transport.get_extra_info('socket')
         if sock is not None:
             sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if tcp_keepalive is not None:
+                _set_keepalive(sock, tcp_keepalive)
             address = sock.getpeername()
         address = tuple(address[:2])
     else:
         logger.debug("Creating unix connection to %r", address)
-        reader, writer = yield from asyncio.open_unix_connection(
-            address, ssl=ssl, loop=loop)
+        if buffered:
+            _, reader = yield from loop.create_unix_connection(
+                partial(RedisProtocol, loop=loop), address, ssl=ssl)
+            writer = reader
+        else:
+            reader, writer = yield from asyncio.open_unix_connection(
+                address, ssl=ssl, loop=loop)
         sock = writer.transport.get_extra_info('socket')
         if sock is not None:
             address = sock.getpeername()
     conn = RedisConnection(reader, writer, encoding=encoding,
-                           address=address, loop=loop)
+                           address=address, batch_writes=batch_writes,
+                           large_arg_size=large_arg_size, parser=parser,
+                           command_timeout=command_timeout,
+                           max_in_flight=max_in_flight,
+                           write_high_water=write_high_water, loop=loop)
 
     try:
         if password is not None:
@@ -95,10 +159,33 @@ def create_connection(address, *, db=None, password=None, ssl=None,
     return conn
 
 
+def _set_keepalive(sock, idle):
+    """Enables TCP keepalive: first probe is sent after idle seconds
+    of inactivity, connection is dropped after 3 unanswered probes.
+    """
+    idle = max(1, int(idle))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+    elif hasattr(socket, 'TCP_KEEPALIVE'):     # pragma: no cover
+        # macOS
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle)
+    if hasattr(socket, 'TCP_KEEPINTVL'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL,
+                        max(1, idle // 3))
+    if hasattr(socket, 'TCP_KEEPCNT'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+
+
 class RedisConnection:
     """Redis connection."""
 
-    def __init__(self, reader, writer, *, address, encoding=None, loop=None):
+    def __init__(self, reader, writer, *, address, encoding=None,
+                 batch_writes=False, large_arg_size=MAX_CHUNK_SIZE,
+                 parser=None, command_timeout=None, max_in_flight=None,
+                 write_high_water=None, loop=None):
+        assert max_in_flight is None or max_in_flight > 0, (
+            "max_in_flight must be > 0", max_in_flight)
         if loop is None:
             loop = asyncio.get_event_loop()
         self._reader = reader
@@ -106,20 +193,59 @@ class RedisConnection:
         self._address = address
         self._loop = loop
         self._waiters = deque()
-        self._parser = hiredis.Reader(protocolError=ProtocolError,
-                                      replyError=ReplyError)
-        self._reader_task = async_task(self._read_data(), loop=self._loop)
+        self._stats = ConnectionStats(self._waiters)
+        if parser is None:
+            parser = Reader
+        self._parser = parser(protocolError=ProtocolError,
+                              replyError=ReplyError)
+        # codec parser currently decodes replies with
+        # or _NOTSET if parser can not switch codecs (eg old hiredis)
+        if hasattr(self._parser, 'set_encoding'):
+            self._parser_encoding = None
+        else:
+            self._parser_encoding = _NOTSET
         self._db = 0
         self._closing = False
         self._closed = False
         self._close_waiter = create_future(loop=self._loop)
-        self._reader_task.add_done_callback(self._close_waiter.set_result)
+        if isinstance(reader, RedisProtocol):
+            # protocol feeds parser by itself, no reader task needed
+            self._reader_task = None
+            reader.set_connection(self)
+        else:
+            self._reader_task = async_task(self._read_data(),
+                                           loop=self._loop)
+            self._reader_task.add_done_callback(self._close_waiter.set_result)
         self._in_transaction = None
         self._transaction_error = None  # XXX: never used?
+        # WATCH state is per connection, Redis.transaction() calls
+        # sharing this connection must not interleave
+        self._watch_lock = asyncio.Lock(loop=loop)
         self._in_pubsub = 0
         self._pubsub_channels = coerced_keys_dict()
         self._pubsub_patterns = coerced_keys_dict()
+        # future to wait for before reading more data
+        self._read_paused = None
         self._encoding = encoding
+        self._write_buffer = bytearray() if batch_writes else None
+        self._flush_handle = None
+        self._large_arg_size = large_arg_size
+        # active streaming reply reader and writes held until
+        # streaming command becomes first in waiters queue
+        self._stream = None
+        self._held_writes = None
+        # heap of (deadline, id, future) for commands with timeout,
+        # single timer is scheduled for the earliest deadline;
+        # heap is rebuilt without completed futures once more
+        # than half of its entries are completed
+        self._command_timeout = command_timeout
+        self._deadlines = []
+        self._deadlines_done = 0
+        self._timeout_handle = None
+        self._max_in_flight = max_in_flight
+        self._capacity_waiters = deque()
+        if write_high_water is not None:
+            writer.transport.set_write_buffer_limits(high=write_high_water)
 
     def __repr__(self):
         return '<RedisConnection [db:{}]>'.format(self._db)
@@ -137,52 +263,149 @@ class RedisConnection:
                 #       before response
                 logger.error("Exception on data read %r", exc, exc_info=True)
                 break
-            self._parser.feed(data)
-            while True:
+            if not self._feed_data(data):
+                return
+            if self._read_paused is not None:
+                # Pub/Sub channel is full, wait for free space
                 try:
-                    obj = self._parser.gets()
-                except ProtocolError as exc:
-                    # ProtocolError is fatal
-                    # so connection must be closed
-                    self._closing = True
-                    self._loop.call_soon(self._do_close, exc)
-                    if self._in_transaction is not None:
-                        self._transaction_error = exc
-                    return
-                else:
-                    if obj is False:
-                        break
-                    if self._in_pubsub:
-                        self._process_pubsub(obj)
-                    else:
-                        self._process_data(obj)
+                    yield from self._read_paused
+                except asyncio.CancelledError:
+                    break
+                self._read_paused = None
         self._closing = True
         self._loop.call_soon(self._do_close, None)
 
+    def _feed_data(self, data, *args):
+        """Feeds data to parser and processes all complete replies.
+
+        Extra args (offset & length) are passed through to parser.
+        Returns False if protocol error occurred and connection is closing.
+        """
+        self._stats.bytes_read += args[1] if args else len(data)
+        if self._stream is not None:
+            data = self._feed_stream(data, *args)
+            if data is None:
+                return True
+            args = ()
+        self._parser.feed(data, *args)
+        while True:
+            if self._parser_encoding is not _NOTSET:
+                # replies are decoded by parser with codec of
+                # first waiter (pubsub messages are never decoded)
+                encoding = self._waiters[0][1] if self._waiters else None
+                if encoding != self._parser_encoding:
+                    self._parser.set_encoding(encoding)
+                    self._parser_encoding = encoding
+            try:
+                obj = self._parser.gets()
+            except UnicodeDecodeError as exc:
+                # parser skips reply it could not decode
+                waiter, *spam = self._waiters.popleft()
+                _set_exception(waiter, exc)
+                self._stats.replies_parsed += 1
+                self._stats.add_error(exc)
+                continue
+            except ProtocolError as exc:
+                # ProtocolError is fatal
+                # so connection must be closed
+                self._closing = True
+                self._loop.call_soon(self._do_close, exc)
+                if self._in_transaction is not None:
+                    self._transaction_error = exc
+                return False
+            else:
+                if obj is False:
+                    if self._held_writes is not None:
+                        self._release_writes()
+                    if self._capacity_waiters:
+                        self._wakeup_capacity_waiters()
+                    return True
+                self._stats.replies_parsed += 1
+                if self._in_pubsub:
+                    self._process_pubsub(obj)
+                else:
+                    self._process_data(obj)
+
     def _process_data(self, obj):
         """Processes command results."""
         waiter, encoding, cb = self._waiters.popleft()
         if isinstance(obj, RedisError):
             _set_exception(waiter, obj)
+            self._stats.add_error(obj)
             if self._in_transaction is not None:
                 self._transaction_error = obj
+                # EXEC failed (ie EXECABORT), transaction is discarded
+                if getattr(cb, 'func', None) == self._end_transaction:
+                    self._in_transaction = None
         else:
-            if encoding is not None:
+            if encoding is not None and self._parser_encoding is _NOTSET:
                 try:
                     obj = decode(obj, encoding)
                 except Exception as exc:
                     _set_exception(waiter, exc)
+                    self._stats.add_error(exc)
                     return
             if cb is not None:
                 try:
                     obj = cb(obj)
                 except Exception as exc:
                     _set_exception(waiter, exc)
+                    self._stats.add_error(exc)
                     return
             _set_result(waiter, obj)
             if self._in_transaction is not None:
                 self._in_transaction.append((encoding, cb))
 
+    def _feed_stream(self, data, *args):
+        """Feeds data to active streaming reply reader.
+
+        Returns data left after streamed reply (to be fed to parser).
+        """
+        data = memoryview(data)
+        if args:
+            offset, length = args
+            data = data[offset:offset + length]
+        stream = self._stream
+        consumed = stream.feed(data)
+        if not stream.done:
+            return None
+        self._stream = None
+        waiter, *spam = self._waiters[0]
+        if stream.header is not None:
+            # not a bulk-string reply, let parser process it as usual
+            self._waiters[0] = (waiter, None, None)
+            self._parser.feed(stream.header)
+        else:
+            self._waiters.popleft()
+            self._stats.replies_parsed += 1
+            if stream.error is not None:
+                _set_exception(waiter, stream.error)
+                self._stats.add_error(stream.error)
+            else:
+                _set_result(waiter, stream.size)
+            if self._held_writes is not None:
+                self._release_writes()
+        return data[consumed:]
+
+    def _release_writes(self):
+        """Writes held commands if streaming command is first in queue.
+
+        Commands following next streaming command are held further.
+        """
+        held = self._held_writes
+        waiter, buffers, stream = held.popleft()
+        if not self._waiters or self._waiters[0][0] is not waiter:
+            held.appendleft((waiter, buffers, stream))
+            return
+        self._held_writes = None
+        self._stream = stream
+        buffers = list(buffers)
+        while held and held[0][2] is None:
+            buffers.extend(held.popleft()[1])
+        self._write(join_buffers(buffers, self._large_arg_size))
+        if held:
+            self._held_writes = held
+
     def _process_pubsub(self, obj, *, process_waiters=True):
         """Processes pubsub messages."""
         kind, *pattern, chan, data = obj
@@ -203,35 +426,376 @@ class RedisConnection:
                     ch.close()
             self._in_pubsub = data
         elif kind == b'message':
-            self._pubsub_channels[chan].put_nowait(data)
+            self._put_message(self._pubsub_channels[chan], data)
         elif kind == b'pmessage':
             pattern = pattern[0]
-            self._pubsub_patterns[pattern].put_nowait((chan, data))
+            self._put_message(self._pubsub_patterns[pattern], (chan, data))
         else:
             logger.warning("Unknown pubsub message received %r", obj)
 
-    def execute(self, command, *args, encoding=_NOTSET):
+    def _put_message(self, ch, data):
+        waiter = ch.put_nowait(data)
+        if waiter is None:
+            return
+        if waiter.done():
+            # channel overflow policy requires disconnect
+            exc = waiter.exception()
+            if not self._closing:
+                logger.warning("Closing connection %r: %s", self, exc)
+                self._closing = True
+                self._loop.call_soon(self._do_close, exc)
+        elif self._read_paused is None:
+            self._read_paused = waiter
+            if self._reader_task is None:
+                # protocol feeds data by itself, so pause transport
+                self._writer.transport.pause_reading()
+                waiter.add_done_callback(self._resume_reading)
+
+    def _resume_reading(self, waiter):
+        self._read_paused = None
+        if self._writer is not None and not self._closing:
+            self._writer.transport.resume_reading()
+
+    def execute(self, command, *args, encoding=_NOTSET, timeout=_NOTSET):
         """Executes redis command and returns Future waiting for the answer.
 
+        Arguments can be of bytes, str, int, float type or any object
+        supporting buffer protocol (memoryview, array.array, etc).
+        Buffers must not be modified until command is completed.
+
+        Timeout (in seconds) overrides connection's command_timeout
+        (which is extended by server-side timeout of blocking command),
+        None disables timeout.
+        When command times out connection is closed as its replies
+        can not be matched with waiters any more.
+
         Raises:
         * TypeError if any of args can not be encoded as bytes.
         * ReplyError on redis '-ERR' resonses.
         * ProtocolError when response can not be decoded meaning connection
           is broken.
+        * asyncio.TimeoutError if command timed out.
         """
-        if self._reader is None or self._reader.at_eof():
+        if (self._reader is None or self._reader.at_eof() or
+                self._closing):
             raise ConnectionClosedError("Connection closed or corrupted")
         if command is None:
             raise TypeError("command must not be None")
-        if None in set(args):
-            raise TypeError("args must not contain None")
         command = command.upper().strip()
-        is_pubsub = command in _PUBSUB_COMMANDS
-        if self._in_pubsub and not is_pubsub:
-            raise RedisError("Connection in SUBSCRIBE mode")
-        elif is_pubsub:
+        if command in _PUBSUB_COMMANDS:
             logger.warning("Deprecated. Use `execute_pubsub` method directly")
             return self.execute_pubsub(command, *args)
+        data, cb = self._encode_command(command, args)
+        if encoding is _NOTSET:
+            encoding = self._encoding
+        fut = create_future(loop=self._loop)
+        self._write(data)
+        waiters = self._waiters
+        waiters.append((fut, encoding, cb))
+        stats = self._stats
+        stats.commands_sent += 1
+        if len(waiters) > stats.in_flight_peak:
+            stats.in_flight_peak = len(waiters)
+        if timeout is _NOTSET:
+            timeout = self._default_timeout(command, args)
+        if timeout is not None:
+            self._set_timeout(fut, timeout)
+        return fut
+
+    def execute_into(self, target, command, *args, timeout=_NOTSET):
+        """Executes redis command and streams its bulk-string reply
+        into target.
+
+        Target is either writable buffer (bytearray, memoryview, mmap, etc)
+        large enough to hold the reply or binary file-like object.
+        Reply payload is copied to target as it is received, without
+        creating intermediate bytes objects.
+
+        Returns Future waiting for number of bytes written.
+        Replies other than bulk-string are not streamed and returned
+        as is (ie None for nil reply).
+        Timeout is the same as for execute().
+
+        Raises:
+        * TypeError if any of args can not be encoded as bytes
+          or target is neither writable buffer nor file-like object.
+        * ValueError if command can not be streamed or
+          (set to future) if buffer is too small for the reply.
+        * ReplyError on redis '-ERR' resonses.
+        """
+        if (self._reader is None or self._reader.at_eof() or
+                self._closing):
+            raise ConnectionClosedError("Connection closed or corrupted")
+        if command is None:
+            raise TypeError("command must not be None")
+        command = command.upper().strip()
+        if command in _PUBSUB_COMMANDS:
+            raise ValueError("Pub/Sub command can not be streamed", command)
+        stream = _BulkStream(target)
+        data, cb = self._encode_command(command, args)
+        if cb is not None:
+            raise ValueError("Command can not be streamed", command)
+        fut = create_future(loop=self._loop)
+        if self._waiters or self._held_writes is not None:
+            # command is sent only when all preceding replies are
+            # received so that parser has no data of streamed reply.
+            if self._held_writes is None:
+                self._held_writes = deque()
+            self._held_writes.append((fut, data, stream))
+        else:
+            self._stream = stream
+            self._write(data)
+        self._waiters.append((fut, None, stream))
+        stats = self._stats
+        stats.commands_sent += 1
+        if len(self._waiters) > stats.in_flight_peak:
+            stats.in_flight_peak = len(self._waiters)
+        if timeout is _NOTSET:
+            timeout = self._default_timeout(command, args)
+        if timeout is not None:
+            self._set_timeout(fut, timeout)
+        return fut
+
+    @asyncio.coroutine
+    def execute_throttled(self, command, *args, **kwargs):
+        """Coroutine variant of execute(): waits for connection capacity
+        (see wait_capacity()) before sending command
+        and returns its result.
+        """
+        yield from self.wait_capacity()
+        return (yield from self.execute(command, *args, **kwargs))
+
+    @asyncio.coroutine
+    def wait_capacity(self):
+        """Waits until number of commands waiting for reply is below
+        max_in_flight and transport write buffer is below its
+        high-water mark.
+
+        Raises ConnectionClosedError if connection is closed.
+        """
+        while True:
+            if self._reader is None or self._closing:
+                raise ConnectionClosedError("Connection closed")
+            max_in_flight = self._max_in_flight
+            if max_in_flight is None or len(self._waiters) < max_in_flight:
+                break
+            waiter = create_future(loop=self._loop)
+            self._capacity_waiters.append(waiter)
+            try:
+                yield from waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # wakeup was consumed, pass it to next waiter
+                    self._wakeup_capacity_waiters()
+                raise
+        try:
+            yield from self._writer.drain()
+        except ConnectionResetError:
+            raise ConnectionClosedError("Connection closed") from None
+
+    def _wakeup_capacity_waiters(self):
+        waiters = self._capacity_waiters
+        if self._max_in_flight is None:
+            free = len(waiters)
+        else:
+            free = self._max_in_flight - len(self._waiters)
+        while waiters and free > 0:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def _execute_batch(self, commands):
+        """Executes batch of commands with single write.
+
+        Commands is a sequence of (future, command, args, encoding) tuples.
+        Any error is set to corresponding future;
+        commands with already cancelled futures are not sent.
+        """
+        if (self._reader is None or self._reader.at_eof() or
+                self._closing):
+            exc = ConnectionClosedError("Connection closed or corrupted")
+            for fut, *spam in commands:
+                _set_exception(fut, exc)
+            return
+        # all commands are encoded into one parts list joined once
+        parts = []
+        entries, largest = self._encode_batch(commands, parts)
+        if entries:
+            self._write_parts(parts, largest)
+            self._waiters.extend(entries)
+            self._count_sent(len(entries))
+            if self._command_timeout is not None:
+                # commands failed to encode or cancelled are done
+                for fut, command, args, encoding in commands:
+                    if not fut.done():
+                        timeout = self._default_timeout(command, args)
+                        if timeout is not None:
+                            self._set_timeout(fut, timeout)
+
+    def _execute_transaction(self, commands):
+        """Executes commands in MULTI/EXEC block with single write.
+
+        Commands is a sequence of (future, command, args, encoding) tuples
+        (the same as for _execute_batch).
+        No future is created for MULTI and QUEUED replies:
+        error reply is set to future of corresponding command,
+        futures of queued commands are to be resolved from EXEC reply.
+
+        Returns EXEC reply future and list of queued commands futures
+        (filled as QUEUED replies are received).
+        """
+        if (self._reader is None or self._reader.at_eof() or
+                self._closing):
+            raise ConnectionClosedError("Connection closed or corrupted")
+        if self._in_pubsub:
+            raise RedisError("Connection in SUBSCRIBE mode")
+        parts = [_MULTI]
+        entries, largest = self._encode_batch(commands, parts)
+        parts.append(_EXEC)
+        replies = _QueuedReplies([fut for fut, *spam in entries])
+        exec_ = create_future(loop=self._loop)
+        waiters = self._waiters
+        waiters.append((replies, self._encoding, self._start_transaction))
+        waiters.extend((replies, encoding, cb)
+                       for fut, encoding, cb in entries)
+        waiters.append((exec_, self._encoding,
+                        partial(self._end_transaction, discard=False)))
+        self._write_parts(parts, largest)
+        self._count_sent(len(entries) + 2)
+        if self._command_timeout is not None:
+            self._set_timeout(exec_, self._command_timeout)
+        return exec_, replies.queued
+
+    def _encode_batch(self, commands, parts):
+        """Encodes commands into parts list.
+
+        Returns list of (future, encoding, callback) waiters of encoded
+        commands and size of the largest argument.
+        Encoding errors are set to futures of commands;
+        commands with already cancelled futures are skipped.
+        """
+        entries = []
+        largest = 0
+        for fut, command, args, encoding in commands:
+            if fut.done():
+                continue
+            mark = len(parts)
+            try:
+                if command is None:
+                    raise TypeError("command must not be None")
+                command = command.upper().strip()
+                if command in _PUBSUB_COMMANDS:
+                    raise ValueError(
+                        "Pub/Sub command can not be batched", command)
+                cb = self._command_callback(command, args)
+                size = _encode_args((command,) + args, parts)
+            except Exception as exc:
+                del parts[mark:]
+                fut.set_exception(exc)
+                continue
+            if size > largest:
+                largest = size
+            if encoding is _NOTSET:
+                encoding = self._encoding
+            entries.append((fut, encoding, cb))
+        return entries, largest
+
+    def _write_parts(self, parts, largest):
+        if largest < self._large_arg_size:
+            self._write([b''.join(parts)])
+        else:
+            self._write(join_buffers(parts, self._large_arg_size))
+
+    def _count_sent(self, count):
+        stats = self._stats
+        stats.commands_sent += count
+        if len(self._waiters) > stats.in_flight_peak:
+            stats.in_flight_peak = len(self._waiters)
+
+    def _default_timeout(self, command, args):
+        """Returns command_timeout extended by server-side timeout
+        of blocking command or None if command blocks forever.
+        """
+        timeout = self._command_timeout
+        if (timeout is None or
+                command.upper().strip() not in _BLOCKING_COMMANDS):
+            return timeout
+        try:
+            blocking = float(args[-1])
+        except (IndexError, TypeError, ValueError):
+            # server replies with error right away
+            return timeout
+        if blocking == 0:
+            return None
+        return timeout + max(blocking, 0)
+
+    def _set_timeout(self, fut, timeout):
+        entry = (self._loop.time() + timeout, id(fut), fut)
+        heapq.heappush(self._deadlines, entry)
+        fut.add_done_callback(self._timeout_done)
+        if self._deadlines[0] is entry:
+            if self._timeout_handle is not None:
+                self._timeout_handle.cancel()
+            self._timeout_handle = self._loop.call_at(
+                entry[0], self._check_timeouts)
+
+    def _timeout_done(self, fut):
+        self._deadlines_done += 1
+        deadlines = self._deadlines
+        if self._deadlines_done * 2 <= len(deadlines):
+            return
+        # drop completed futures so their results are not kept alive
+        deadlines = [entry for entry in deadlines if not entry[2].done()]
+        heapq.heapify(deadlines)
+        self._deadlines = deadlines
+        self._deadlines_done = 0
+        if not deadlines and self._timeout_handle is not None:
+            self._timeout_handle.cancel()
+            self._timeout_handle = None
+
+    def _check_timeouts(self):
+        """Fails expired commands and closes connection if any."""
+        self._timeout_handle = None
+        deadlines = self._deadlines
+        now = self._loop.time()
+        expired = []
+        while deadlines:
+            deadline, _, fut = deadlines[0]
+            if not fut.done():
+                if deadline > now:
+                    break
+                expired.append(fut)
+            heapq.heappop(deadlines)
+        if expired:
+            logger.warning("%d command(s) timed out, closing connection %r",
+                           len(expired), self)
+            for fut in expired:
+                fut.set_exception(asyncio.TimeoutError())
+                self._stats.add_error(fut.exception())
+            self._do_close(ConnectionClosedError(
+                "Connection closed after command timeout"))
+        elif deadlines:
+            self._timeout_handle = self._loop.call_at(
+                deadlines[0][0], self._check_timeouts)
+
+    def _encode_command(self, command, args):
+        """Checks and encodes (non Pub/Sub) command.
+
+        Returns list of encoded buffers and reply callback.
+        """
+        cb = self._command_callback(command, args)
+        return encode_command_buffers((command,) + args,
+                                      self._large_arg_size), cb
+
+    def _command_callback(self, command, args):
+        """Checks (non Pub/Sub) command and returns its reply callback
+        or None.
+        """
+        if any(arg is None for arg in args):
+            raise TypeError("args must not contain None")
+        if self._in_pubsub:
+            raise RedisError("Connection in SUBSCRIBE mode")
 
         if command in ('SELECT', b'SELECT'):
             cb = partial(self._set_db, args=args)
@@ -241,14 +805,11 @@ class RedisConnection:
             cb = partial(self._end_transaction, discard=False)
         elif command in ('DISCARD', b'DISCARD'):
             cb = partial(self._end_transaction, discard=True)
+        elif command in ('QUIT', b'QUIT'):
+            cb = self._quit
         else:
             cb = None
-        if encoding is _NOTSET:
-            encoding = self._encoding
-        fut = create_future(loop=self._loop)
-        self._writer.write(encode_command(command, *args))
-        self._waiters.append((fut, encoding, cb))
-        return fut
+        return cb
 
     def execute_pubsub(self, command, *channels):
         """Executes redis (p)subscribe/(p)unsubscribe commands.
@@ -279,9 +840,47 @@ class RedisConnection:
             res.append(fut)
             cb = partial(self._update_pubsub, ch=ch)
             self._waiters.append((fut, None, cb))
-        self._writer.write(cmd)
+        self._write([cmd])
+        self._stats.commands_sent += 1
         return asyncio.gather(*res, loop=self._loop)
 
+    def _write(self, buffers):
+        """Writes list of encoded buffers to transport or to write buffer.
+
+        More than one buffer means there are large arguments which are
+        passed to transport as is (with writelines).
+        Buffered data is flushed once per event loop iteration
+        or as soon as it grows over MAX_CHUNK_SIZE bytes.
+        """
+        if self._held_writes is not None:
+            self._held_writes.append((None, buffers, None))
+            return
+        buf = self._write_buffer
+        if len(buffers) > 1:
+            self._stats.bytes_written += sum(map(len, buffers))
+            if buf:
+                self._flush_writes()
+            self._writer.writelines(buffers)
+            return
+        self._stats.bytes_written += len(buffers[0])
+        if buf is None:
+            self._writer.write(buffers[0])
+            return
+        buf.extend(buffers[0])
+        if len(buf) >= MAX_CHUNK_SIZE:
+            self._flush_writes()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_soon(self._flush_writes)
+
+    def _flush_writes(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._write_buffer and self._writer is not None:
+            # transport may keep reference to data so new buffer is used
+            data, self._write_buffer = self._write_buffer, bytearray()
+            self._writer.write(data)
+
     def close(self):
         """Close connection."""
         self._do_close(None)
@@ -291,9 +890,27 @@ class RedisConnection:
             return
         self._closed = True
         self._closing = False
+        self._stats.closed = True
+        if exc is not None:
+            self._stats.add_error(exc)
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._stream = None
+        self._held_writes = None
+        if self._timeout_handle is not None:
+            self._timeout_handle.cancel()
+            self._timeout_handle = None
+        self._deadlines = []
+        self._deadlines_done = 0
+        while self._capacity_waiters:
+            waiter = self._capacity_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
         self._writer.transport.close()
-        self._reader_task.cancel()
-        self._reader_task = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
         self._writer = None
         self._reader = None
         while self._waiters:
@@ -301,7 +918,7 @@ class RedisConnection:
             logger.debug("Cancelling waiter %r", (waiter, spam))
             if exc is None:
                 waiter.cancel()
-            else:
+            elif not waiter.done():
                 waiter.set_exception(exc)
         while self._pubsub_channels:
             _, ch = self._pubsub_channels.popitem()
@@ -330,6 +947,26 @@ class RedisConnection:
         """Currently selected db index."""
         return self._db
 
+    @property
+    def in_flight(self):
+        """Number of commands waiting for reply."""
+        return len(self._waiters)
+
+    @property
+    def stats(self):
+        """:class:`~aioredis.stats.ConnectionStats` of this connection."""
+        return self._stats
+
+    @property
+    def buffered_bytes(self):
+        """Number of bytes buffered for sending."""
+        if self._writer is None:
+            return 0
+        size = self._writer.transport.get_write_buffer_size()
+        if self._write_buffer:
+            size += len(self._write_buffer)
+        return size
+
     @property
     def encoding(self):
         """Current set codec or None."""
@@ -355,6 +992,14 @@ class RedisConnection:
         self._db = args[0]
         return ok
 
+    def _quit(self, ok):
+        # server closes connection right after reply
+        # so no more commands must be sent.
+        if not self._closing:
+            self._closing = True
+            self._loop.call_soon(self._do_close, None)
+        return ok
+
     def _start_transaction(self, ok):
         assert self._in_transaction is None, (
             "Connection is already in transaction", self._in_transaction)
@@ -372,7 +1017,7 @@ class RedisConnection:
             return obj
         assert isinstance(obj, list) or (obj is None and not discard), (
             "Unexpected MULTI/EXEC result", obj, recall)
-        # TODO: need to be able to re-try transaction
+        # watched keys were changed, Redis.transaction() re-tries it
         if obj is None:
             err = WatchVariableError("WATCH variable has changed")
             obj = [err] * len(recall)
@@ -434,3 +1079,242 @@ class RedisConnection:
     @asyncio.coroutine
     def get_atomic_connection(self):
         return self
+
+
+class _QueuedReplies:
+    """Waiter of MULTI and QUEUED replies of transaction sent by
+    RedisConnection._execute_transaction().
+
+    Takes place of a future in connection waiters queue for each
+    of these replies, so no future is created per command:
+    error reply is set to corresponding command future,
+    futures of queued commands are appended to queued list.
+    """
+
+    __slots__ = ('_futures', 'queued')
+
+    def __init__(self, futures):
+        self._futures = deque(futures)
+        self._futures.appendleft(None)  # MULTI reply
+        self.queued = []
+
+    def done(self):
+        return False
+
+    def set_result(self, result):
+        fut = self._futures.popleft()
+        if fut is not None:
+            self.queued.append(fut)
+
+    def set_exception(self, exc):
+        fut = self._futures.popleft()
+        if fut is not None:
+            _set_exception(fut, exc)
+
+    def cancel(self):
+        fut = self._futures.popleft()
+        if fut is not None:
+            fut.cancel()
+
+
+class _BulkStream:
+    """Reads bulk-string reply payload directly into target
+    buffer or file.
+    """
+
+    _MAX_HEADER = 32
+
+    def __init__(self, target):
+        try:
+            view = memoryview(target)
+        except TypeError:
+            if not callable(getattr(target, 'write', None)):
+                raise TypeError("Target {!r} expected to be writable buffer"
+                                " or file-like object".format(target))
+            self._view = None
+            self._file_write = target.write
+        else:
+            if view.readonly or not view.c_contiguous:
+                raise TypeError("Target {!r} expected to be writable"
+                                " C-contiguous buffer".format(target))
+            if view.format != 'B' or view.ndim != 1:
+                view = view.cast('B')
+            self._view = view
+            self._file_write = None
+        self._line = bytearray()
+        self._left = -1     # payload bytes left, -1 while reading header
+        self._tail = 2      # trailing CRLF
+        self._offset = 0
+        self.done = False
+        self.size = None
+        self.error = None
+        # set to read header bytes if reply is not a bulk-string
+        self.header = None
+
+    def feed(self, data):
+        """Consumes reply data, returns number of bytes consumed."""
+        pos = 0
+        if self._left < 0:
+            line = self._line
+            chunk = bytes(data[:self._MAX_HEADER - len(line)])
+            idx = chunk.find(b'\n')
+            if idx < 0:
+                line.extend(chunk)
+                if line[:1] not in (b'', b'$') or (
+                        len(line) >= self._MAX_HEADER):
+                    return self._not_bulk(len(chunk))
+                return len(chunk)
+            pos = idx + 1
+            line.extend(chunk[:pos])
+            try:
+                size = int(line[1:-2]) if line[:1] == b'$' else -1
+            except ValueError:
+                size = -1
+            if size < 0:
+                return self._not_bulk(pos)
+            self._left = self.size = size
+            if self._view is not None and size > len(self._view):
+                self.error = ValueError(
+                    "Buffer of {} bytes is too small for reply of {} bytes"
+                    .format(len(self._view), size))
+        if self._left:
+            chunk = data[pos:pos + self._left]
+            size = len(chunk)
+            self._left -= size
+            pos += size
+            if self.error is None:
+                self._write(chunk)
+        if not self._left:
+            tail = min(self._tail, len(data) - pos)
+            self._tail -= tail
+            pos += tail
+            self.done = not self._tail
+        return pos
+
+    def _write(self, chunk):
+        if self._view is not None:
+            end = self._offset + len(chunk)
+            self._view[self._offset:end] = chunk
+            self._offset = end
+            return
+        try:
+            self._file_write(chunk)
+        except Exception as exc:
+            self.error = exc
+
+    def _not_bulk(self, consumed):
+        self.header = bytes(self._line)
+        self.done = True
+        return consumed
+
+
+class RedisProtocol(getattr(asyncio, 'BufferedProtocol', asyncio.Protocol)):
+    """Redis connection protocol.
+
+    Alternative to StreamReader/StreamWriter pair: socket data is received
+    into reusable buffer and fed to connection's parser right from
+    event loop callback, so no reader task is needed.
+    On Python prior 3.7 (no asyncio.BufferedProtocol) falls back
+    to plain ``data_received`` callback.
+
+    Provides subset of StreamReader/StreamWriter interface
+    used by RedisConnection.
+    """
+
+    def __init__(self, *, loop=None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self._loop = loop
+        self._buffer = memoryview(bytearray(MAX_CHUNK_SIZE))
+        self._conn = None
+        self._eof = False
+        self._paused = False
+        self._drain_waiters = []
+        self.transport = None
+
+    def __repr__(self):
+        return '<RedisProtocol eof:{} {!r}>'.format(self._eof, self._conn)
+
+    def set_connection(self, conn):
+        self._conn = conn
+        if self._eof:
+            self._connection_lost()
+
+    # asyncio.Protocol interface
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def get_buffer(self, sizehint):
+        return self._buffer
+
+    def buffer_updated(self, nbytes):
+        conn = self._conn
+        if conn is not None and not (conn._closing or conn._closed):
+            conn._feed_data(self._buffer, 0, nbytes)
+
+    def data_received(self, data):
+        conn = self._conn
+        if conn is not None and not (conn._closing or conn._closed):
+            conn._feed_data(data)
+
+    def eof_received(self):
+        self._eof = True
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        self._wakeup_drain_waiters()
+
+    def connection_lost(self, exc):
+        if exc is not None:
+            # same as EOF in reader task, connection is simply closed
+            logger.debug("Connection lost %r", exc)
+        self._eof = True
+        self._wakeup_drain_waiters()
+        if self._conn is not None:
+            self._connection_lost()
+
+    def _connection_lost(self):
+        conn = self._conn
+        if not (conn._closing or conn._closed):
+            conn._closing = True
+            self._loop.call_soon(conn._do_close, None)
+        if not conn._close_waiter.done():
+            conn._close_waiter.set_result(None)
+
+    # StreamReader/StreamWriter compatible methods
+
+    def at_eof(self):
+        return self._eof
+
+    def feed_data(self, data):
+        # same as StreamReader.feed_data data is processed asynchronously
+        self._loop.call_soon(self.data_received, data)
+
+    def write(self, data):
+        self.transport.write(data)
+
+    def writelines(self, data):
+        self.transport.writelines(data)
+
+    @asyncio.coroutine
+    def drain(self):
+        """Waits until transport write buffer is below high-water mark."""
+        if self._eof:
+            raise ConnectionResetError("Connection lost")
+        if not self._paused:
+            return
+        waiter = create_future(loop=self._loop)
+        self._drain_waiters.append(waiter)
+        yield from waiter
+        if self._eof:
+            raise ConnectionResetError("Connection lost")
+
+    def _wakeup_drain_waiters(self):
+        waiters, self._drain_waiters = self._drain_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
@@ -8,6 +8,7 @@ __all__ = [
     'ChannelClosedError',
     'ConnectionClosedError',
     'PoolClosedError',
+    'PoolExhaustedError',
     ]
 
 
@@ -49,3 +50,7 @@ class ConnectionClosedError(RedisError):
 
 class PoolClosedError(RedisError):
     """Raised if pool is closed."""
+
+
+class PoolExhaustedError(RedisError):
+    """Raised if too many callers are waiting for pool connection."""
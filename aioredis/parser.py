@@ -0,0 +1,149 @@
+try:
+    import hiredis
+except ImportError:     # pragma: no cover
+    hiredis = None
+
+from .errors import ProtocolError, ReplyError
+
+
+__all__ = ['Reader', 'PyReader']
+
+
+class PyReader:
+    """Pure-Python RESP2 protocol parser.
+
+    Implements hiredis.Reader interface: data is fed with :meth:`feed`
+    and complete replies are returned by :meth:`gets`.
+
+    Data is accumulated in single bytearray and parsed in place by offsets;
+    partially received multi-bulk replies are kept between calls
+    so already parsed items are not parsed again.
+    """
+
+    def __init__(self, protocolError=ProtocolError, replyError=ReplyError,
+                 encoding=None, errors=None):
+        self._buffer = bytearray()
+        self._pos = 0
+        self._stack = []    # pending multi-bulk replies: [items, left]
+        self._protocol_error = protocolError
+        self._reply_error = replyError
+        self._encoding = encoding
+        self._errors = errors or 'strict'
+        self._error = None
+        self._decode_error = None
+
+    def feed(self, data, offset=0, length=-1):
+        """Appends data (any object supporting buffer protocol)
+        to internal buffer.
+        """
+        buf = self._buffer
+        if self._pos:
+            # CPython deletes bytearray head without moving data
+            del buf[:self._pos]
+            self._pos = 0
+        if offset or length >= 0:
+            if length < 0:
+                length = len(data) - offset
+            buf.extend(memoryview(data)[offset:offset + length])
+        else:
+            buf.extend(data)
+
+    def set_encoding(self, encoding=None, errors=None):
+        """Sets codec for decoding of following replies."""
+        self._encoding = encoding
+        self._errors = errors or 'strict'
+
+    def gets(self):
+        """Returns next complete reply or False."""
+        if self._error is not None:
+            raise self._error
+        buf = self._buffer
+        find = buf.find
+        encoding = self._encoding
+        errors = self._errors
+        stack = self._stack
+        pos = self._pos
+        try:
+            while True:
+                end = find(b'\r\n', pos)
+                if end < 0:
+                    break
+                kind = buf[pos]
+                if kind == 36:      # $
+                    size = int(buf[pos + 1:end])
+                    if size < 0:
+                        obj = None
+                        pos = end + 2
+                    else:
+                        start = end + 2
+                        end = start + size
+                        if end + 2 > len(buf):
+                            break
+                        if encoding is None:
+                            obj = bytes(buf[start:end])
+                        else:
+                            try:
+                                obj = buf[start:end].decode(encoding, errors)
+                            except UnicodeDecodeError as exc:
+                                obj = self._decode_failed(exc)
+                        pos = end + 2
+                elif kind == 58:    # :
+                    obj = int(buf[pos + 1:end])
+                    pos = end + 2
+                elif kind == 42:    # *
+                    size = int(buf[pos + 1:end])
+                    pos = end + 2
+                    if size > 0:
+                        stack.append([[], size])
+                        continue
+                    obj = None if size < 0 else []
+                elif kind == 43:    # +
+                    if encoding is None:
+                        obj = bytes(buf[pos + 1:end])
+                    else:
+                        try:
+                            obj = buf[pos + 1:end].decode(encoding, errors)
+                        except UnicodeDecodeError as exc:
+                            obj = self._decode_failed(exc)
+                    pos = end + 2
+                elif kind == 45:    # -
+                    obj = self._reply_error(
+                        buf[pos + 1:end].decode('utf-8', 'replace'))
+                    pos = end + 2
+                else:
+                    raise ValueError(
+                        "Protocol error, got {!r} as reply type byte"
+                        .format(chr(kind)))
+
+                while stack:
+                    top = stack[-1]
+                    top[0].append(obj)
+                    top[1] -= 1
+                    if top[1]:
+                        break
+                    obj = top[0]
+                    stack.pop()
+                else:
+                    self._pos = pos
+                    if self._decode_error is not None:
+                        # same as hiredis: whole reply is dropped
+                        exc, self._decode_error = self._decode_error, None
+                        raise exc
+                    return obj
+        except UnicodeDecodeError:
+            raise
+        except ValueError as exc:
+            self._error = self._protocol_error(str(exc))
+            raise self._error from None
+        self._pos = pos
+        return False
+
+    def _decode_failed(self, exc):
+        # error is raised once whole reply is parsed
+        if self._decode_error is None:
+            self._decode_error = exc
+
+
+#: Default parser class: hiredis.Reader if hiredis is installed,
+#: PyReader otherwise.
+Reader = hiredis.Reader if hiredis is not None else PyReader
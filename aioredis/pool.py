@@ -1,20 +1,62 @@
 import asyncio
 import collections
+import math
 import sys
 import warnings
+import weakref
 
 from .commands import create_redis, Redis
+from .connection import MAX_CHUNK_SIZE, _BLOCKING_COMMANDS
 from .log import logger
-from .util import async_task, _NOTSET
-from .errors import PoolClosedError
+from .stats import PoolStats
+from .util import async_task, create_future, _NOTSET
+from .errors import PoolClosedError, PoolExhaustedError
 
 
 PY_35 = sys.version_info >= (3, 5)
 
+# adaptive sizing: grow when more than 80% of pool size is in use
+# (or callers had to wait), shrink when less than 40% is in use
+# for 3 intervals in a row; target is sized for 60% utilization
+_GROW_UTILIZATION = .8
+_SHRINK_UTILIZATION = .4
+_TARGET_UTILIZATION = .6
+_SHRINK_INTERVALS = 3
+
+# handed over to waiter instead of None when free slot
+# was freed by lost connection
+_LOST_SLOT = object()
+
+# commands changing connection state; can not be executed through pool
+_EXCLUSIVE_COMMANDS = frozenset([
+    'MULTI', b'MULTI',
+    'EXEC', b'EXEC',
+    'DISCARD', b'DISCARD',
+    'WATCH', b'WATCH',
+    'UNWATCH', b'UNWATCH',
+    'SELECT', b'SELECT',
+    'AUTH', b'AUTH',
+    'QUIT', b'QUIT',
+    'MONITOR', b'MONITOR',
+    'SUBSCRIBE', b'SUBSCRIBE',
+    'PSUBSCRIBE', b'PSUBSCRIBE',
+    'UNSUBSCRIBE', b'UNSUBSCRIBE',
+    'PUNSUBSCRIBE', b'PUNSUBSCRIBE',
+    ])
+
 
 @asyncio.coroutine
 def create_pool(address, *, db=0, password=None, ssl=None, encoding=None,
-                minsize=1, maxsize=10, commands_factory=_NOTSET, loop=None):
+                minsize=1, maxsize=10, commands_factory=_NOTSET,
+                buffered=False, batch_writes=False,
+                large_arg_size=MAX_CHUNK_SIZE, parser=None,
+                command_timeout=None, max_in_flight=None,
+                write_high_water=None, multiplexed=False,
+                idle_timeout=None, max_lifetime=None,
+                connect_concurrency=10, prewarm=False, max_waiters=None,
+                health_check_interval=None, tcp_keepalive=None,
+                adaptive_interval=None, blocking_pool_size=None,
+                loop=None):
     """Creates Redis Pool.
 
     By default it creates pool of Redis instances, but it is
@@ -23,7 +65,34 @@ def create_pool(address, *, db=0, password=None, ssl=None, encoding=None,
 
     *commands_factory* parameter is deprecated since v0.2.9
 
-    All arguments are the same as for create_connection.
+    When multiplexed is True simple commands executed with
+    pool.execute() are sent through free connections without
+    acquiring them (see RedisPool.execute()).
+
+    Idle_timeout and max_lifetime (in seconds) make pool close
+    free connections idle for too long (keeping minsize connections)
+    and recycle connections older than max_lifetime, one at a time.
+
+    Minsize connections are opened concurrently, connect_concurrency
+    at a time; when prewarm is True each one is checked with PING.
+
+    Max_waiters limits number of acquire() calls waiting for connection
+    when pool is exhausted, PoolExhaustedError is raised when exceeded.
+
+    When health_check_interval is set free connections idle for that
+    many seconds are checked with PING and evicted if it fails.
+
+    When adaptive_interval is set pool size limit is adjusted between
+    minsize and maxsize every adaptive_interval seconds according to
+    observed utilization and acquire wait times
+    (see RedisPool.sizing_stats()).
+
+    When blocking_pool_size is set blocking commands (BLPOP, BRPOP,
+    BRPOPLPUSH) executed with pool.execute() are sent through separate
+    pool of up to blocking_pool_size connections so they never hold
+    connections needed for other commands (see RedisPool.blocking_pool).
+
+    All other arguments are the same as for create_connection.
 
     Returns RedisPool instance.
     """
@@ -37,9 +106,22 @@ def create_pool(address, *, db=0, password=None, ssl=None, encoding=None,
     pool = RedisPool(address, db, password, encoding,
                      minsize=minsize, maxsize=maxsize,
                      commands_factory=commands_factory,
-                     ssl=ssl, loop=loop)
+                     ssl=ssl, buffered=buffered,
+                     batch_writes=batch_writes,
+                     large_arg_size=large_arg_size, parser=parser,
+                     command_timeout=command_timeout,
+                     max_in_flight=max_in_flight,
+                     write_high_water=write_high_water,
+                     multiplexed=multiplexed, idle_timeout=idle_timeout,
+                     max_lifetime=max_lifetime,
+                     connect_concurrency=connect_concurrency,
+                     prewarm=prewarm, max_waiters=max_waiters,
+                     health_check_interval=health_check_interval,
+                     tcp_keepalive=tcp_keepalive,
+                     adaptive_interval=adaptive_interval,
+                     blocking_pool_size=blocking_pool_size, loop=loop)
     try:
-        yield from pool._fill_free(override_min=False)
+        yield from pool._fill_free()
     except Exception as ex:
         pool.close()
         yield from pool.wait_closed()
@@ -53,7 +135,16 @@ class RedisPool:
     """
 
     def __init__(self, address, db=0, password=None, encoding=None,
-                 *, minsize, maxsize, commands_factory, ssl=None, loop=None):
+                 *, minsize, maxsize, commands_factory, ssl=None,
+                 buffered=False, batch_writes=False,
+                 large_arg_size=MAX_CHUNK_SIZE, parser=None,
+                 command_timeout=None, max_in_flight=None,
+                 write_high_water=None, multiplexed=False,
+                 idle_timeout=None, max_lifetime=None,
+                 connect_concurrency=10, prewarm=False, max_waiters=None,
+                 health_check_interval=None, tcp_keepalive=None,
+                 adaptive_interval=None, blocking_pool_size=None,
+                 loop=None):
         assert isinstance(minsize, int) and minsize >= 0, (
             "minsize must be int >= 0", minsize, type(minsize))
         assert maxsize is not None, "Arbitrary pool size is disallowed."
@@ -61,6 +152,22 @@ class RedisPool:
             "maxsize must be int > 0", maxsize, type(maxsize))
         assert minsize <= maxsize, (
             "Invalid pool min/max sizes", minsize, maxsize)
+        assert (isinstance(connect_concurrency, int) and
+                connect_concurrency > 0), (
+            "connect_concurrency must be int > 0", connect_concurrency)
+        assert max_waiters is None or max_waiters >= 0, (
+            "max_waiters must be >= 0", max_waiters)
+        assert idle_timeout is None or idle_timeout > 0, (
+            "idle_timeout must be > 0", idle_timeout)
+        assert max_lifetime is None or max_lifetime > 0, (
+            "max_lifetime must be > 0", max_lifetime)
+        assert health_check_interval is None or health_check_interval > 0, (
+            "health_check_interval must be > 0", health_check_interval)
+        assert adaptive_interval is None or adaptive_interval > 0, (
+            "adaptive_interval must be > 0", adaptive_interval)
+        assert blocking_pool_size is None or (
+            isinstance(blocking_pool_size, int) and blocking_pool_size > 0), (
+            "blocking_pool_size must be int > 0", blocking_pool_size)
         if loop is None:
             loop = asyncio.get_event_loop()
         self._address = address
@@ -68,14 +175,82 @@ class RedisPool:
         self._password = password
         self._ssl = ssl
         self._encoding = encoding
+        self._buffered = buffered
+        self._batch_writes = batch_writes
+        self._large_arg_size = large_arg_size
+        self._parser = parser
+        self._command_timeout = command_timeout
+        self._max_in_flight = max_in_flight
+        self._write_high_water = write_high_water
+        self._multiplexed = multiplexed
+        self._connect_concurrency = connect_concurrency
+        self._prewarm = prewarm
+        self._idle_timeout = idle_timeout
+        self._max_lifetime = max_lifetime
+        self._health_check_interval = health_check_interval
+        self._tcp_keepalive = tcp_keepalive
+        self._reap_interval = min(
+            t for t in (idle_timeout, max_lifetime, health_check_interval,
+                        float('inf'))
+            if t is not None) / 2
+        self._adaptive_interval = adaptive_interval
+        if adaptive_interval is not None:
+            self._reap_interval = min(self._reap_interval, adaptive_interval)
+            self._size_limit = max(minsize, 1)
+        else:
+            self._size_limit = maxsize
+        self._next_adapt = loop.time() + (adaptive_interval or 0)
+        self._window_start = loop.time()
+        self._acquired_at = {}
+        self._hold_total = 0        # connection-seconds used in window
+        self._hold_time_sum = 0     # acquire to release times in window
+        self._release_count = 0
+        self._wait_total = 0
+        self._wait_count = 0
+        self._shrink_intervals = 0
+        self._grow_count = 0
+        self._shrink_count = 0
+        self._last_sizing = None
+        self._track_idle = (idle_timeout is not None or
+                            health_check_interval is not None)
+        self._idle_since = weakref.WeakKeyDictionary()
+        self._created_at = weakref.WeakKeyDictionary()
+        self._next_recycle = 0
+        self._reaped_count = 0
+        self._recycled_count = 0
+        self._evicted_count = 0
+        self._stats = PoolStats(self)
         self._minsize = minsize
         self._factory = commands_factory
         self._loop = loop
         self._pool = collections.deque(maxlen=maxsize)
         self._used = set()
         self._acquiring = 0
-        self._cond = asyncio.Condition(loop=loop)
+        # background task opening connections up to minsize
+        self._fill_task = None
+        self._max_waiters = max_waiters
+        # FIFO of (future, time started waiting)
+        self._waiters = collections.deque()
+        self._lock = asyncio.Lock(loop=loop)
         self._close_state = asyncio.Event(loop=loop)
+        if blocking_pool_size is not None:
+            # connections for blocking commands are opened on demand
+            self._blocking_pool = RedisPool(
+                address, db, password, encoding,
+                minsize=0, maxsize=blocking_pool_size,
+                commands_factory=commands_factory, ssl=ssl,
+                buffered=buffered, batch_writes=batch_writes,
+                large_arg_size=large_arg_size, parser=parser,
+                # connections extend it by server-side timeout
+                # of blocking commands
+                command_timeout=command_timeout,
+                write_high_water=write_high_water,
+                idle_timeout=idle_timeout, max_lifetime=max_lifetime,
+                max_waiters=max_waiters,
+                health_check_interval=health_check_interval,
+                tcp_keepalive=tcp_keepalive, loop=loop)
+        else:
+            self._blocking_pool = None
         self._close_waiter = async_task(self._do_close(), loop=loop)
 
     @property
@@ -98,13 +273,140 @@ class RedisPool:
         """Current number of free connections."""
         return len(self._pool)
 
+    @property
+    def waiters_count(self):
+        """Number of acquire() calls waiting for connection."""
+        return len(self._waiters)
+
+    @property
+    def wait_time(self):
+        """Seconds the oldest waiting acquire() call has been waiting."""
+        if not self._waiters:
+            return 0
+        return self._loop.time() - self._waiters[0][1]
+
+    @property
+    def multiplexed(self):
+        """True if free connections are shared by execute() calls."""
+        return self._multiplexed
+
+    @property
+    def reaped_count(self):
+        """Number of connections closed after idle_timeout."""
+        return self._reaped_count
+
+    @property
+    def recycled_count(self):
+        """Number of connections closed after max_lifetime."""
+        return self._recycled_count
+
+    @property
+    def evicted_count(self):
+        """Number of connections closed after failed health check."""
+        return self._evicted_count
+
+    @property
+    def blocking_pool(self):
+        """Pool for blocking commands or None."""
+        return self._blocking_pool
+
+    @property
+    def stats(self):
+        """:class:`~aioredis.stats.PoolStats` of this pool."""
+        return self._stats
+
+    @property
+    def in_transaction(self):
+        """Always False, transactions require acquired connection."""
+        return False
+
+    def execute(self, command, *args, **kwargs):
+        """Executes redis command using pool connection.
+
+        In multiplexed mode command is sent through free connection
+        with fewest pending replies; connection is not acquired and
+        keeps serving other execute() calls.
+        Blocking commands (BLPOP, BRPOP, BRPOPLPUSH) and all commands
+        in non-multiplexed mode acquire connection for the time of
+        command execution; blocking commands acquire it from
+        blocking_pool if there is one.
+
+        Commands changing connection state (MULTI, WATCH, SELECT,
+        SUBSCRIBE, etc) are not allowed, acquire connection instead.
+
+        Returns Future waiting for command result.
+        """
+        if self.closed:
+            raise PoolClosedError("Pool is closed")
+        if command is None:
+            raise TypeError("command must not be None")
+        name = command.upper().strip()
+        if name in _EXCLUSIVE_COMMANDS:
+            raise ValueError(
+                "{!r} command can not be executed through pool,"
+                " acquire connection instead".format(command))
+        if name in _BLOCKING_COMMANDS:
+            if self._blocking_pool is not None:
+                return self._blocking_pool.execute(command, *args, **kwargs)
+        elif self._multiplexed:
+            conn = self._shared_connection()
+            if conn is not None:
+                return conn.execute(command, *args, **kwargs)
+        return async_task(self._execute_exclusive(command, args, kwargs),
+                          loop=self._loop)
+
+    @asyncio.coroutine
+    def _execute_exclusive(self, command, args, kwargs):
+        conn = yield from self.acquire()
+        try:
+            return (yield from _connection_of(conn).execute(
+                command, *args, **kwargs))
+        finally:
+            self.release(conn)
+
+    def _shared_connection(self):
+        """Returns least loaded free connection or None."""
+        best = None
+        best_load = None
+        # most recently released connections are at the right side
+        for item in reversed(self._pool):
+            conn = _connection_of(item)
+            if conn.closed:
+                continue
+            load = len(conn._waiters)
+            if best is None or load < best_load:
+                best, best_item, best_load = conn, item, load
+                if not load:
+                    break
+        if best is not None and self._track_idle:
+            self._idle_since[best_item] = self._loop.time()
+        return best
+
+    @asyncio.coroutine
+    def get_atomic_connection(self):
+        """Returns connection to send several commands at once
+        (used by pipelines).
+
+        Connection is not acquired so commands must be sent right away.
+        """
+        if self.closed:
+            raise PoolClosedError("Pool is closed")
+        conn = self._shared_connection()
+        if conn is None:
+            conn = yield from self.acquire()
+            self.release(conn)
+            conn = _connection_of(conn)
+        return conn
+
     @asyncio.coroutine
     def clear(self):
         """Clear pool connections.
 
         Close and remove all free connections.
         """
-        with (yield from self._cond):
+        if self._blocking_pool is not None:
+            yield from self._blocking_pool.clear()
+        with (yield from self._lock):
             waiters = []
             while self._pool:
                 conn = self._pool.popleft()
@@ -114,9 +416,26 @@ class RedisPool:
 
     @asyncio.coroutine
     def _do_close(self):
-        yield from self._close_state.wait()
-        with (yield from self._cond):
-            assert not self._acquiring, self._acquiring
+        if self._reap_interval == float('inf'):
+            yield from self._close_state.wait()
+        else:
+            closing = async_task(self._close_state.wait(), loop=self._loop)
+            while True:
+                done, _ = yield from asyncio.wait(
+                    [closing], timeout=self._reap_interval, loop=self._loop)
+                if done:
+                    break
+                if (self._idle_timeout is not None or
+                        self._max_lifetime is not None):
+                    yield from self._reap()
+                if self._health_check_interval is not None:
+                    yield from self._health_check()
+                if (self._adaptive_interval is not None and
+                        self._loop.time() >= self._next_adapt):
+                    yield from self._adapt()
+        if self._fill_task is not None:
+            yield from asyncio.wait([self._fill_task], loop=self._loop)
+        with (yield from self._lock):
             waiters = []
             while self._pool:
                 conn = self._pool.popleft()
@@ -127,12 +446,22 @@ class RedisPool:
                 waiters.append(conn.wait_closed())
             yield from asyncio.gather(*waiters, loop=self._loop)
             logger.debug("Closed %d connections", len(waiters))
+        if self._blocking_pool is not None:
+            yield from self._blocking_pool.wait_closed()
 
     def close(self):
         """Close all free and in-progress connections and mark pool as closed.
         """
         if not self._close_state.is_set():
             self._close_state.set()
+            if self._blocking_pool is not None:
+                self._blocking_pool.close()
+            if self._fill_task is not None:
+                self._fill_task.cancel()
+            while self._waiters:
+                waiter, _ = self._waiters.popleft()
+                if not waiter.done():
+                    waiter.set_exception(PoolClosedError("Pool is closed"))
 
     @property
     def closed(self):
@@ -160,33 +489,136 @@ class RedisPool:
 
         All previously acquired connections will be closed when released.
         """
-        with (yield from self._cond):
-            for i in range(self.freesize):
-                yield from self._pool[i].select(db)
-            else:
-                self._db = db
+        with (yield from self._lock):
+            # free connections are detached (marked as used), so that
+            # lock-free acquire() can not take them while selecting
+            conns = list(self._pool)
+            self._pool.clear()
+            self._used.update(conns)
+            old_db, self._db = self._db, db
+            try:
+                for conn in conns:
+                    yield from conn.select(db)
+            except BaseException:
+                self._db = old_db
+                raise
+            finally:
+                # connections with other db are closed
+                for conn in conns:
+                    self.release(conn)
+        if self._blocking_pool is not None:
+            yield from self._blocking_pool.select(db)
 
     @asyncio.coroutine
-    def acquire(self):
+    def acquire(self, *, timeout=None):
         """Acquires a connection from free pool.
 
         Creates new connection if needed.
+        Free connections are taken in LIFO order: most recently
+        released one is reused, so that rarely needed connections
+        become idle and can be closed after idle_timeout.
+        When pool is exhausted waits for released connection,
+        waiting calls are served in FIFO order.
+        Connections lost below minsize are re-opened in background.
+
+        Raises asyncio.TimeoutError if connection is not acquired
+        in timeout seconds and PoolExhaustedError if max_waiters calls
+        are already waiting.
         """
         if self.closed:
             raise PoolClosedError("Pool is closed")
-        with (yield from self._cond):
-            if self.closed:
-                raise PoolClosedError("Pool is closed")
-            while True:
-                yield from self._fill_free(override_min=True)
-                if self.freesize:
-                    conn = self._pool.popleft()
-                    assert not conn.closed, conn
-                    assert conn not in self._used, (conn, self._used)
-                    self._used.add(conn)
-                    return conn
+        # fast path: take free connection without any context switch;
+        # most recently released is taken first so others may become idle
+        pool = self._pool
+        lost = 0
+        while pool:
+            conn = pool.pop()
+            if not conn.closed:
+                self._used.add(conn)
+                if self._adaptive_interval is not None:
+                    self._acquired_at[conn] = self._loop.time()
+                self._stats.acquire_count += 1
+                if lost:
+                    self._replenish(lost)
+                return conn
+            self._stats.connections_lost += 1
+            lost += 1
+        if lost:
+            # one of lost connections is replaced right away
+            self._replenish(lost - 1)
+        # new connection opened now replaces lost one
+        conn = yield from self._acquire_slow(timeout, replacing=bool(lost))
+        if self._adaptive_interval is not None:
+            self._acquired_at[conn] = self._loop.time()
+        return conn
+
+    @asyncio.coroutine
+    def _acquire_slow(self, timeout, *, replacing=False):
+        start = self._loop.time()
+        if timeout is not None:
+            deadline = start + timeout
+        if self.size >= self._size_limit or self._waiters:
+            if (self._max_waiters is not None and
+                    len(self._waiters) >= self._max_waiters):
+                raise PoolExhaustedError(
+                    "Too many callers waiting for connection")
+            waiter = create_future(loop=self._loop)
+            item = waiter, self._loop.time()
+            self._waiters.append(item)
+            if timeout is not None:
+                handle = self._loop.call_at(
+                    deadline, self._waiter_timeout, item)
+            try:
+                conn = yield from waiter
+            except asyncio.CancelledError:
+                if not waiter.done() or waiter.cancelled():
+                    try:
+                        self._waiters.remove(item)
+                    except ValueError:
+                        pass
+                elif waiter.result() is None or waiter.result() is _LOST_SLOT:
+                    # free slot was handed over to us
+                    self._acquiring -= 1
+                    self._wakeup(lost=waiter.result() is _LOST_SLOT)
                 else:
-                    yield from self._cond.wait()
+                    # connection was handed over to us
+                    self.release(waiter.result())
+                raise
+            finally:
+                if timeout is not None:
+                    handle.cancel()
+            self._wait_total += self._loop.time() - item[1]
+            self._wait_count += 1
+            if conn is _LOST_SLOT:
+                replacing = True
+            elif conn is not None:
+                # already marked as used by _put_free()
+                self._stats.observe_wait(self._loop.time() - start)
+                return conn
+            # slot is reserved by _wakeup()
+        else:
+            self._acquiring += 1
+        try:
+            if timeout is None:
+                conn = yield from self._create_new_connection()
+            else:
+                conn = yield from asyncio.wait_for(
+                    self._create_new_connection(),
+                    max(deadline - self._loop.time(), 0), loop=self._loop)
+        except BaseException:
+            self._acquiring -= 1
+            # pass free slot to next waiter
+            self._wakeup(lost=replacing)
+            raise
+        self._acquiring -= 1
+        if self.closed:
+            conn.close()
+            raise PoolClosedError("Pool is closed")
+        if replacing:
+            self._stats.reconnects += 1
+        self._used.add(conn)
+        self._stats.observe_wait(self._loop.time() - start)
+        return conn
 
     def release(self, conn):
         """Returns used connection back into pool.
@@ -194,9 +626,20 @@ class RedisPool:
         When returned connection has db index that differs from one in pool
         the connection will be closed and dropped.
         When queue of free connections is full the connection will be dropped.
+
+        Connection is handed directly to the oldest waiting
+        acquire() call if any.
         """
         assert conn in self._used, "Invalid connection, maybe from other pool"
         self._used.remove(conn)
+        lost = conn.closed
+        if self._adaptive_interval is not None:
+            acquired = self._acquired_at.pop(conn, None)
+            if acquired is not None:
+                now = self._loop.time()
+                self._hold_total += now - max(acquired, self._window_start)
+                self._hold_time_sum += now - acquired
+                self._release_count += 1
         if not conn.closed:
             if conn.in_transaction:
                 logger.warning(
@@ -206,66 +649,349 @@ class RedisPool:
                 logger.warning(
                     "Connection %r is in subscribe mode, closing it.", conn)
                 conn.close()
+            elif (self._max_lifetime is not None and
+                    self._recycle_expired(conn)):
+                conn.close()
             elif conn.db == self.db:
-                if self.maxsize and self.freesize < self.maxsize:
-                    self._pool.append(conn)
-                else:
-                    # consider this connection as old and close it.
-                    conn.close()
+                # pool may have been shrunk while connection was used
+                if ((self._waiters or self.size < self._size_limit) and
+                        self._put_free(conn)):
+                    return
+                # consider this connection as old and close it.
+                conn.close()
             else:
                 conn.close()
-        # FIXME: check event loop is not closed
-        async_task(self._wakeup(), loop=self._loop)
+        else:
+            self._stats.connections_lost += 1
+        # connection is dropped, let waiter create new one
+        handed = self._wakeup(lost=lost)
+        # waiter handed lost slot counts reconnect itself
+        self._replenish(int(lost and not handed))
+
+    def _waiter_timeout(self, item):
+        waiter = item[0]
+        if not waiter.done():
+            self._waiters.remove(item)
+            self._wait_total += self._loop.time() - item[1]
+            self._wait_count += 1
+            waiter.set_exception(asyncio.TimeoutError())
+
+    def _wakeup(self, *, lost=False):
+        """Hands free slot over to the oldest waiter.
+
+        lost is True if slot was freed by lost connection
+        (so waiter opens connection to replace it).
+        Returns True if slot was handed over.
+        """
+        waiters = self._waiters
+        while waiters:
+            waiter, _ = waiters.popleft()
+            if not waiter.done():
+                # reserve slot so it is not taken by other callers
+                self._acquiring += 1
+                waiter.set_result(_LOST_SLOT if lost else None)
+                return True
+        return False
+
+    def _replenish(self, lost=0):
+        """Starts re-opening connections in background if pool
+        has less than minsize connections.
+
+        Up to lost connections opened are counted as reconnects.
+        """
+        if (self._fill_task is None and self.size < self.minsize and
+                not self.closed):
+            self._fill_task = async_task(self._fill_free(lost=lost),
+                                         loop=self._loop)
+            self._fill_task.add_done_callback(self._replenish_done)
+
+    def _replenish_done(self, task):
+        self._fill_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Failed to re-open connections up to minsize: %r",
+                           task.exception())
 
     def _drop_closed(self):
+        """Drops closed free connections, returns their number."""
+        dropped = 0
         for i in range(self.freesize):
             conn = self._pool[0]
             if conn.closed:
                 self._pool.popleft()
+                dropped += 1
             else:
                 self._pool.rotate(1)
+        self._stats.connections_lost += dropped
+        return dropped
 
     @asyncio.coroutine
-    def _fill_free(self, *, override_min):
+    def _fill_free(self, *, lost=0):
         # drop closed connections first
+        lost += self._drop_closed()
+        if self.size < self.minsize:
+            count = self.minsize - self.size
+            yield from self._create_free(count, replacing=min(lost, count))
+
+    @asyncio.coroutine
+    def _create_free(self, count, *, replacing=0):
+        """Opens count new free connections, not more than
+        connect_concurrency at once.
+
+        First replacing connections opened are counted as reconnects.
+        Connections opened successfully are kept in pool even if
+        some failed; first error is raised then.
+        """
+        semaphore = asyncio.Semaphore(self._connect_concurrency,
+                                      loop=self._loop)
+        # connections being opened are counted in pool size
+        self._acquiring += count
+
+        @asyncio.coroutine
+        def create():
+            nonlocal replacing
+            try:
+                with (yield from semaphore):
+                    conn = yield from self._create_new_connection()
+                    if replacing:
+                        replacing -= 1
+                        self._stats.reconnects += 1
+                    if self._prewarm:
+                        try:
+                            yield from _connection_of(conn).execute(b'PING')
+                        except Exception:
+                            conn.close()
+                            raise
+            except BaseException:
+                self._acquiring -= 1
+                # reserved slot is free again, let waiter create connection
+                self._wakeup(lost=replacing > 0)
+                raise
+            self._acquiring -= 1
+            if self.closed or not self._put_free(conn):
+                conn.close()
+
+        results = yield from asyncio.gather(
+            *[create() for _ in range(count)],
+            loop=self._loop, return_exceptions=True)
+        # connection may be closed at yield point
         self._drop_closed()
-        while self.size < self.minsize:
-            self._acquiring += 1
+        for res in results:
+            if isinstance(res, BaseException):
+                raise res
+
+    def _put_free(self, conn):
+        """Hands connection over to the oldest waiter or puts it
+        into free pool.
+
+        Returns False if free pool is full.
+        """
+        waiters = self._waiters
+        while waiters:
+            waiter, _ = waiters.popleft()
+            if not waiter.done():
+                self._used.add(conn)
+                waiter.set_result(conn)
+                return True
+        if self.freesize >= self.maxsize:
+            return False
+        if self._track_idle:
+            self._idle_since[conn] = self._loop.time()
+        self._pool.append(conn)
+        return True
+
+    def _recycle_expired(self, conn):
+        """Checks if connection is older than max_lifetime and
+        can be recycled now; connections are recycled one by one
+        about reap interval apart.
+        """
+        now = self._loop.time()
+        created = self._created_at.get(conn)
+        if (created is None or now - created < self._max_lifetime or
+                now < self._next_recycle):
+            return False
+        # timer may fire a bit early, allow some slack
+        self._next_recycle = now + self._reap_interval / 2
+        self._recycled_count += 1
+        return True
+
+    @asyncio.coroutine
+    def _reap(self):
+        """Closes idle and recycles expired free connections."""
+        now = self._loop.time()
+        idle_timeout = self._idle_timeout
+        size = self.size
+        free = list(self._pool)
+        self._pool.clear()
+        recycled = False
+        # least recently used connections are at the left side
+        for conn in free:
+            if conn.closed:
+                self._stats.connections_lost += 1
+                size -= 1
+                continue
+            if (idle_timeout is not None and size > self.minsize and
+                    now - self._idle_since.get(conn, now) >= idle_timeout):
+                self._reaped_count += 1
+                size -= 1
+                conn.close()
+            elif (not recycled and self._max_lifetime is not None and
+                    self._recycle_expired(conn)):
+                recycled = True
+                conn.close()
+            else:
+                self._pool.append(conn)
+        if recycled and self.size < self.minsize:
             try:
-                conn = yield from self._create_new_connection()
+                yield from self._fill_free()
+            except Exception as exc:
+                logger.warning("Failed to replace recycled connection: %r",
+                               exc)
+
+    @asyncio.coroutine
+    def _health_check(self):
+        """Checks free connections idle for health_check_interval
+        with PING sent to all of them at once; evicts failed ones.
+        """
+        now = self._loop.time()
+        interval = self._health_check_interval
+        idle = []
+        free = list(self._pool)
+        self._pool.clear()
+        for conn in free:
+            if conn.closed:
+                self._stats.connections_lost += 1
+                continue
+            if now - self._idle_since.get(conn, now) >= interval:
+                idle.append(conn)
+            else:
                 self._pool.append(conn)
-            finally:
-                self._acquiring -= 1
-                # connection may be closed at yield point
-                self._drop_closed()
-        if self.freesize:
+        if not idle:
             return
-        if override_min:
-            while not self._pool and self.size < self.maxsize:
-                self._acquiring += 1
+        # connections being checked are counted in pool size
+        self._acquiring += len(idle)
+        futs = []
+        for conn in idle:
+            try:
+                fut = _connection_of(conn).execute(b'PING', timeout=interval)
+            except Exception as exc:
+                fut = create_future(loop=self._loop)
+                fut.set_exception(exc)
+            futs.append(fut)
+        results = yield from asyncio.gather(*futs, loop=self._loop,
+                                            return_exceptions=True)
+        self._acquiring -= len(idle)
+        for conn, res in zip(idle, results):
+            if isinstance(res, Exception) or conn.closed:
+                logger.warning("Health check of %r failed: %r", conn, res)
+                self._evicted_count += 1
+                self._stats.connections_lost += 1
+                conn.close()
+                self._wakeup(lost=True)
+            elif conn.db != self._db:
+                # select() was called while connection was checked
+                conn.close()
+                self._wakeup()
+            elif not self._put_free(conn):
+                conn.close()
+
+    @asyncio.coroutine
+    def _adapt(self):
+        """Adjusts pool size limit according to utilization and
+        acquire wait times observed since previous call.
+
+        Utilization is average number of connections in use
+        (Little's law: sum of connection hold times over interval length)
+        to current size limit.
+        """
+        now = self._loop.time()
+        elapsed = now - self._window_start
+        hold_total = self._hold_total + sum(
+            now - max(acquired, self._window_start)
+            for acquired in self._acquired_at.values())
+        demand = hold_total / elapsed if elapsed > 0 else 0
+        limit = self._size_limit
+        utilization = demand / limit
+        wanted = math.ceil(demand / _TARGET_UTILIZATION)
+        # callers still waiting are counted too
+        wait_count = self._wait_count + len(self._waiters)
+        new_limit = limit
+        if wait_count or utilization >= _GROW_UTILIZATION:
+            self._shrink_intervals = 0
+            new_limit = min(self.maxsize, max(limit + 1, wanted))
+        elif utilization < _SHRINK_UTILIZATION:
+            self._shrink_intervals += 1
+            if self._shrink_intervals >= _SHRINK_INTERVALS:
+                self._shrink_intervals = 0
+                # shrink gradually
+                new_limit = max(self.minsize, 1, wanted, limit - 1)
+        else:
+            self._shrink_intervals = 0
+
+        self._last_sizing = {
+            'time': now,
+            'size_limit': new_limit,
+            'previous_size_limit': limit,
+            'utilization': utilization,
+            'wait_count': wait_count,
+            'wait_time_avg': (self._wait_total / self._wait_count
+                              if self._wait_count else 0),
+            'hold_time_avg': (self._hold_time_sum / self._release_count
+                              if self._release_count else 0),
+            }
+        self._window_start = now
+        self._next_adapt = now + self._adaptive_interval
+        self._hold_total = self._hold_time_sum = self._release_count = 0
+        self._wait_total = self._wait_count = 0
+
+        self._size_limit = new_limit
+        if new_limit > limit:
+            self._grow_count += 1
+            logger.debug("Pool size limit increased to %d", new_limit)
+            if self.size < new_limit:
                 try:
-                    conn = yield from self._create_new_connection()
-                    self._pool.append(conn)
-                finally:
-                    self._acquiring -= 1
-                    # connection may be closed at yield point
-                    self._drop_closed()
+                    yield from self._create_free(new_limit - self.size)
+                except Exception as exc:
+                    logger.warning("Failed to grow pool: %r", exc)
+        elif new_limit < limit:
+            self._shrink_count += 1
+            logger.debug("Pool size limit decreased to %d", new_limit)
+            # least recently used connections are at the left side
+            while self.size > new_limit and self._pool:
+                self._pool.popleft().close()
 
-    def _create_new_connection(self):
-        return create_redis(self._address,
-                            db=self._db,
-                            password=self._password,
-                            ssl=self._ssl,
-                            encoding=self._encoding,
-                            commands_factory=self._factory,
-                            loop=self._loop)
+    def sizing_stats(self):
+        """Returns dict describing adaptive sizing state and
+        last decision.
+        """
+        return {
+            'size_limit': self._size_limit,
+            'grow_count': self._grow_count,
+            'shrink_count': self._shrink_count,
+            'last': self._last_sizing,
+            }
 
     @asyncio.coroutine
-    def _wakeup(self, closing_conn=None):
-        with (yield from self._cond):
-            self._cond.notify()
-        if closing_conn is not None:
-            yield from closing_conn.wait_closed()
+    def _create_new_connection(self):
+        conn = yield from create_redis(
+            self._address,
+            db=self._db,
+            password=self._password,
+            ssl=self._ssl,
+            encoding=self._encoding,
+            commands_factory=self._factory,
+            buffered=self._buffered,
+            batch_writes=self._batch_writes,
+            large_arg_size=self._large_arg_size,
+            parser=self._parser,
+            command_timeout=self._command_timeout,
+            max_in_flight=self._max_in_flight,
+            write_high_water=self._write_high_water,
+            tcp_keepalive=self._tcp_keepalive,
+            loop=self._loop)
+        if self._max_lifetime is not None:
+            self._created_at[conn] = self._loop.time()
+        self._stats.add_connection(_connection_of(conn).stats)
+        return conn
 
     def __enter__(self):
         raise RuntimeError(
@@ -294,6 +1020,11 @@ class RedisPool:
             return _AsyncConnectionContextManager(self)
 
 
+def _connection_of(item):
+    # pool items are built by commands_factory
+    return getattr(item, 'connection', item)
+
+
 class _ConnectionContextManager:
 
     __slots__ = ('_pool', '_conn')
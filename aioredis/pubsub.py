@@ -5,7 +5,7 @@ import types
 
 from .abc import AbcChannel
 from .util import create_future, _converters
-from .errors import ChannelClosedError
+from .errors import ChannelClosedError, ConnectionClosedError
 from .log import logger
 
 __all__ = [
@@ -20,16 +20,103 @@ PY_35 = sys.version_info >= (3, 5)
 # End of pubsub messages stream marker.
 EndOfStream = object()
 
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest',
+                     'block_reader', 'disconnect')
 
-class Channel(AbcChannel):
-    """Wrapper around asyncio.Queue."""
+
+class _BoundedQueue:
+    """Messages queue limited to maxsize messages (0 means unlimited).
+
+    When queue is full new message is handled according to overflow:
+    * 'drop_oldest' --- oldest message is dropped;
+    * 'drop_newest' --- new message is dropped;
+    * 'block_reader' --- message is queued and connection stops
+      reading until there is free space in queue;
+    * 'disconnect' --- message is dropped and connection is closed.
+    """
+
+    def _init_queue(self, maxsize, overflow, loop):
+        assert isinstance(maxsize, int) and maxsize >= 0, (
+            "maxsize must be int >= 0", maxsize, type(maxsize))
+        assert overflow in OVERFLOW_POLICIES, (
+            "overflow must be one of", OVERFLOW_POLICIES, overflow)
+        # queue is unbounded, bound is checked by _put()
+        self._queue = asyncio.Queue(loop=loop)
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._dropped = 0
+        self._space_waiter = None
+
+    @property
+    def maxsize(self):
+        """Max number of queued messages (0 if unlimited)."""
+        return self._maxsize
+
+    @property
+    def overflow(self):
+        """Full queue overflow policy."""
+        return self._overflow
+
+    @property
+    def dropped(self):
+        """Number of messages dropped because queue was full."""
+        return self._dropped
+
+    def _put(self, item):
+        """Puts item into queue applying overflow policy.
+
+        Returns None or future connection must wait for before
+        reading more data (done with error if connection must be closed).
+        """
+        queue = self._queue
+        maxsize = self._maxsize
+        if not maxsize or queue.qsize() < maxsize:
+            queue.put_nowait(item)
+        elif self._overflow == 'drop_oldest':
+            queue.get_nowait()
+            queue.put_nowait(item)
+            self._dropped += 1
+        elif self._overflow == 'drop_newest':
+            self._dropped += 1
+            return
+        elif self._overflow == 'disconnect':
+            self._dropped += 1
+            fut = create_future(loop=self._loop)
+            fut.set_exception(ConnectionClosedError(
+                "Pub/Sub queue overflow: {!r}".format(self)))
+            return fut
+        else:
+            queue.put_nowait(item)
+        if self._overflow == 'block_reader' and queue.qsize() >= maxsize:
+            if self._space_waiter is None:
+                self._space_waiter = create_future(loop=self._loop)
+            return self._space_waiter
+
+    def _wakeup_reader(self, *, force=False):
+        waiter = self._space_waiter
+        if waiter is not None and (
+                force or self._queue.qsize() < self._maxsize):
+            self._space_waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+class Channel(_BoundedQueue, AbcChannel):
+    """Wrapper around asyncio.Queue.
+
+    Queue is limited to maxsize messages (0 means unlimited);
+    overflow is one of 'drop_oldest', 'drop_newest', 'block_reader'
+    or 'disconnect' and defines what is done with message
+    received when queue is full.
+    """
     # doesn't make much sense with inheritance
     # __slots__ = ('_queue', '_name',
     #              '_closed', '_waiter',
     #              '_is_pattern', '_loop')
 
-    def __init__(self, name, is_pattern, loop=None):
-        self._queue = asyncio.Queue(loop=loop)
+    def __init__(self, name, is_pattern, loop=None, *,
+                 maxsize=0, overflow='drop_oldest'):
+        self._init_queue(maxsize, overflow, loop)
         self._name = _converters[type(name)](name)
         self._is_pattern = is_pattern
         self._loop = loop
@@ -80,6 +167,8 @@ class Channel(AbcChannel):
                 return
             raise ChannelClosedError()
         msg = yield from self._queue.get()
+        if self._space_waiter is not None:
+            self._wakeup_reader()
         if msg is None:
             # TODO: maybe we need an explicit marker for "end of stream"
             #       currently, returning None may overlap with
@@ -135,7 +224,16 @@ class Channel(AbcChannel):
     # internal methods
 
     def put_nowait(self, data):
-        self._queue.put_nowait(data)
+        """Puts message into queue.
+
+        Returns None or future connection must wait for before
+        reading more data (see overflow policies).
+        """
+        waiter = self._put(data)
+        self._wakeup()
+        return waiter
+
+    def _wakeup(self):
         if self._waiter is not None:
             fut, self._waiter = self._waiter, None
             if fut.done():
@@ -151,7 +249,10 @@ class Channel(AbcChannel):
         on `unsubscribe` command.
         """
         if not self._closed:
-            self.put_nowait(None)
+            # end of stream marker is never dropped
+            self._queue.put_nowait(None)
+            self._wakeup()
+            self._wakeup_reader(force=True)
         self._closed = True
 
 
@@ -179,7 +280,7 @@ if PY_35:
             return msg
 
 
-class Listener:
+class Listener(_BoundedQueue):
     """Multi-producers, single-consumer Pub/Sub queue.
 
     Can be used in cases where a single consumer task
@@ -207,12 +308,15 @@ class Listener:
     >>> await redis.punsubscribe('hello')
     >>> mpsc.stop()
     >>> # any message received after stop() will be ignored.
+
+    Queue can be limited with maxsize and overflow parameters
+    (same as for :class:`Channel`).
     """
 
-    def __init__(self, loop=None):
+    def __init__(self, loop=None, *, maxsize=0, overflow='drop_oldest'):
         if loop is None:
             loop = asyncio.get_event_loop()
-        self._queue = asyncio.Queue(loop=loop)
+        self._init_queue(maxsize, overflow, loop)
         self._refs = {}
         self._waiter = None
         self._running = True
@@ -275,6 +379,8 @@ class Listener:
                 raise ChannelClosedError()
             return
         ch, msg = yield from self._queue.get()
+        if self._space_waiter is not None:
+            self._wakeup_reader()
         if ch.is_pattern:
             dest_ch, msg = msg
         if encoding is not None:
@@ -312,6 +418,7 @@ class Listener:
         so you must call unsubscribe before stopping this listener.
         """
         self._running = False
+        self._wakeup_reader(force=True)
 
     # internal methods
 
@@ -320,14 +427,15 @@ class Listener:
             logger.warning("Pub/Sub listener message after stop: %r, %r",
                            sender, data)
             return
-        self._queue.put_nowait((sender, data))
+        waiter = self._put((sender, data))
         if self._waiter is not None:
             fut, self._waiter = self._waiter, None
             if fut.done():
                 assert fut.cancelled(), (
                     "Waiting future is in wrong state", self, fut)
-                return
+                return waiter
             fut.set_result(None)
+        return waiter
 
     def _close(self, sender):
         self._refs.pop((sender.name, sender.is_pattern))
@@ -370,7 +478,7 @@ class _Sender(AbcChannel):
         raise RuntimeError("MPSC channel does not allow direct get() calls")
 
     def put_nowait(self, data):
-        self._receiver._put_nowait(data, sender=self)
+        return self._receiver._put_nowait(data, sender=self)
 
     def close(self):
         # TODO: close() is exclusive so we can not share same _Sender
@@ -0,0 +1,184 @@
+import bisect
+
+
+__all__ = ['ConnectionStats', 'PoolStats', 'WAIT_BUCKETS']
+
+#: Default acquire wait time histogram buckets (upper bounds, seconds).
+WAIT_BUCKETS = (.0005, .001, .005, .01, .025, .05, .1, .25, .5,
+                1, 2.5, 5, 10)
+
+
+class ConnectionStats:
+    """Connection counters.
+
+    Counters are plain int attributes updated in place by connection
+    and must be considered read-only:
+
+    * ``commands_sent`` --- number of commands sent;
+    * ``bytes_written`` --- number of bytes passed to transport;
+    * ``bytes_read`` --- number of bytes received;
+    * ``replies_parsed`` --- number of replies received;
+    * ``errors`` --- dict of error class name to number of errors;
+    * ``reconnects`` --- number of connections re-opened;
+    * ``in_flight_peak`` --- max number of commands waiting for reply;
+    * ``watch_retries`` --- number of transactions re-tried because
+      watched keys were changed.
+    """
+
+    __slots__ = ('commands_sent', 'bytes_written', 'bytes_read',
+                 'replies_parsed', 'errors', 'reconnects',
+                 'in_flight_peak', 'watch_retries', 'closed', '_waiters')
+
+    def __init__(self, waiters=()):
+        self.commands_sent = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.replies_parsed = 0
+        self.errors = {}
+        self.reconnects = 0
+        self.in_flight_peak = 0
+        self.watch_retries = 0
+        self.closed = False
+        self._waiters = waiters
+
+    def __repr__(self):
+        return '<ConnectionStats {!r}>'.format(self.snapshot())
+
+    @property
+    def in_flight(self):
+        """Current number of commands waiting for reply."""
+        return len(self._waiters)
+
+    def add_error(self, exc):
+        """Counts error of exc type."""
+        name = type(exc).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def merge(self, other):
+        """Adds counters of other stats to this one."""
+        self.commands_sent += other.commands_sent
+        self.bytes_written += other.bytes_written
+        self.bytes_read += other.bytes_read
+        self.replies_parsed += other.replies_parsed
+        self.reconnects += other.reconnects
+        self.watch_retries += other.watch_retries
+        errors = self.errors
+        for name, count in other.errors.items():
+            errors[name] = errors.get(name, 0) + count
+        if other.in_flight_peak > self.in_flight_peak:
+            self.in_flight_peak = other.in_flight_peak
+
+    def snapshot(self):
+        """Returns dict of current counter values."""
+        return {
+            'commands_sent': self.commands_sent,
+            'bytes_written': self.bytes_written,
+            'bytes_read': self.bytes_read,
+            'replies_parsed': self.replies_parsed,
+            'errors': dict(self.errors),
+            'reconnects': self.reconnects,
+            'in_flight': len(self._waiters),
+            'in_flight_peak': self.in_flight_peak,
+            'watch_retries': self.watch_retries,
+            }
+
+
+class PoolStats:
+    """Counters aggregated over all pool connections (including
+    closed ones) and acquire wait time histogram.
+
+    Counters are plain attributes updated in place by pool:
+
+    * ``acquire_count`` --- number of connections acquired;
+    * ``acquire_wait_sum`` --- total seconds spent waiting for connection;
+    * ``connections_lost`` --- number of connections found closed;
+    * ``reconnects`` --- number of connections opened to replace
+      lost ones.
+
+    Acquire calls which got free connection right away are not timed
+    and are counted in the first histogram bucket.
+    """
+
+    def __init__(self, pool=None, *, buckets=WAIT_BUCKETS):
+        assert list(buckets) == sorted(buckets), (
+            "buckets must be sorted", buckets)
+        self.acquire_count = 0
+        self.acquire_wait_sum = 0
+        self.connections_lost = 0
+        self.reconnects = 0
+        self._pool = pool
+        self._buckets = tuple(buckets)
+        # counts of timed waits per bucket, last one is +Inf
+        self._wait_counts = [0] * (len(self._buckets) + 1)
+        self._connections = []      # stats of open connections
+        self._retired = ConnectionStats()
+        self._prune_at = 16
+
+    def __repr__(self):
+        return '<PoolStats {!r}>'.format(self.snapshot())
+
+    def add_connection(self, stats):
+        """Starts aggregating counters of new connection."""
+        self._connections.append(stats)
+        if len(self._connections) >= self._prune_at:
+            self._prune()
+            self._prune_at = max(16, 2 * len(self._connections))
+
+    def observe_wait(self, seconds):
+        """Counts acquire which waited for seconds."""
+        self.acquire_count += 1
+        self.acquire_wait_sum += seconds
+        self._wait_counts[bisect.bisect_left(self._buckets, seconds)] += 1
+
+    def _prune(self):
+        # counters of closed connections are moved to _retired
+        retired = self._retired
+        live = []
+        for stats in self._connections:
+            if stats.closed:
+                retired.merge(stats)
+            else:
+                live.append(stats)
+        self._connections = live
+
+    def snapshot(self):
+        """Returns dict of current counter values.
+
+        Besides connection counters (summed up, ``in_flight_peak`` is max)
+        it contains ``connections`` (number of open connections),
+        ``connections_lost``, ``acquire_wait_seconds`` histogram dict
+        (``buckets`` list of (upper bound, cumulative count) pairs
+        ending with ``float('inf')``, ``sum`` and ``count``) and
+        ``size``, ``freesize`` and ``waiters`` of pool if any.
+        """
+        self._prune()
+        total = ConnectionStats()
+        total.merge(self._retired)
+        in_flight = 0
+        for stats in self._connections:
+            total.merge(stats)
+            in_flight += len(stats._waiters)
+        res = total.snapshot()
+        res['in_flight'] = in_flight
+        res['reconnects'] += self.reconnects
+        res['connections'] = len(self._connections)
+        res['connections_lost'] = self.connections_lost
+
+        counts = self._wait_counts
+        # untimed acquires didn't wait at all
+        cumulative = self.acquire_count - sum(counts)
+        buckets = []
+        for bound, count in zip(self._buckets + (float('inf'),), counts):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        res['acquire_wait_seconds'] = {
+            'buckets': buckets,
+            'sum': self.acquire_wait_sum,
+            'count': self.acquire_count,
+            }
+        pool = self._pool
+        if pool is not None:
+            res['size'] = pool.size
+            res['freesize'] = pool.freesize
+            res['waiters'] = pool.waiters_count
+        return res
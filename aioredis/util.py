@@ -22,30 +22,148 @@ _converters = {
     }
 
 
-def _bytes_len(sized):
-    return str(len(sized)).encode('utf-8')
+# RESP headers cache: '*<n>\r\n' and '$<len>\r\n' for small sizes
+_HEADERS_CACHE_SIZE = 1024
+_array_headers = [
+    '*{}\r\n'.format(i).encode('utf-8') for i in range(_HEADERS_CACHE_SIZE)]
+_bulk_headers = [
+    '${}\r\n'.format(i).encode('utf-8') for i in range(_HEADERS_CACHE_SIZE)]
+
+# Pre-encoded bulk strings for common command names
+_COMMON_COMMANDS = (
+    'GET', 'SET', 'MGET', 'MSET', 'SETEX', 'PSETEX', 'SETNX', 'GETSET',
+    'INCR', 'INCRBY', 'DECR', 'DECRBY', 'APPEND', 'STRLEN',
+    'DEL', 'EXISTS', 'EXPIRE', 'PEXPIRE', 'TTL', 'PTTL', 'TYPE', 'KEYS',
+    'HGET', 'HSET', 'HMGET', 'HMSET', 'HGETALL', 'HDEL', 'HEXISTS',
+    'HINCRBY', 'HLEN', 'HKEYS', 'HVALS',
+    'LPUSH', 'RPUSH', 'LPOP', 'RPOP', 'LRANGE', 'LLEN', 'LINDEX', 'LTRIM',
+    'BLPOP', 'BRPOP', 'BRPOPLPUSH', 'RPOPLPUSH',
+    'SADD', 'SREM', 'SMEMBERS', 'SISMEMBER', 'SCARD',
+    'ZADD', 'ZREM', 'ZRANGE', 'ZREVRANGE', 'ZRANGEBYSCORE', 'ZSCORE',
+    'ZINCRBY', 'ZCARD', 'ZRANK',
+    'SCAN', 'HSCAN', 'SSCAN', 'ZSCAN',
+    'EVAL', 'EVALSHA', 'PUBLISH', 'PING', 'ECHO', 'SELECT', 'AUTH', 'QUIT',
+    'MULTI', 'EXEC', 'DISCARD', 'WATCH', 'UNWATCH', 'INFO',
+    )
+_command_headers = {}
+for _name in _COMMON_COMMANDS:
+    _header = '${}\r\n{}\r\n'.format(len(_name), _name).encode('utf-8')
+    _command_headers[_name] = _header
+    _command_headers[_name.encode('utf-8')] = _header
+del _name, _header
+
+
+def _encode_args(args, parts):
+    """Appends encoded RESP array of bulk-strings to parts list.
+
+    Objects supporting buffer protocol (memoryview, array.array, etc)
+    are appended as memoryview without copying.
+    Returns size of the largest argument.
+    """
+    append = parts.append
+    largest = 0
+    size = len(args)
+    if size < _HEADERS_CACHE_SIZE:
+        append(_array_headers[size])
+    else:
+        append('*{}\r\n'.format(size).encode('utf-8'))
+    if size and type(args[0]) in (str, bytes):
+        header = _command_headers.get(args[0])
+        if header is not None:
+            append(header)
+            args = args[1:]
+    for arg in args:
+        type_ = type(arg)
+        if type_ is bytes:
+            barg = arg
+        elif type_ is str:
+            barg = arg.encode('utf-8')
+        elif type_ in _converters:
+            barg = _converters[type_](arg)
+        else:
+            barg = _as_bytes_view(arg)
+        size = len(barg)
+        if size < _HEADERS_CACHE_SIZE:
+            append(_bulk_headers[size])
+        else:
+            append('${}\r\n'.format(size).encode('utf-8'))
+        if size > largest:
+            largest = size
+        append(barg)
+        append(b'\r\n')
+    return largest
+
+
+def _as_bytes_view(arg):
+    try:
+        view = memoryview(arg)
+    except TypeError:
+        raise TypeError("Argument {!r} expected to be of bytes, str, int,"
+                        " float type or support buffer protocol"
+                        .format(arg)) from None
+    if view.ndim == 0:
+        # scalars (ie ctypes.c_int, numpy.int64) must not be sent
+        # as their raw memory
+        raise TypeError("Argument {!r} expected to be of bytes, str, int,"
+                        " float type or non-scalar buffer".format(arg))
+    if not view.c_contiguous:
+        raise TypeError("Argument {!r} expected to be C-contiguous buffer"
+                        .format(arg))
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    return view
 
 
 def encode_command(*args):
     """Encodes arguments into redis bulk-strings array.
 
-    Raises TypeError if any of args not of bytes, str, int or float type.
+    Raises TypeError if any of args not of bytes, str, int, float type
+    or does not support buffer protocol.
     """
-    buf = bytearray()
+    parts = []
+    _encode_args(args, parts)
+    return b''.join(parts)
 
-    def add(data):
-        return buf.extend(data + b'\r\n')
 
-    add(b'*' + _bytes_len(args))
-    for arg in args:
-        if type(arg) in _converters:
-            barg = _converters[type(arg)](arg)
-            add(b'$' + _bytes_len(barg))
-            add(barg)
-        else:
-            raise TypeError("Argument {!r} expected to be of bytes,"
-                            " str, int or float type".format(arg))
-    return buf
+def encode_command_buffers(args, large_size):
+    """Encodes arguments into redis bulk-strings array
+    (same as encode_command).
+
+    Returns list of buffers: arguments of large_size bytes or more are
+    kept as separate buffers (not copied), the rest is joined.
+    """
+    parts = []
+    if _encode_args(args, parts) < large_size:
+        return [b''.join(parts)]
+    return join_buffers(parts, large_size)
+
+
+def join_buffers(buffers, large_size):
+    """Joins sequential buffers smaller than large_size bytes."""
+    res = []
+    start = 0
+    for i, buf in enumerate(buffers):
+        if len(buf) >= large_size:
+            if start < i:
+                res.append(b''.join(buffers[start:i]))
+            res.append(buf)
+            start = i + 1
+    if start < len(buffers):
+        res.append(b''.join(buffers[start:]))
+    return res
+
+
+def encode_commands(commands):
+    """Encodes sequence of commands (each one is a sequence of arguments)
+    into single buffer.
+
+    Raises TypeError if any of args not of bytes, str, int, float type
+    or does not support buffer protocol.
+    """
+    parts = []
+    for args in commands:
+        _encode_args(args, parts)
+    return b''.join(parts)
 
 
 def decode(obj, encoding):
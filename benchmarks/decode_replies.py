@@ -0,0 +1,68 @@
+"""Compares decoding of large multi-bulk replies:
+parsing bytes and decoding with aioredis.util.decode vs
+decoding by parser itself (set_encoding).
+
+Usage::
+
+    $ python benchmarks/decode_replies.py
+"""
+import timeit
+
+from aioredis.parser import PyReader, hiredis
+from aioredis.util import decode
+
+
+def _bulk(value):
+    value = value.encode('utf-8')
+    return b'$' + str(len(value)).encode() + b'\r\n' + value + b'\r\n'
+
+
+def _array(items):
+    return b'*' + str(len(items)).encode() + b'\r\n' + b''.join(items)
+
+
+CASES = [
+    ('LRANGE 10k', _array([_bulk('item:{}'.format(i))
+                           for i in range(10000)])),
+    ('HGETALL 10k', _array([_bulk(s) for i in range(10000)
+                            for s in ('field:{}'.format(i), 'значение')])),
+    ('LRANGE 100 x 100', _array([_bulk('item:{}'.format(i))
+                                 for i in range(100)]) * 100),
+    ]
+
+
+def parse_decode(reader_cls, data):
+    reader = reader_cls()
+    reader.feed(data)
+    obj = reader.gets()
+    while obj is not False:
+        decode(obj, 'utf-8')
+        obj = reader.gets()
+
+
+def parser_decode(reader_cls, data):
+    reader = reader_cls()
+    reader.set_encoding('utf-8')
+    reader.feed(data)
+    while reader.gets() is not False:
+        pass
+
+
+def main(number=50):
+    readers = [('python', PyReader)]
+    if hiredis is not None:
+        readers.insert(0, ('hiredis', hiredis.Reader))
+    print("{:<18} {:<8} {:>14} {:>14} {:>8}".format(
+        "case", "parser", "decode(), ms", "parser, ms", "speedup"))
+    for name, data in CASES:
+        for reader_name, reader_cls in readers:
+            old = timeit.timeit(lambda: parse_decode(reader_cls, data),
+                                number=number) / number
+            new = timeit.timeit(lambda: parser_decode(reader_cls, data),
+                                number=number) / number
+            print("{:<18} {:<8} {:>14.3f} {:>14.3f} {:>7.2f}x".format(
+                name, reader_name, old * 1000, new * 1000, old / new))
+
+
+if __name__ == '__main__':
+    main()
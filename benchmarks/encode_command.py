@@ -0,0 +1,64 @@
+"""Compares encode_command with previous (closure-based) implementation.
+
+Usage::
+
+    $ python benchmarks/encode_command.py
+"""
+import timeit
+
+from aioredis.util import encode_command, encode_commands, _converters
+
+
+def _bytes_len(sized):
+    return str(len(sized)).encode('utf-8')
+
+
+def old_encode_command(*args):
+    buf = bytearray()
+
+    def add(data):
+        return buf.extend(data + b'\r\n')
+
+    add(b'*' + _bytes_len(args))
+    for arg in args:
+        if type(arg) in _converters:
+            barg = _converters[type(arg)](arg)
+            add(b'$' + _bytes_len(barg))
+            add(barg)
+        else:
+            raise TypeError("Argument {!r} expected to be of bytes,"
+                            " str, int or float type".format(arg))
+    return buf
+
+
+CASES = [
+    ('GET', (b'GET', 'key:1'), 1),
+    ('SET', (b'SET', 'key:1', b'x' * 100, b'EX', 60), 1),
+    ('HMSET', (b'HMSET', 'hash:1') + tuple(
+        'field:{}'.format(i) for i in range(20)), 1),
+    ('SET 1MB', (b'SET', 'key:1', b'x' * 2 ** 20), 100),
+    ]
+
+
+def main(number=100000):
+    print("{:<12} {:>12} {:>12} {:>8}".format(
+        "command", "old, usec", "new, usec", "speedup"))
+    for name, args, scale in CASES:
+        assert bytes(old_encode_command(*args)) == encode_command(*args)
+        n = number // scale
+        old = timeit.timeit(lambda: old_encode_command(*args), number=n)
+        new = timeit.timeit(lambda: encode_command(*args), number=n)
+        print("{:<12} {:>12.3f} {:>12.3f} {:>7.2f}x".format(
+            name, old / n * 1e6, new / n * 1e6, old / new))
+
+    commands = [(b'GET', 'key:{}'.format(i)) for i in range(1000)]
+    n = number // 1000
+    old = timeit.timeit(
+        lambda: b''.join(old_encode_command(*c) for c in commands), number=n)
+    new = timeit.timeit(lambda: encode_commands(commands), number=n)
+    print("{:<12} {:>12.3f} {:>12.3f} {:>7.2f}x".format(
+        "1000 x GET", old / n * 1e6, new / n * 1e6, old / new))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Compares MultiExec throughput with previous implementation
+(future per MULTI, QUEUED and EXEC reply gathered with asyncio.shield).
+
+Each transaction buffers INCR commands and executes them.
+
+Usage::
+
+    $ python benchmarks/multi_exec.py [host:port]
+"""
+import asyncio
+import functools
+import sys
+import time
+
+from aioredis import create_redis, Redis, RedisError, MultiExecError
+from aioredis.commands import MultiExec
+
+
+class OldMultiExec(MultiExec):
+    """MultiExec from aioredis v0.2.9."""
+
+    def _send_pipeline(self, conn):
+        for fut, cmd, args, encoding in self._pipeline:
+            try:
+                result_fut = conn.execute(cmd, *args, encoding=encoding)
+                result_fut.add_done_callback(
+                    functools.partial(self._check_result, waiter=fut))
+            except Exception as exc:
+                fut.set_exception(exc)
+            else:
+                yield result_fut
+
+    @asyncio.coroutine
+    def _do_execute(self, *, return_exceptions=False):
+        self._waiters = waiters = []
+        conn = yield from self._conn.get_atomic_connection()
+        multi = conn.execute('MULTI')
+        coros = list(self._send_pipeline(conn))
+        exec_ = conn.execute('EXEC')
+        gather = asyncio.gather(multi, *coros, loop=self._loop,
+                                return_exceptions=True)
+        try:
+            yield from asyncio.shield(gather, loop=self._loop)
+        except asyncio.CancelledError:
+            yield from gather
+        finally:
+            if conn.closed:
+                for fut in waiters:
+                    fut.cancel()
+                for fut in self._results:
+                    if not fut.done():
+                        fut.cancel()
+            else:
+                try:
+                    results = yield from exec_
+                except RedisError as err:
+                    for fut in waiters:
+                        fut.set_exception(err)
+                else:
+                    assert len(results) == len(waiters), (
+                        "Results does not match waiters", results, waiters)
+                    self._old_resolve_waiters(results, return_exceptions)
+            return (yield from self._gather_result(return_exceptions))
+
+    def _old_resolve_waiters(self, results, return_exceptions):
+        errors = []
+        for val, fut in zip(results, self._waiters):
+            if isinstance(val, RedisError):
+                fut.set_exception(val)
+                errors.append(val)
+            else:
+                fut.set_result(val)
+        if errors and not return_exceptions:
+            raise MultiExecError(errors)
+
+    def _check_result(self, fut, waiter):
+        if fut.cancelled():
+            waiter.cancel()
+        elif fut.exception():
+            waiter.set_exception(fut.exception())
+        elif fut.result() in {b'QUEUED', 'QUEUED'}:
+            self._waiters.append(waiter)
+
+
+CASES = [
+    # number of commands per transaction
+    1,
+    10,
+    1000,
+    ]
+
+
+@asyncio.coroutine
+def run_case(redis, multi_exec_cls, size, loop, number=50000):
+    transactions = max(number // size, 1)
+    t0 = time.monotonic()
+    for _ in range(transactions):
+        tr = multi_exec_cls(redis.connection, Redis, loop=loop)
+        for _ in range(size):
+            tr.incr('foo')
+        yield from tr.execute()
+    elapsed = time.monotonic() - t0
+    return transactions * size / elapsed
+
+
+def main():
+    host, port = (sys.argv[1] if len(sys.argv) > 1
+                  else 'localhost:6379').split(':')
+    loop = asyncio.get_event_loop()
+    redis = loop.run_until_complete(
+        create_redis((host, int(port)), loop=loop))
+    print("{:<10} {:>12} {:>12} {:>8}".format(
+        "commands", "old, ops/s", "new, ops/s", "speedup"))
+    for size in CASES:
+        old = loop.run_until_complete(
+            run_case(redis, OldMultiExec, size, loop))
+        new = loop.run_until_complete(
+            run_case(redis, MultiExec, size, loop))
+        print("{:<10} {:>12.0f} {:>12.0f} {:>7.2f}x".format(
+            size, old, new, new / old))
+    redis.close()
+    loop.run_until_complete(redis.wait_closed())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Compares protocol parsers: hiredis.Reader and aioredis.parser.PyReader.
+
+Usage::
+
+    $ python benchmarks/parser.py
+"""
+import timeit
+
+from aioredis.parser import PyReader, hiredis
+
+CHUNK_SIZE = 65536
+
+
+def _bulk(value):
+    return b'$' + str(len(value)).encode() + b'\r\n' + value + b'\r\n'
+
+
+def _array(items):
+    return b'*' + str(len(items)).encode() + b'\r\n' + b''.join(items)
+
+
+def _nested(depth, width):
+    reply = b':1\r\n'
+    for _ in range(depth):
+        reply = _array([reply] * width)
+    return reply
+
+
+CASES = [
+    ('1000 integers', b''.join(
+        b':' + str(i).encode() + b'\r\n' for i in range(1000))),
+    ('1000 x 100B bulk', _bulk(b'x' * 100) * 1000),
+    ('10 x 1MB bulk', _bulk(b'x' * 2 ** 20) * 10),
+    ('10k array', _array([_bulk(b'value:' + str(i).encode())
+                          for i in range(10000)])),
+    ('nested 5x6', _nested(5, 6)),
+    ('nested 100x1', _nested(100, 1)),
+    ]
+
+
+def parse(reader_cls, data):
+    reader = reader_cls()
+    count = 0
+    for pos in range(0, len(data), CHUNK_SIZE):
+        reader.feed(data, pos, min(CHUNK_SIZE, len(data) - pos))
+        while reader.gets() is not False:
+            count += 1
+    return count
+
+
+def main(number=20):
+    readers = [('python', PyReader)]
+    if hiredis is not None:
+        readers.insert(0, ('hiredis', hiredis.Reader))
+    print("{:<18}".format("case") + "".join(
+        "{:>14}".format(name + ", ms") for name, _ in readers))
+    for name, data in CASES:
+        line = "{:<18}".format(name)
+        for _, reader_cls in readers:
+            t = timeit.timeit(lambda: parse(reader_cls, data), number=number)
+            line += "{:>14.3f}".format(t / number * 1000)
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
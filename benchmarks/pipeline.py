@@ -0,0 +1,129 @@
+"""Compares Pipeline throughput with previous implementation
+(asyncio.Task per buffered command, conn.execute() per command).
+
+Each pipeline buffers pairs of GET and INCR commands
+(same as examples/pipeline.py) and executes them.
+
+Usage::
+
+    $ python benchmarks/pipeline.py [host:port]
+"""
+import asyncio
+import functools
+import sys
+import time
+
+from aioredis import create_redis, Redis
+from aioredis.commands import Pipeline
+from aioredis.util import async_task, create_future
+
+
+class _OldRedisBuffer:
+
+    def __init__(self, pipeline, *, loop=None):
+        self._pipeline = pipeline
+        self._loop = loop
+
+    def execute(self, cmd, *args, **kw):
+        fut = create_future(loop=self._loop)
+        self._pipeline.append((fut, cmd, args, kw))
+        return fut
+
+
+class OldPipeline(Pipeline):
+    """Pipeline from aioredis v0.2.9."""
+
+    def __init__(self, connection, commands_factory=lambda conn: conn,
+                 *, loop=None):
+        super().__init__(connection, loop=loop)
+        self._buffer = _OldRedisBuffer(self._pipeline, loop=loop)
+        self._redis = commands_factory(self._buffer)
+
+    def __getattr__(self, name):
+        attr = getattr(self._redis, name)
+        if callable(attr):
+
+            @functools.wraps(attr)
+            def wrapper(*args, **kw):
+                try:
+                    task = async_task(attr(*args, **kw), loop=self._loop)
+                except Exception as exc:
+                    task = create_future(loop=self._loop)
+                    task.set_exception(exc)
+                self._results.append(task)
+                return task
+            return wrapper
+        return attr
+
+    @asyncio.coroutine
+    def _do_execute(self, *, return_exceptions=False):
+        conn = yield from self._conn.get_atomic_connection()
+        yield from asyncio.gather(*self._send_pipeline(conn),
+                                  loop=self._loop,
+                                  return_exceptions=True)
+        return (yield from self._gather_result(return_exceptions))
+
+    def _send_pipeline(self, conn):
+        for fut, cmd, args, kw in self._pipeline:
+            try:
+                result_fut = conn.execute(cmd, *args, **kw)
+                result_fut.add_done_callback(
+                    functools.partial(self._check_result, waiter=fut))
+            except Exception as exc:
+                fut.set_exception(exc)
+            else:
+                yield result_fut
+
+    def _check_result(self, fut, waiter):
+        if fut.cancelled():
+            waiter.cancel()
+        elif fut.exception():
+            waiter.set_exception(fut.exception())
+        else:
+            waiter.set_result(fut.result())
+
+
+CASES = [
+    # number of GET/INCR pairs per pipeline
+    1,
+    50,
+    500,
+    5000,
+    ]
+
+
+@asyncio.coroutine
+def run_case(redis, pipeline_cls, size, loop, number=100000):
+    pipelines = max(number // (size * 2), 1)
+    t0 = time.monotonic()
+    for _ in range(pipelines):
+        pipe = pipeline_cls(redis.connection, Redis, loop=loop)
+        for _ in range(size):
+            pipe.get('foo')
+            pipe.incr('bar')
+        yield from pipe.execute()
+    elapsed = time.monotonic() - t0
+    return pipelines * size * 2 / elapsed
+
+
+def main():
+    host, port = (sys.argv[1] if len(sys.argv) > 1
+                  else 'localhost:6379').split(':')
+    loop = asyncio.get_event_loop()
+    redis = loop.run_until_complete(
+        create_redis((host, int(port)), loop=loop))
+    print("{:<10} {:>12} {:>12} {:>8}".format(
+        "commands", "old, ops/s", "new, ops/s", "speedup"))
+    for size in CASES:
+        old = loop.run_until_complete(
+            run_case(redis, OldPipeline, size, loop))
+        new = loop.run_until_complete(
+            run_case(redis, Pipeline, size, loop))
+        print("{:<10} {:>12.0f} {:>12.0f} {:>7.2f}x".format(
+            size * 2, old, new, new / old))
+    redis.close()
+    loop.run_until_complete(redis.wait_closed())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Compares RedisPool acquire/release throughput with previous
+(asyncio.Condition-based) implementation.
+
+Many tasks compete for few connections; each task acquires connection,
+optionally executes PING and releases it.
+
+Usage::
+
+    $ python benchmarks/pool_acquire.py [host:port]
+"""
+import asyncio
+import sys
+import time
+
+from aioredis import Redis
+from aioredis.pool import RedisPool
+from aioredis.util import async_task
+
+
+class OldRedisPool(RedisPool):
+    """RedisPool with acquire/release from aioredis v0.2.9."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cond = asyncio.Condition(loop=self._loop)
+
+    @asyncio.coroutine
+    def acquire(self):
+        with (yield from self._cond):
+            while True:
+                yield from self._fill_free()
+                if not self.freesize and self.size < self.maxsize:
+                    yield from self._create_free(1)
+                if self.freesize:
+                    conn = self._pool.popleft()
+                    self._used.add(conn)
+                    return conn
+                else:
+                    yield from self._cond.wait()
+
+    def release(self, conn):
+        self._used.remove(conn)
+        if not conn.closed and conn.db == self.db:
+            self._pool.append(conn)
+        else:
+            conn.close()
+        async_task(self._old_wakeup(), loop=self._loop)
+
+    @asyncio.coroutine
+    def _old_wakeup(self):
+        with (yield from self._cond):
+            self._cond.notify()
+
+
+CASES = [
+    # (tasks, pool size, execute PING)
+    (1, 1, False),
+    (100, 1, False),
+    (100, 10, False),
+    (1000, 10, False),
+    (100, 10, True),
+    ]
+
+
+@asyncio.coroutine
+def run_case(address, pool_cls, tasks, size, ping, loop, number=50000):
+    pool = pool_cls(address, minsize=size, maxsize=size,
+                    commands_factory=Redis, loop=loop)
+    yield from pool._fill_free()
+    per_task = number // tasks
+
+    @asyncio.coroutine
+    def worker():
+        for _ in range(per_task):
+            conn = yield from pool.acquire()
+            try:
+                if ping:
+                    yield from conn.ping()
+            finally:
+                pool.release(conn)
+
+    t0 = time.monotonic()
+    yield from asyncio.gather(*[worker() for _ in range(tasks)], loop=loop)
+    elapsed = time.monotonic() - t0
+    # let pending wakeup tasks finish
+    yield from asyncio.sleep(0.01, loop=loop)
+    pool.close()
+    yield from pool.wait_closed()
+    return per_task * tasks / elapsed
+
+
+def main():
+    host, port = (sys.argv[1] if len(sys.argv) > 1
+                  else 'localhost:6379').split(':')
+    address = host, int(port)
+    loop = asyncio.get_event_loop()
+    print("{:<8} {:<6} {:<6} {:>12} {:>12} {:>8}".format(
+        "tasks", "size", "ping", "old, ops/s", "new, ops/s", "speedup"))
+    for tasks, size, ping in CASES:
+        old = loop.run_until_complete(
+            run_case(address, OldRedisPool, tasks, size, ping, loop))
+        new = loop.run_until_complete(
+            run_case(address, RedisPool, tasks, size, ping, loop))
+        print("{:<8} {:<6} {:<6} {:>12.0f} {:>12.0f} {:>7.2f}x".format(
+            tasks, size, str(ping), old, new, new / old))
+
+
+if __name__ == '__main__':
+    main()
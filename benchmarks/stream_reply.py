@@ -0,0 +1,89 @@
+"""Compares peak memory and time of reading large value with
+RedisConnection.execute() and RedisConnection.execute_into().
+
+Each case is run in separate process, peak memory is measured
+as growth of process max RSS while reading the value.
+
+Usage::
+
+    $ python benchmarks/stream_reply.py [host:port] [size in MB]
+"""
+import asyncio
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import aioredis
+
+
+KEY = 'benchmark:stream_reply'
+CASES = ('execute', 'execute_into buffer', 'execute_into file')
+
+
+def max_rss():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@asyncio.coroutine
+def prepare(address, size, loop):
+    conn = yield from aioredis.create_connection(address, loop=loop)
+    yield from conn.execute('set', KEY, bytearray(size))
+    conn.close()
+    yield from conn.wait_closed()
+
+
+@asyncio.coroutine
+def run_case(case, address, size, loop):
+    conn = yield from aioredis.create_connection(
+        address, buffered=True, loop=loop)
+    if case == 'execute':
+        target = None
+    elif case == 'execute_into buffer':
+        # touch all pages so buffer itself is not counted
+        target = bytearray(b'\xff' * size)
+    else:
+        target = tempfile.TemporaryFile()
+    yield from conn.execute('ping')
+
+    rss = max_rss()
+    t0 = time.monotonic()
+    if target is None:
+        res = len((yield from conn.execute('get', KEY)))
+    else:
+        res = yield from conn.execute_into(target, 'get', KEY)
+    elapsed = time.monotonic() - t0
+    assert res == size, res
+    conn.close()
+    yield from conn.wait_closed()
+    return elapsed, max_rss() - rss
+
+
+def main():
+    host, port = (sys.argv[1] if len(sys.argv) > 1
+                  else 'localhost:6379').split(':')
+    address = host, int(port)
+    size = int(sys.argv[2] if len(sys.argv) > 2 else 100) * 2 ** 20
+    loop = asyncio.get_event_loop()
+
+    if len(sys.argv) > 3:
+        elapsed, rss = loop.run_until_complete(
+            run_case(sys.argv[3], address, size, loop))
+        print("{:<22} {:>10.3f} {:>14.1f}".format(
+            sys.argv[3], elapsed * 1000, rss / 2 ** 20))
+        return
+
+    loop.run_until_complete(prepare(address, size, loop))
+    print("{:<22} {:>10} {:>14}".format(
+        "{}MB value".format(size // 2 ** 20), "time, ms", "peak mem, MB"))
+    sys.stdout.flush()
+    for case in CASES:
+        subprocess.check_call([sys.executable, __file__,
+                               '{}:{}'.format(*address),
+                               str(size // 2 ** 20), case])
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,8 @@ import sys
 from setuptools import setup, find_packages
 
 
-install_requires = ['hiredis']
+# pure-python parser is used where hiredis is not available (eg PyPy)
+install_requires = ['hiredis; platform_python_implementation == "CPython"']
 
 PY_VER = sys.version_info
 
@@ -0,0 +1,141 @@
+import asyncio
+import pytest
+
+from aioredis import AutoPipeline, ReplyError
+
+
+@pytest.fixture
+def redis(create_redis, server, loop):
+    redis = loop.run_until_complete(
+        create_redis(server.tcp_address, autopipeline=True, loop=loop))
+    loop.run_until_complete(redis.flushall())
+    return redis
+
+
+@pytest.mark.run_loop
+def test_batching(redis, loop):
+    assert isinstance(redis.connection, AutoPipeline)
+    conn = redis.connection
+    assert conn.batch_count == 1    # flushall
+    assert conn.avg_batch_size == 1
+
+    @asyncio.coroutine
+    def handler(i):
+        yield from redis.set('key:{}'.format(i), i)
+        return (yield from asyncio.gather(
+            redis.get('key:{}'.format(i)),
+            redis.incr('key:{}'.format(i)),
+            redis.exists('key:{}'.format(i)),
+            loop=loop))
+
+    res = yield from asyncio.gather(*[handler(i) for i in range(10)],
+                                    loop=loop)
+    assert res == [[str(i).encode(), i + 1, 1] for i in range(10)]
+    assert conn.batch_count == 3
+    assert conn.command_count == 41
+    assert conn.avg_batch_size == 41 / 3
+
+
+@pytest.mark.run_loop
+def test_errors(redis, loop):
+    fut1 = redis.set('key', 'value')
+    fut2 = redis.incr('key')
+    fut3 = redis.connection.execute('GET', None)
+    fut4 = redis.get('key')
+    assert (yield from fut1) is True
+    with pytest.raises(ReplyError):
+        yield from fut2
+    with pytest.raises(TypeError):
+        yield from fut3
+    assert (yield from fut4) == b'value'
+    assert redis.connection.command_count == 5
+
+
+@pytest.mark.run_loop
+def test_cancelled_command_not_sent(redis, loop):
+    fut1 = redis.incr('key')
+    fut2 = redis.incr('key')
+    fut1.cancel()
+    assert (yield from fut2) == 1
+
+
+@pytest.mark.run_loop
+def test_max_batch_size(create_redis, server, loop):
+    redis = yield from create_redis(server.tcp_address, loop=loop)
+    conn = AutoPipeline(redis.connection, max_batch_size=3)
+    futs = [conn.execute('PING') for _ in range(7)]
+    assert conn.batch_count == 2
+    res = yield from asyncio.gather(*futs, loop=loop)
+    assert res == [b'PONG'] * 7
+    assert conn.batch_count == 3
+
+
+@pytest.mark.run_loop
+def test_flush_interval(create_redis, server, loop):
+    redis = yield from create_redis(server.tcp_address, loop=loop)
+    conn = AutoPipeline(redis.connection, flush_interval=.05)
+    fut1 = conn.execute('PING')
+    yield from asyncio.sleep(.01, loop=loop)
+    fut2 = conn.execute('PING')
+    assert conn.batch_count == 0
+    res = yield from asyncio.gather(fut1, fut2, loop=loop)
+    assert res == [b'PONG', b'PONG']
+    assert conn.batch_count == 1
+
+
+@pytest.mark.run_loop
+def test_create_redis_options(create_redis, server, loop):
+    redis = yield from create_redis(
+        server.tcp_address, autopipeline=True,
+        autopipeline_max_batch_size=3, autopipeline_flush_interval=.05,
+        loop=loop)
+    conn = redis.connection
+    futs = [redis.ping() for _ in range(4)]
+    # full batch is sent right away, the rest after flush_interval
+    assert conn.batch_count == 1
+    yield from asyncio.sleep(.01, loop=loop)
+    assert conn.batch_count == 1
+    res = yield from asyncio.gather(*futs, loop=loop)
+    assert res == [b'PONG'] * 4
+    assert conn.batch_count == 2
+
+
+@pytest.mark.run_loop
+def test_ordering(redis, loop):
+    fut1 = redis.set('key', 'db0')
+    res = yield from redis.select(1)
+    assert res is True
+    assert (yield from fut1) is True
+    assert (yield from redis.get('key')) is None
+    yield from redis.select(0)
+    assert (yield from redis.get('key')) == b'db0'
+
+    fut = redis.incr('counter')
+    tr = redis.multi_exec()
+    tr.incr('counter')
+    res = yield from tr.execute()
+    assert res == [2]
+    assert (yield from fut) == 1
+
+    pipe = redis.pipeline()
+    pipe.incr('counter')
+    pipe.incr('counter')
+    res = yield from pipe.execute()
+    assert res == [3, 4]
+
+    fut = redis.set('key', 'value')
+    buf = bytearray(5)
+    res = yield from redis.connection.execute_into(buf, 'get', 'key')
+    assert res == 5
+    assert buf == b'value'
+    assert (yield from fut) is True
+
+
+@pytest.mark.run_loop
+def test_pubsub(redis, create_redis, server, loop):
+    pub = yield from create_redis(server.tcp_address, loop=loop)
+    fut = redis.set('key', 'value')
+    ch, = yield from redis.subscribe('chan:1')
+    assert (yield from fut) is True
+    yield from pub.publish('chan:1', 'hello')
+    assert (yield from ch.get()) == b'hello'
@@ -13,6 +13,7 @@ import logging
 from collections import namedtuple
 
 import aioredis
+import aioredis.parser
 
 
 # Public fixtures
@@ -47,11 +48,12 @@ def unused_port():
 
 
 @pytest.fixture
-def create_connection(_closable):
+def create_connection(_closable, request):
     """Wrapper around aioredis.create_connection."""
 
     @asyncio.coroutine
     def f(*args, **kw):
+        _set_defaults(kw, request.config)
         conn = yield from aioredis.create_connection(*args, **kw)
         _closable(conn)
         return conn
@@ -59,11 +61,12 @@ def create_connection(_closable):
 
 
 @pytest.fixture
-def create_redis(_closable, loop):
+def create_redis(_closable, loop, request):
     """Wrapper around aioredis.create_redis."""
 
     @asyncio.coroutine
     def f(*args, **kw):
+        _set_defaults(kw, request.config)
         redis = yield from aioredis.create_redis(*args, **kw)
         _closable(redis)
         return redis
@@ -71,11 +74,12 @@ def create_redis(_closable, loop):
 
 
 @pytest.fixture
-def create_pool(_closable):
+def create_pool(_closable, request):
     """Wrapper around aioredis.create_pool."""
 
     @asyncio.coroutine
     def f(*args, **kw):
+        _set_defaults(kw, request.config)
         redis = yield from aioredis.create_pool(*args, **kw)
         _closable(redis)
         return redis
@@ -129,6 +133,17 @@ def serverB(start_server):
 # Internal stuff #
 
 
+PARSERS = {
+    'hiredis': getattr(aioredis.parser.hiredis, 'Reader', None),
+    'python': aioredis.parser.PyReader,
+    }
+
+
+def _set_defaults(kw, config):
+    kw.setdefault('buffered', config.getoption('--buffered'))
+    kw.setdefault('parser', PARSERS[config.getoption('--parser')])
+
+
 def pytest_addoption(parser):
     parser.addoption('--redis-server', default=[],
                      action="append",
@@ -139,6 +154,13 @@ def pytest_addoption(parser):
     parser.addoption('--uvloop', default=False,
                      action='store_true',
                      help="Run tests with uvloop")
+    parser.addoption('--buffered', default=False,
+                     action='store_true',
+                     help="Run tests with buffered protocol connections")
+    parser.addoption('--parser', default='hiredis',
+                     choices=sorted(PARSERS),
+                     help="Protocol parser to use, defaults to"
+                          " `%(default)s`")
 
 
 def _read_server_version(redis_bin):
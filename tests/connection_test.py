@@ -1,7 +1,17 @@
+import io
+import array
+import logging
+import socket
 import pytest
 import asyncio
 
-from aioredis.util import async_task
+from aioredis.util import async_task, encode_command, _NOTSET
+from aioredis.parser import PyReader
+from aioredis.connection import (
+    RedisProtocol,
+    MAX_CHUNK_SIZE,
+    _BulkStream,
+    )
 
 from aioredis import (
     ConnectionClosedError,
@@ -49,6 +59,67 @@ def test_global_loop(create_connection, loop, server):
     assert conn._loop is loop
 
 
+@pytest.mark.run_loop
+def test_connect_buffered(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, buffered=True, loop=loop)
+    assert isinstance(conn._reader, RedisProtocol)
+    assert conn._reader_task is None
+    assert conn.address[1] == server.tcp_address.port
+    res = yield from conn.execute('echo', 'hello')
+    assert res == b'hello'
+
+    conn = yield from create_connection(
+        server.unixsocket, db=1, buffered=True, loop=loop)
+    assert isinstance(conn._reader, RedisProtocol)
+    assert conn.db == 1
+    assert conn.address == server.unixsocket
+    res = yield from conn.execute('echo', 'hello')
+    assert res == b'hello'
+
+
+@pytest.mark.run_loop
+def test_buffered_large_reply(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, buffered=True, loop=loop)
+    value = b'x' * (MAX_CHUNK_SIZE * 3 + 1)
+    yield from conn.execute('set', 'key:large', value)
+    futs = [conn.execute('get', 'key:large') for _ in range(3)]
+    res = yield from asyncio.gather(*futs, loop=loop)
+    assert res == [value] * 3
+
+
+@pytest.mark.run_loop
+def test_buffered_server_close(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, buffered=True, loop=loop)
+    res = yield from conn.execute('quit')
+    assert res == b'OK'
+    yield from conn.wait_closed()
+    assert conn.closed
+    with pytest.raises(ConnectionClosedError):
+        yield from conn.execute('echo', 'hello')
+
+
+@pytest.mark.run_loop
+def test_buffered_connection_lost(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, buffered=True, loop=loop)
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('aioredis')
+    logger.addHandler(handler)
+    try:
+        conn._reader.connection_lost(ConnectionResetError())
+        yield from conn.wait_closed()
+    finally:
+        logger.removeHandler(handler)
+    assert conn.closed
+    # server-side disconnect is not an error
+    assert not [r for r in records if r.levelno >= logging.WARNING]
+
+
 @pytest.mark.run_loop
 def test_select_db(create_connection, loop, server):
     address = server.tcp_address
@@ -154,11 +225,11 @@ def test_closed_connection_with_none_reader(create_connection, loop, server):
 def test_wait_closed(create_connection, loop, server):
     address = server.tcp_address
     conn = yield from create_connection(address, loop=loop)
-    reader_task = conn._reader_task
+    close_waiter = conn._close_waiter
     conn.close()
-    assert not reader_task.done()
+    assert not close_waiter.done()
     yield from conn.wait_closed()
-    assert reader_task.done()
+    assert close_waiter.done()
 
 
 @pytest.mark.run_loop
@@ -166,7 +237,7 @@ def test_cancel_wait_closed(create_connection, loop, server):
     # Regression test: Don't throw error if wait_closed() is cancelled.
     address = server.tcp_address
     conn = yield from create_connection(address, loop=loop)
-    reader_task = conn._reader_task
+    close_waiter = conn._close_waiter
     conn.close()
     task = async_task(conn.wait_closed(), loop=loop)
 
@@ -175,7 +246,7 @@ def test_cancel_wait_closed(create_connection, loop, server):
     loop.call_soon(task.cancel)
 
     yield from conn.wait_closed()
-    assert reader_task.done()
+    assert close_waiter.done()
 
 
 @pytest.mark.run_loop
@@ -237,6 +308,53 @@ def test_decoding(create_connection, loop, server):
     assert res == 'значение'
 
 
+@pytest.mark.run_loop
+def test_decoding_pipelined(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, encoding='utf-8', loop=loop)
+    yield from conn.execute('del', 'key:list')
+    yield from conn.execute('rpush', 'key:list', 'значение', b'\xff')
+
+    res = yield from asyncio.gather(
+        conn.execute('lrange', 'key:list', 0, 0),
+        conn.execute('lrange', 'key:list', 0, -1, encoding=None),
+        conn.execute('lrange', 'key:list', 0, -1),
+        conn.execute('lrange', 'key:list', 1, 1, encoding='latin-1'),
+        conn.execute('echo', 'ok'),
+        loop=loop, return_exceptions=True)
+    assert res[0] == ['значение']
+    assert res[1] == ['значение'.encode('utf-8'), b'\xff']
+    assert isinstance(res[2], UnicodeDecodeError)
+    assert res[3] == ['\xff']
+    assert res[4] == 'ok'
+
+
+class _NoCodecReader:
+    """Parser without set_encoding support."""
+
+    def __init__(self, **kwargs):
+        self._reader = PyReader(**kwargs)
+        self.feed = self._reader.feed
+        self.gets = self._reader.gets
+
+
+@pytest.mark.run_loop
+def test_decoding_no_parser_codec(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, encoding='utf-8', parser=_NoCodecReader,
+        loop=loop)
+    assert conn._parser_encoding is _NOTSET
+    yield from conn.execute('del', 'key:list')
+    yield from conn.execute('rpush', 'key:list', 'значение', b'\xff')
+    res = yield from conn.execute('lrange', 'key:list', 0, 0)
+    assert res == ['значение']
+    res = yield from conn.execute('lrange', 'key:list', 0, -1,
+                                  encoding=None)
+    assert res == ['значение'.encode('utf-8'), b'\xff']
+    with pytest.raises(UnicodeDecodeError):
+        yield from conn.execute('lrange', 'key:list', 0, -1)
+
+
 @pytest.mark.run_loop
 def test_execute_exceptions(create_connection, loop, server):
     conn = yield from create_connection(
@@ -398,3 +516,340 @@ def test_execute_pubsub_errors(create_connection, loop, server):
         sub.execute_pubsub(
             'punsubscribe',
             Channel('chan:1', is_pattern=False, loop=loop))
+
+
+@pytest.mark.run_loop
+def test_batch_writes(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, batch_writes=True, loop=loop)
+    writes = []
+    write = conn._writer.write
+
+    def _write(data):
+        writes.append(data)
+        return write(data)
+    conn._writer.write = _write
+
+    futs = [conn.execute('incr', 'key:counter') for _ in range(100)]
+    assert writes == []
+    res = yield from asyncio.gather(*futs, loop=loop)
+    assert res == list(range(1, 101))
+    assert len(writes) == 1
+
+    # buffer is flushed immediately when it is large enough
+    value = b'x' * (MAX_CHUNK_SIZE - 1)
+    del writes[:]
+    fut = conn.execute('set', 'key:large', value)
+    assert len(writes) == 1
+    assert (yield from fut) == b'OK'
+
+    res = yield from conn.execute_pubsub('subscribe', 'chan:1')
+    assert res == [[b'subscribe', b'chan:1', 1]]
+
+
+@pytest.mark.run_loop
+def test_large_buffer_args(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, large_arg_size=1024, loop=loop)
+    writes = []
+    writelines = conn._writer.writelines
+
+    def _writelines(buffers):
+        writes.append(buffers)
+        return writelines(buffers)
+    conn._writer.writelines = _writelines
+
+    value = array.array('B', range(256)) * 8
+    res = yield from conn.execute('set', 'key:buffer', value)
+    assert res == b'OK'
+    assert len(writes) == 1
+    assert writes[0][1].obj is value
+    res = yield from conn.execute('get', 'key:buffer')
+    assert res == value.tobytes()
+
+    value = memoryview(bytearray(b'x' * 100))
+    res = yield from conn.execute('set', 'key:buffer', value)
+    assert res == b'OK'
+    assert len(writes) == 1
+    res = yield from conn.execute('get', 'key:buffer')
+    assert res == b'x' * 100
+
+    with pytest.raises(TypeError):
+        conn.execute('set', 'key:buffer', value[::2])
+
+
+@pytest.mark.run_loop
+def test_batch_writes_close(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, batch_writes=True, loop=loop)
+    fut = conn.execute('echo', 'hello')
+    conn.close()
+    assert conn._flush_handle is None
+    with pytest.raises(asyncio.CancelledError):
+        yield from fut
+
+
+@pytest.mark.run_loop
+def test_execute_into(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, loop=loop)
+    value = bytes(range(256)) * 4096
+    yield from conn.execute('set', 'key:stream', value)
+
+    buf = bytearray(len(value) + 10)
+    res = yield from conn.execute_into(buf, 'get', 'key:stream')
+    assert res == len(value)
+    assert buf[:res] == value
+
+    fileobj = io.BytesIO()
+    res = yield from conn.execute_into(fileobj, 'getrange', 'key:stream',
+                                       0, 99)
+    assert res == 100
+    assert fileobj.getvalue() == value[:100]
+
+    arr = array.array('I', [0] * 4)
+    res = yield from conn.execute_into(arr, 'getrange', 'key:stream',
+                                       0, 15)
+    assert res == 16
+    assert arr.tobytes() == value[:16]
+
+    res = yield from conn.execute_into(buf, 'get', 'key:non-existent')
+    assert res is None
+    res = yield from conn.execute_into(buf, 'strlen', 'key:stream')
+    assert res == len(value)
+
+    with pytest.raises(ReplyError):
+        yield from conn.execute_into(buf, 'get')
+    with pytest.raises(ValueError):
+        yield from conn.execute_into(bytearray(10), 'get', 'key:stream')
+    assert (yield from conn.execute('echo', 'ok')) == b'ok'
+
+
+@pytest.mark.run_loop
+def test_execute_into_pipelined(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, loop=loop)
+    bufs = [bytearray(5) for _ in range(3)]
+    res = yield from asyncio.gather(
+        conn.execute('set', 'key:stream', 'value'),
+        conn.execute_into(bufs[0], 'get', 'key:stream'),
+        conn.execute_into(bufs[1], 'get', 'key:stream'),
+        conn.execute('append', 'key:stream', '!'),
+        conn.execute_into(bufs[2], 'getrange', 'key:stream', 1, 5),
+        conn.execute('get', 'key:stream'),
+        loop=loop)
+    assert res == [b'OK', 5, 5, 6, 5, b'value!']
+    assert bufs == [b'value', b'value', b'alue!']
+    assert conn._held_writes is None
+    assert conn._stream is None
+
+
+@pytest.mark.run_loop
+def test_execute_into_errors(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, loop=loop)
+    with pytest.raises(TypeError):
+        conn.execute_into(b'readonly', 'get', 'key')
+    with pytest.raises(TypeError):
+        conn.execute_into(object(), 'get', 'key')
+    with pytest.raises(TypeError):
+        conn.execute_into(bytearray(), 'get', None)
+    with pytest.raises(ValueError):
+        conn.execute_into(bytearray(), 'select', 1)
+    with pytest.raises(ValueError):
+        conn.execute_into(bytearray(), 'subscribe', 'chan')
+
+    fut = conn.execute('blpop', 'key:list', 0)
+    stream_fut = conn.execute_into(bytearray(), 'get', 'key')
+    conn.close()
+    with pytest.raises(asyncio.CancelledError):
+        yield from stream_fut
+    with pytest.raises(asyncio.CancelledError):
+        yield from fut
+    with pytest.raises(ConnectionClosedError):
+        conn.execute_into(bytearray(), 'get', 'key')
+
+
+def test_bulk_stream():
+    data = b'$10\r\n0123456789\r\n'
+    for size in (1, 2, 3, 7, len(data)):
+        buf = bytearray(10)
+        stream = _BulkStream(buf)
+        pos = 0
+        while not stream.done:
+            pos += stream.feed(memoryview(data[pos:pos + size]))
+        assert pos == len(data)
+        assert stream.size == 10
+        assert stream.header is None
+        assert buf == b'0123456789'
+
+    for data in (b'$-1\r\n', b'-ERR\r\n', b'*2\r\n', b':1\r\n',
+                 b'$' + b'1' * 40):
+        stream = _BulkStream(bytearray())
+        pos = stream.feed(memoryview(data))
+        assert stream.done
+        assert stream.header == data[:pos]
+
+
+@pytest.mark.run_loop
+def test_command_timeout(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, loop=loop)
+    yield from conn.execute('del', 'key:timeout')
+    fut = conn.execute('ping', timeout=1)
+    assert conn._timeout_handle is not None
+    assert (yield from fut) == b'PONG'
+    # timer is cancelled when no command waits for reply
+    assert conn._timeout_handle is None
+
+    fut1 = conn.execute('blpop', 'key:timeout', 0, timeout=.1)
+    fut2 = conn.execute('ping')
+    with pytest.raises(asyncio.TimeoutError):
+        yield from fut1
+    with pytest.raises(ConnectionClosedError):
+        yield from fut2
+    assert conn.closed
+    assert conn._timeout_handle is None
+    assert conn._deadlines == []
+
+
+@pytest.mark.run_loop
+def test_default_command_timeout(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, command_timeout=.5, loop=loop)
+    yield from conn.execute('del', 'key:timeout', 'key:timeout:counter')
+    res = yield from asyncio.gather(
+        *[conn.execute('incr', 'key:timeout:counter') for _ in range(100)],
+        loop=loop)
+    assert res == list(range(1, 101))
+    # completed commands don't stay in deadlines heap
+    assert conn._deadlines == []
+    assert conn._timeout_handle is None
+    futs = [conn.execute('incr', 'key:timeout:counter') for _ in range(10)]
+    assert len(conn._deadlines) == 10
+    yield from asyncio.gather(*futs[:6], loop=loop)
+    assert len(conn._deadlines) < 10
+    yield from asyncio.gather(*futs, loop=loop)
+    assert conn._deadlines == []
+    yield from asyncio.sleep(.55, loop=loop)
+    assert conn._deadlines == []
+    assert conn._timeout_handle is None
+    assert not conn.closed
+
+    # deadline of blocking command is extended by its server-side timeout
+    res = yield from conn.execute('blpop', 'key:timeout', 1)
+    assert res is None
+    assert not conn.closed
+    fut = conn.execute('blpop', 'key:timeout', 0)
+    assert conn._deadlines == []
+    fut.cancel()
+    with pytest.raises(asyncio.TimeoutError):
+        yield from conn.execute('blpop', 'key:timeout', 0, timeout=.1)
+    assert conn.closed
+
+
+@pytest.mark.run_loop
+def test_max_in_flight(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, max_in_flight=2, loop=loop)
+    other = yield from create_connection(server.tcp_address, loop=loop)
+    yield from conn.execute('del', 'key:in_flight')
+    assert conn.in_flight == 0
+    yield from conn.wait_capacity()
+
+    fut1 = conn.execute('blpop', 'key:in_flight', 0)
+    fut2 = conn.execute('ping')
+    assert conn.in_flight == 2
+    waiter = async_task(conn.execute_throttled('echo', 'foo'), loop=loop)
+    yield from asyncio.sleep(.05, loop=loop)
+    assert not waiter.done()
+    assert len(conn._capacity_waiters) == 1
+
+    yield from other.execute('rpush', 'key:in_flight', 'a')
+    res = yield from fut1
+    assert res == [b'key:in_flight', b'a']
+    res = yield from waiter
+    assert res == b'foo'
+    assert (yield from fut2) == b'PONG'
+    assert conn.in_flight == 0
+
+    fut1 = conn.execute('blpop', 'key:in_flight', 0)
+    fut2 = conn.execute('ping')
+    waiter = async_task(conn.wait_capacity(), loop=loop)
+    yield from asyncio.sleep(.05, loop=loop)
+    assert not waiter.done()
+    conn.close()
+    with pytest.raises(ConnectionClosedError):
+        yield from waiter
+    with pytest.raises(asyncio.CancelledError):
+        yield from fut1
+    with pytest.raises(ConnectionClosedError):
+        yield from conn.execute_throttled('ping')
+
+
+@pytest.mark.run_loop
+def test_write_high_water(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, write_high_water=2 ** 16, loop=loop)
+    assert conn.buffered_bytes == 0
+    fut = conn.execute('set', 'key:high_water', bytearray(2 ** 25))
+    assert conn.buffered_bytes > 0
+    yield from conn.wait_capacity()
+    assert conn.buffered_bytes <= 2 ** 16
+    assert (yield from fut) == b'OK'
+    assert conn.buffered_bytes == 0
+
+
+@pytest.mark.run_loop
+def test_tcp_keepalive(create_connection, loop, server):
+    conn = yield from create_connection(
+        server.tcp_address, tcp_keepalive=30, loop=loop)
+    sock = conn._writer.transport.get_extra_info('socket')
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE) == 30
+
+    conn = yield from create_connection(server.tcp_address, loop=loop)
+    sock = conn._writer.transport.get_extra_info('socket')
+    assert not sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+
+
+@pytest.mark.run_loop
+def test_stats(create_connection, loop, server):
+    conn = yield from create_connection(server.tcp_address, loop=loop)
+    stats = conn.stats
+    assert stats.snapshot() == {
+        'commands_sent': 0,
+        'bytes_written': 0,
+        'bytes_read': 0,
+        'replies_parsed': 0,
+        'errors': {},
+        'reconnects': 0,
+        'in_flight': 0,
+        'in_flight_peak': 0,
+        'watch_retries': 0,
+        }
+
+    fut1 = conn.execute('SET', 'key:stats', 'value')
+    fut2 = conn.execute('GET', 'key:stats')
+    assert stats.in_flight == 2
+    yield from asyncio.gather(fut1, fut2, loop=loop)
+    with pytest.raises(ReplyError):
+        yield from conn.execute('INCR', 'key:stats')
+
+    snapshot = stats.snapshot()
+    assert snapshot['commands_sent'] == 3
+    assert snapshot['bytes_written'] == sum(map(len, [
+        encode_command('SET', 'key:stats', 'value'),
+        encode_command('GET', 'key:stats'),
+        encode_command('INCR', 'key:stats')]))
+    # +OK, $5 value and -ERR replies
+    assert snapshot['bytes_read'] == 5 + 11 + len(
+        b'-ERR value is not an integer or out of range\r\n')
+    assert snapshot['replies_parsed'] == 3
+    assert snapshot['errors'] == {'ReplyError': 1}
+    assert snapshot['in_flight'] == 0
+    assert snapshot['in_flight_peak'] == 2
+    # snapshot is a copy
+    snapshot['errors']['ReplyError'] = 10
+    assert stats.errors == {'ReplyError': 1}
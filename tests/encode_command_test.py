@@ -1,6 +1,12 @@
+import array
+import ctypes
 import pytest
 
-from aioredis.util import encode_command
+from aioredis.util import (
+    encode_command,
+    encode_commands,
+    encode_command_buffers,
+    )
 
 
 def test_encode_bytes():
@@ -53,3 +59,80 @@ def test_encode_errors():
         encode_command(list())
     with pytest.raises(TypeError):
         encode_command(None)
+
+
+def test_encode_command_name():
+    res = encode_command('GET', 'key')
+    assert res == b'*2\r\n$3\r\nGET\r\n$3\r\nkey\r\n'
+    res = encode_command(b'HGET', b'key', 'field')
+    assert res == b'*3\r\n$4\r\nHGET\r\n$3\r\nkey\r\n$5\r\nfield\r\n'
+    res = encode_command('get', 'key')
+    assert res == b'*2\r\n$3\r\nget\r\n$3\r\nkey\r\n'
+    res = encode_command(bytearray(b'GET'), 'key')
+    assert res == b'*2\r\n$3\r\nGET\r\n$3\r\nkey\r\n'
+
+
+def test_encode_large():
+    value = b'x' * 100000
+    res = encode_command(b'SET', b'key', value)
+    assert res == (b'*3\r\n$3\r\nSET\r\n$3\r\nkey\r\n$100000\r\n' +
+                   value + b'\r\n')
+
+    res = encode_command(*([b'a'] * 2000))
+    assert res == b'*2000\r\n' + b'$1\r\na\r\n' * 2000
+
+
+def test_encode_commands():
+    res = encode_commands([])
+    assert res == b''
+
+    res = encode_commands([('SET', 'key', 1), (b'GET', b'key'), ()])
+    assert res == (b'*3\r\n$3\r\nSET\r\n$3\r\nkey\r\n$1\r\n1\r\n'
+                   b'*2\r\n$3\r\nGET\r\n$3\r\nkey\r\n'
+                   b'*0\r\n')
+
+    with pytest.raises(TypeError):
+        encode_commands([('GET', 'key'), ('GET', None)])
+
+
+def test_encode_buffers():
+    res = encode_command(memoryview(b'Hello'))
+    assert res == b'*1\r\n$5\r\nHello\r\n'
+
+    arr = array.array('I', [1, 2])
+    res = encode_command(b'SET', b'key', arr)
+    assert res == (b'*3\r\n$3\r\nSET\r\n$3\r\nkey\r\n$8\r\n' +
+                   arr.tobytes() + b'\r\n')
+
+    with pytest.raises(TypeError):
+        encode_command(memoryview(b'Hello')[::2])
+
+    arr = (ctypes.c_int * 2)(5, 6)
+    res = encode_command(b'SET', b'key', arr)
+    assert res == (b'*3\r\n$3\r\nSET\r\n$3\r\nkey\r\n$8\r\n' +
+                   bytes(arr) + b'\r\n')
+
+
+def test_encode_scalar_buffers():
+    # scalars are not sent as raw memory
+    with pytest.raises(TypeError):
+        encode_command(b'SET', b'key', ctypes.c_int(5))
+    with pytest.raises(TypeError):
+        encode_command(b'SET', b'key', ctypes.c_double(1.5))
+    with pytest.raises(TypeError):
+        encode_command_buffers((b'SET', b'key', ctypes.c_int(5)), 1)
+
+
+def test_encode_command_buffers():
+    res = encode_command_buffers((b'SET', b'key', b'value'), 20)
+    assert res == [b'*3\r\n$3\r\nSET\r\n$3\r\nkey\r\n$5\r\nvalue\r\n']
+
+    value = memoryview(bytearray(b'x' * 20))
+    res = encode_command_buffers((b'SET', b'key', value), 20)
+    assert res == [b'*3\r\n$3\r\nSET\r\n$3\r\nkey\r\n$20\r\n',
+                   value, b'\r\n']
+    assert res[1].obj is value.obj
+
+    res = encode_command_buffers((b'MSET', b'a', value, b'b', value), 20)
+    assert res == [b'*5\r\n$4\r\nMSET\r\n$1\r\na\r\n$20\r\n', value,
+                   b'\r\n$1\r\nb\r\n$20\r\n', value, b'\r\n']
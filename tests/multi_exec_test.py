@@ -8,7 +8,7 @@ from aioredis.util import create_future
 
 def test_global_loop():
     conn = mock.Mock(spec=(
-        'get_atomic_connection execute closed _transaction_error'
+        'get_atomic_connection _execute_transaction'
         .split()))
     # Needs to return yourself in get_atomic_connection()
     conn.get_atomic_connection.side_effect = \
@@ -23,19 +23,12 @@ def test_global_loop():
     tr = MultiExec(conn, commands_factory=Redis)
     assert tr._loop is loop
 
-    def make_fut(cmd, *args, **kw):
-        fut = create_future(asyncio.get_event_loop())
-        if cmd == 'PING':
-            fut.set_result(b'QUEUED')
-        elif cmd == 'EXEC':
-            fut.set_result([b'PONG'])
-        else:
-            fut.set_result(b'OK')
-        return fut
+    def execute_transaction(commands):
+        exec_ = create_future(asyncio.get_event_loop())
+        exec_.set_result([b'PONG'])
+        return exec_, [fut for fut, *spam in commands]
 
-    conn.execute.side_effect = make_fut
-    conn.closed = False
-    conn._transaction_error = None
+    conn._execute_transaction.side_effect = execute_transaction
 
     @asyncio.coroutine
     def go():
@@ -0,0 +1,115 @@
+import pytest
+
+from aioredis.parser import PyReader, hiredis
+from aioredis.errors import ProtocolError, ReplyError
+
+
+READERS = [PyReader]
+if hiredis is not None:
+    READERS.append(hiredis.Reader)
+
+
+@pytest.fixture(params=READERS, ids=lambda cls: cls.__module__)
+def reader_cls(request):
+    return request.param
+
+
+@pytest.fixture
+def reader(reader_cls):
+    return reader_cls(protocolError=ProtocolError, replyError=ReplyError)
+
+
+def test_simple_replies(reader):
+    reader.feed(b'+OK\r\n:123\r\n:-1\r\n$5\r\nhello\r\n$0\r\n\r\n'
+                b'$-1\r\n*-1\r\n*0\r\n')
+    assert reader.gets() == b'OK'
+    assert reader.gets() == 123
+    assert reader.gets() == -1
+    assert reader.gets() == b'hello'
+    assert reader.gets() == b''
+    assert reader.gets() is None
+    assert reader.gets() is None
+    assert reader.gets() == []
+    assert reader.gets() is False
+
+
+def test_error_reply(reader):
+    reader.feed(b'-ERR wrong value\r\n*2\r\n-ERR\r\n:1\r\n')
+    err = reader.gets()
+    assert isinstance(err, ReplyError)
+    assert err.args == ('ERR wrong value',)
+    err, val = reader.gets()
+    assert isinstance(err, ReplyError)
+    assert val == 1
+
+
+def test_multi_bulk(reader):
+    reader.feed(b'*3\r\n$3\r\nfoo\r\n*2\r\n:1\r\n*1\r\n$-1\r\n*0\r\n')
+    assert reader.gets() == [b'foo', [1, [None]], []]
+    assert reader.gets() is False
+
+    depth = 100
+    reader.feed(b'*1\r\n' * depth + b':1\r\n')
+    res = reader.gets()
+    for _ in range(depth):
+        res, = res
+    assert res == 1
+
+
+def test_incremental_feed(reader):
+    data = (b'*3\r\n$3\r\nfoo\r\n*2\r\n:1\r\n+OK\r\n$5\r\nhe\r\no\r\n'
+            b':42\r\n')
+    res = []
+    for i in range(len(data)):
+        reader.feed(data[i:i + 1])
+        obj = reader.gets()
+        while obj is not False:
+            res.append(obj)
+            obj = reader.gets()
+    assert res == [[b'foo', [1, b'OK'], b'he\r\no'], 42]
+
+
+def test_feed_offset(reader):
+    data = bytearray(b'xx$3\r\nfoo\r\n:1\r\n:2')
+    reader.feed(data, 2, 9)
+    assert reader.gets() == b'foo'
+    reader.feed(memoryview(data), 11)
+    assert reader.gets() == 1
+    assert reader.gets() is False
+
+
+def test_protocol_error(reader):
+    reader.feed(b'?invalid\r\n')
+    with pytest.raises(ProtocolError):
+        reader.gets()
+    with pytest.raises(ProtocolError):
+        reader.gets()
+
+    reader = PyReader()
+    reader.feed(b'$abc\r\n')
+    with pytest.raises(ProtocolError):
+        reader.gets()
+
+
+def test_encoding(reader_cls):
+    reader = reader_cls(encoding='utf-8')
+    reader.feed('+OK\r\n$8\r\nзнак\r\n'.encode('utf-8'))
+    assert reader.gets() == 'OK'
+    assert reader.gets() == 'знак'
+
+    reader.feed(b'*2\r\n$1\r\n\xff\r\n:1\r\n:2\r\n')
+    with pytest.raises(UnicodeDecodeError):
+        reader.gets()
+    assert reader.gets() == 2
+
+
+def test_set_encoding(reader):
+    reader.feed(b'$3\r\nfoo\r\n*2\r\n$3\r\nbar\r\n$3\r\nbaz\r\n')
+    reader.set_encoding('utf-8')
+    assert reader.gets() == 'foo'
+    reader.set_encoding(None)
+    assert reader.gets() == [b'bar', b'baz']
+
+    reader.feed(b'$1\r\n\xff\r\n')
+    reader.set_encoding('utf-8', 'replace')
+    assert reader.gets() == '\ufffd'
@@ -0,0 +1,141 @@
+import asyncio
+import pytest
+
+from aioredis import PipelineError, ReplyError, Redis
+
+
+@pytest.mark.run_loop
+def test_pipeline(redis, loop):
+    pipe = redis.pipeline()
+    f1 = pipe.set('key:1', 'value')
+    f2 = pipe.get('key:1')
+    f3 = pipe.incr('key:2')
+    f4 = pipe.hmset('key:3', 'a', 1, 'b', 2)
+    f5 = pipe.hgetall('key:3', encoding='utf-8')
+    # nothing is sent until executed
+    yield from asyncio.sleep(0, loop=loop)
+    assert not f2.done()
+    assert (yield from redis.exists('key:1')) == 0
+
+    res = yield from pipe.execute()
+    assert res == [True, b'value', 1, True, {'a': '1', 'b': '2'}]
+    res2 = yield from asyncio.gather(f1, f2, f3, f4, f5, loop=loop)
+    assert res == res2
+
+
+@pytest.mark.run_loop
+def test_no_tasks(redis, loop):
+    tasks = asyncio.Task.all_tasks(loop=loop)
+    pipe = redis.pipeline()
+    for i in range(100):
+        pipe.set('key:{}'.format(i), i)
+        pipe.get('key:{}'.format(i))
+    assert asyncio.Task.all_tasks(loop=loop) == tasks
+
+    writer = redis.connection._writer
+    writes = []
+    write = writer.write
+    writer.write = lambda data: (writes.append(data), write(data))
+    res = yield from pipe.execute()
+    assert res == [r for i in range(100) for r in (True, str(i).encode())]
+    # all commands are sent with single write
+    assert len(writes) == 1
+    assert writes[0].startswith(b'*3\r\n$3\r\nSET\r\n$5\r\nkey:0\r\n')
+
+
+@pytest.mark.run_loop
+def test_errors(redis, loop):
+    yield from redis.set('key:str', 'value')
+    pipe = redis.pipeline()
+    f1 = pipe.incr('key:str')
+    f2 = pipe.incrby('key:int', 1.5)
+    f3 = pipe.get('key:str')
+    with pytest.raises(PipelineError) as exc_info:
+        yield from pipe.execute()
+    err1, err2 = exc_info.value.args[1]
+    assert isinstance(err1, ReplyError)
+    assert isinstance(err2, TypeError)
+    with pytest.raises(ReplyError):
+        yield from f1
+    with pytest.raises(TypeError):
+        yield from f2
+    assert (yield from f3) == b'value'
+
+    pipe = redis.pipeline()
+    pipe.incr('key:str')
+    pipe.set('key:str', None)
+    pipe.get('key:str')
+    res = yield from pipe.execute(return_exceptions=True)
+    assert isinstance(res[0], ReplyError)
+    assert isinstance(res[1], TypeError)
+    assert res[2] == b'value'
+
+
+@pytest.mark.run_loop
+def test_double_execute(redis):
+    pipe = redis.pipeline()
+    pipe.ping()
+    assert (yield from pipe.execute()) == [b'PONG']
+    with pytest.raises(AssertionError):
+        yield from pipe.execute()
+    with pytest.raises(AssertionError):
+        pipe.ping()
+    with pytest.raises(AssertionError):
+        pipe.echo('foo')
+
+
+@pytest.mark.run_loop
+def test_connection_closed(redis):
+    pipe = redis.pipeline()
+    fut = pipe.ping()
+    redis.close()
+    yield from redis.wait_closed()
+    with pytest.raises(PipelineError):
+        yield from pipe.execute()
+    assert fut.done()
+
+
+@pytest.mark.run_loop
+def test_parallel(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop, minsize=1, maxsize=3)
+    redis = Redis(pool)
+    pipe = redis.pipeline(parallel=4)
+    for i in range(200):
+        pipe.incrby('key:{}'.format(i), i)
+    res = yield from pipe.execute()
+    assert res == list(range(200))
+    # commands are split between maxsize connections
+    assert pool.size == 3
+    assert pool.freesize == 3
+    assert pool.stats.snapshot()['commands_sent'] == 200 + 3   # + SELECT
+    for conn in pool._pool:
+        assert conn.connection.stats.commands_sent > 1
+
+    pipe = redis.pipeline(parallel=2)
+    pipe.incr('key:str')
+    pipe.set('key:str', None)
+    pipe.get('key:0')
+    res = yield from pipe.execute(return_exceptions=True)
+    assert res[0] == 1
+    assert isinstance(res[1], TypeError)
+    assert res[2] == b'0'
+
+    # pool is closed while acquiring connections
+    pipe = redis.pipeline(parallel=2)
+    pipe.ping()
+    pipe.ping()
+    pool.close()
+    with pytest.raises(PipelineError):
+        yield from pipe.execute()
+    yield from pool.wait_closed()
+
+
+@pytest.mark.run_loop
+def test_parallel_no_pool(redis):
+    pipe = redis.pipeline(parallel=4)
+    pipe.set('key', 'value')
+    pipe.get('key')
+    assert (yield from pipe.execute()) == [True, b'value']
+    with pytest.raises(AssertionError):
+        redis.pipeline(parallel=0)
@@ -2,11 +2,14 @@ import asyncio
 import pytest
 
 from aioredis import (
+    Redis,
     RedisPool,
     ReplyError,
     PoolClosedError,
+    PoolExhaustedError,
     ConnectionClosedError,
     )
+from aioredis.util import async_task
 
 
 def _assert_defaults(pool):
@@ -258,6 +261,25 @@ def test_select_and_create(create_pool, loop, server):
     yield from asyncio.wait_for(test(), 3, loop=loop)
 
 
+@pytest.mark.run_loop
+def test_select_and_acquire(create_pool, loop, server):
+    pool = yield from create_pool(
+        server.tcp_address,
+        minsize=5, maxsize=5, loop=loop)
+    select = async_task(pool.select(1), loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+    # connections are acquired while select() is in progress
+    conns = yield from asyncio.gather(
+        pool.acquire(), pool.acquire(), pool.acquire(), loop=loop)
+    yield from select
+    assert [conn.db for conn in conns] == [1, 1, 1]
+    for conn in conns:
+        pool.release(conn)
+    assert pool.size == 5
+    assert pool.freesize == 5
+    assert [conn.db for conn in pool._pool] == [1] * 5
+
+
 @pytest.mark.run_loop
 def test_response_decoding(create_pool, loop, server):
     pool = yield from create_pool(
@@ -352,6 +374,26 @@ def test_pool_with_closed_connections(create_pool, server, loop):
         assert conn1 is not conn2
 
 
+@pytest.mark.run_loop
+def test_pool_command_timeout(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1, command_timeout=.1)
+
+    with (yield from pool) as redis:
+        conn1 = redis.connection
+        with pytest.raises(asyncio.TimeoutError):
+            yield from redis.connection.execute('debug', 'sleep', .3)
+    assert conn1.closed
+    assert pool.size == 0
+    # server is still sleeping
+    yield from asyncio.sleep(.3, loop=loop)
+
+    with (yield from pool) as redis:
+        assert redis.connection is not conn1
+        assert (yield from redis.ping()) == b'PONG'
+
+
 @pytest.mark.run_loop
 def test_pool_close(create_pool, server, loop):
     pool = yield from create_pool(
@@ -409,3 +451,696 @@ def test_pool_check_closed_when_exception(create_pool, create_redis,
         connect_msg,
         "DEBUG:aioredis:Closed 1 connections"
         ]
+
+
+@pytest.mark.run_loop
+def test_acquire_fifo(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1)
+
+    conn = yield from pool.acquire()
+    order = []
+
+    @asyncio.coroutine
+    def waiter(i):
+        conn = yield from pool.acquire()
+        order.append(i)
+        pool.release(conn)
+
+    tasks = [async_task(waiter(i), loop=loop) for i in range(5)]
+    yield from asyncio.sleep(0, loop=loop)
+    assert len(pool._waiters) == 5
+    pool.release(conn)
+    # connection is handed over directly, not returned to free pool
+    assert pool.freesize == 0
+    yield from asyncio.gather(*tasks, loop=loop)
+    assert order == [0, 1, 2, 3, 4]
+    assert pool.freesize == 1
+    assert pool.size == 1
+
+
+@pytest.mark.run_loop
+def test_acquire_cancelled(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1)
+
+    conn = yield from pool.acquire()
+    task1 = async_task(pool.acquire(), loop=loop)
+    task2 = async_task(pool.acquire(), loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+    task1.cancel()
+    pool.release(conn)
+    # connection is handed over to task2 skipping cancelled one
+    conn2 = yield from task2
+    assert conn2 is conn
+    assert task1.cancelled()
+
+    # connection handed over to cancelled task is returned
+    task3 = async_task(pool.acquire(), loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+    pool.release(conn2)
+    task3.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        yield from task3
+    assert pool.freesize == 1
+    assert pool.size == 1
+
+
+@pytest.mark.run_loop
+def test_acquire_after_drop(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1)
+
+    conn = yield from pool.acquire()
+    task = async_task(pool.acquire(), loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+    conn.close()
+    pool.release(conn)
+    # waiter creates new connection
+    conn2 = yield from task
+    assert conn2 is not conn
+    assert not conn2.closed
+    pool.release(conn2)
+    assert pool.size == 1
+
+
+@pytest.mark.run_loop
+def test_pool_close__waiters(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1)
+
+    with (yield from pool):
+        task = async_task(pool.acquire(), loop=loop)
+        yield from asyncio.sleep(0, loop=loop)
+        pool.close()
+        with pytest.raises(PoolClosedError):
+            yield from task
+    yield from pool.wait_closed()
+
+
+@pytest.mark.run_loop
+def test_multiplexed(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=4, maxsize=4, multiplexed=True)
+    assert pool.multiplexed
+
+    yield from pool.execute('del', 'key:multiplexed')
+    futs = [pool.execute('incr', 'key:multiplexed') for _ in range(100)]
+    # commands are spread over free connections
+    assert [len(conn.connection._waiters) for conn in pool._pool] == [25] * 4
+    assert pool.freesize == 4
+    res = yield from asyncio.gather(*futs, loop=loop)
+    # commands on different connections are not ordered
+    assert sorted(res) == list(range(1, 101))
+    assert pool.size == 4
+
+    res = yield from pool.execute('get', 'key:multiplexed')
+    assert res == b'100'
+
+    with pytest.raises(ValueError):
+        pool.execute('multi')
+    with pytest.raises(ValueError):
+        pool.execute(b'subscribe', 'chan')
+    with pytest.raises(TypeError):
+        pool.execute(None)
+
+
+@pytest.mark.run_loop
+def test_multiplexed_blocking(create_pool, create_redis, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=2, maxsize=2, multiplexed=True)
+    other = yield from create_redis(server.tcp_address, loop=loop)
+
+    yield from pool.execute('del', 'key:blocking')
+    fut = pool.execute('blpop', 'key:blocking', 0)
+    yield from asyncio.sleep(.01, loop=loop)
+    # connection is acquired for blocking command
+    assert pool.freesize == 1
+    assert (yield from pool.execute('ping')) == b'PONG'
+    yield from other.rpush('key:blocking', 'value')
+    res = yield from fut
+    assert res == [b'key:blocking', b'value']
+    assert pool.freesize == 2
+
+    # free connections are exhausted
+    conn1 = yield from pool.acquire()
+    conn2 = yield from pool.acquire()
+    fut = pool.execute('ping')
+    yield from asyncio.sleep(.01, loop=loop)
+    assert not fut.done()
+    pool.release(conn1)
+    assert (yield from fut) == b'PONG'
+    pool.release(conn2)
+    other.close()
+    yield from other.wait_closed()
+
+
+@pytest.mark.run_loop
+def test_multiplexed_redis(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=2, maxsize=2, multiplexed=True)
+    redis = Redis(pool)
+
+    yield from redis.set('key:multiplexed', 'value')
+    assert (yield from redis.get('key:multiplexed')) == b'value'
+
+    tr = redis.multi_exec()
+    fut1 = tr.incr('key:multiplexed:counter')
+    fut2 = tr.incr('key:multiplexed:counter')
+    other = redis.incr('key:multiplexed:counter')
+    res = yield from tr.execute()
+    assert res == [(yield from fut1), (yield from fut2)]
+    assert res[1] - res[0] == 1
+    yield from other
+    assert pool.freesize == 2
+
+
+@pytest.mark.run_loop
+def test_pool_execute(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1)
+    assert not pool.multiplexed
+
+    with (yield from pool):
+        fut = pool.execute('ping')
+        yield from asyncio.sleep(.01, loop=loop)
+        assert not fut.done()
+    assert (yield from fut) == b'PONG'
+    assert pool.freesize == 1
+
+
+@pytest.mark.run_loop
+def test_idle_timeout(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=5, idle_timeout=.2)
+
+    conns = []
+    for _ in range(5):
+        conns.append((yield from pool.acquire()))
+    for conn in conns:
+        pool.release(conn)
+    assert pool.freesize == 5
+
+    # most recently released connection is kept in use
+    for _ in range(5):
+        yield from asyncio.sleep(.1, loop=loop)
+        with (yield from pool) as redis:
+            assert redis is conns[-1]
+    assert pool.size == 1
+    assert pool.reaped_count == 4
+    assert pool.recycled_count == 0
+    assert all(conn.closed for conn in conns[:-1])
+    assert not conns[-1].closed
+
+
+@pytest.mark.run_loop
+def test_idle_timeout_minsize(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=2, maxsize=5, idle_timeout=.1)
+
+    yield from asyncio.sleep(.3, loop=loop)
+    assert pool.size == 2
+    assert pool.reaped_count == 0
+
+
+@pytest.mark.run_loop
+def test_max_lifetime(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=3, maxsize=3, max_lifetime=10)
+    conns = list(pool._pool)
+    for conn in conns:
+        pool._created_at[conn] -= 10
+
+    yield from pool._reap()
+    assert pool.recycled_count == 1
+    assert pool.size == 3
+    assert sum(conn.closed for conn in conns) == 1
+
+    # connections are recycled one at a time
+    yield from pool._reap()
+    assert pool.recycled_count == 1
+
+    pool._next_recycle = 0
+    yield from pool._reap()
+    pool._next_recycle = 0
+    yield from pool._reap()
+    assert pool.recycled_count == 3
+    assert pool.size == 3
+    assert all(conn.closed for conn in conns)
+    assert pool.reaped_count == 0
+
+
+@pytest.mark.run_loop
+def test_max_lifetime_release(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1, max_lifetime=10)
+
+    with (yield from pool) as redis:
+        pool._created_at[redis] -= 10
+    assert redis.closed
+    assert pool.recycled_count == 1
+    assert pool.size == 0
+
+    with (yield from pool) as redis:
+        assert not redis.closed
+    assert pool.freesize == 1
+
+
+@pytest.mark.run_loop
+def test_fill_free_concurrent(server, loop):
+    pool = RedisPool(server.tcp_address, minsize=10, maxsize=10,
+                     commands_factory=Redis, connect_concurrency=3,
+                     loop=loop)
+    create = pool._create_new_connection
+    active = []
+    max_active = 0
+    calls = 0
+
+    @asyncio.coroutine
+    def create_new_connection():
+        nonlocal max_active, calls
+        calls += 1
+        active.append(None)
+        max_active = max(max_active, len(active))
+        try:
+            if calls == 3:
+                raise ConnectionRefusedError()
+            return (yield from create())
+        finally:
+            active.pop()
+
+    pool._create_new_connection = create_new_connection
+    with pytest.raises(ConnectionRefusedError):
+        yield from pool._fill_free()
+    assert max_active == 3
+    assert pool._acquiring == 0
+    assert pool.size == 9
+    assert pool.freesize == 9
+
+    yield from pool._fill_free()
+    assert pool.freesize == 10
+    pool.close()
+    yield from pool.wait_closed()
+
+
+@pytest.mark.run_loop
+def test_fill_free_error_wakeup(server, loop):
+    pool = RedisPool(server.tcp_address, minsize=1, maxsize=1,
+                     commands_factory=Redis, loop=loop)
+    create = pool._create_new_connection
+    calls = 0
+
+    @asyncio.coroutine
+    def create_new_connection():
+        nonlocal calls
+        calls += 1
+        yield from asyncio.sleep(.01, loop=loop)
+        if calls == 1:
+            raise ConnectionRefusedError()
+        return (yield from create())
+
+    pool._create_new_connection = create_new_connection
+    fill = async_task(pool._fill_free(), loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+    # slot being filled is counted in pool size
+    acquire = async_task(pool.acquire(), loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+    assert pool.waiters_count == 1
+    with pytest.raises(ConnectionRefusedError):
+        yield from fill
+    # waiter gets the slot of failed connection
+    conn = yield from asyncio.wait_for(acquire, 1, loop=loop)
+    assert calls == 2
+    pool.release(conn)
+    assert pool.size == pool.freesize == 1
+    pool.close()
+    yield from pool.wait_closed()
+
+
+@pytest.mark.run_loop
+def test_prewarm(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=5, maxsize=5, prewarm=True)
+    assert pool.freesize == 5
+    assert not any(conn.closed for conn in pool._pool)
+
+
+@pytest.mark.run_loop
+def test_acquire_timeout(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1)
+
+    with (yield from pool):
+        with pytest.raises(asyncio.TimeoutError):
+            yield from pool.acquire(timeout=.1)
+        assert pool.waiters_count == 0
+    conn = yield from pool.acquire(timeout=.1)
+    pool.release(conn)
+    assert pool.freesize == 1
+
+
+@pytest.mark.run_loop
+def test_max_waiters(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1, max_waiters=1)
+
+    assert pool.waiters_count == 0
+    assert pool.wait_time == 0
+    conn = yield from pool.acquire()
+    task = async_task(pool.acquire(), loop=loop)
+    yield from asyncio.sleep(.05, loop=loop)
+    assert pool.waiters_count == 1
+    assert pool.wait_time >= .05
+    with pytest.raises(PoolExhaustedError):
+        yield from pool.acquire()
+
+    pool.release(conn)
+    conn = yield from task
+    assert pool.waiters_count == 0
+    assert pool.wait_time == 0
+    pool.release(conn)
+
+
+@pytest.mark.run_loop
+def test_acquire_fifo_new_connection(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1)
+
+    conn = yield from pool.acquire()
+    order = []
+
+    @asyncio.coroutine
+    def waiter(i):
+        conn = yield from pool.acquire()
+        order.append(i)
+        yield from asyncio.sleep(.01, loop=loop)
+        pool.release(conn)
+
+    task1 = async_task(waiter(1), loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+    conn.close()
+    pool.release(conn)
+    # free slot is reserved for first waiter
+    assert pool.size == 1
+    task2 = async_task(waiter(2), loop=loop)
+    yield from asyncio.gather(task1, task2, loop=loop)
+    assert order == [1, 2]
+    assert pool.size == 1
+
+
+@pytest.mark.run_loop
+def test_health_check(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1, health_check_interval=.1)
+    healthy = pool._pool[0]
+
+    yield from asyncio.sleep(.3, loop=loop)
+    assert pool.evicted_count == 0
+    with (yield from pool) as redis:
+        assert redis is healthy
+        # simulate silently dropped connection: server won't reply anymore
+        redis.connection.execute('client', 'reply', 'off')
+
+    yield from asyncio.sleep(.45, loop=loop)
+    assert pool.evicted_count == 1
+    assert healthy.closed
+    assert pool.size == 0
+
+    with (yield from pool) as redis:
+        assert redis is not healthy
+
+
+@pytest.mark.run_loop
+def test_health_check_select(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=2, maxsize=2, health_check_interval=100)
+    for conn in pool._pool:
+        pool._idle_since[conn] -= 100
+    check = async_task(pool._health_check(), loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+    assert pool.freesize == 0
+    # connections being checked are missed by select()
+    yield from pool.select(1)
+    yield from check
+    assert pool.db == 1
+    assert all(conn.db == 1 for conn in pool._pool)
+
+    with (yield from pool) as redis:
+        assert redis.db == 1
+
+
+@pytest.mark.run_loop
+def test_adaptive_size(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=3, adaptive_interval=100)
+    stats = pool.sizing_stats()
+    assert stats == {'size_limit': 1, 'grow_count': 0, 'shrink_count': 0,
+                     'last': None}
+
+    conn1 = yield from pool.acquire()
+    task = async_task(pool.acquire(), loop=loop)
+    yield from asyncio.sleep(.01, loop=loop)
+    assert not task.done()
+
+    # waiting caller makes pool grow
+    yield from pool._adapt()
+    conn2 = yield from task
+    assert conn2 is not conn1
+    stats = pool.sizing_stats()
+    assert stats['size_limit'] == 2
+    assert stats['grow_count'] == 1
+    assert stats['last']['wait_count'] == 1
+    assert stats['last']['previous_size_limit'] == 1
+    assert pool.size == 2
+
+    # high utilization makes pool grow
+    yield from asyncio.sleep(.01, loop=loop)
+    yield from pool._adapt()
+    yield from asyncio.sleep(.01, loop=loop)
+    yield from pool._adapt()
+    stats = pool.sizing_stats()
+    assert stats['size_limit'] == 3
+    assert stats['last']['wait_count'] == 0
+    assert stats['last']['utilization'] > .6
+    assert pool.size == 3
+
+    pool.release(conn1)
+    pool.release(conn2)
+    yield from pool._adapt()
+    assert pool.sizing_stats()['last']['hold_time_avg'] > 0
+
+    # pool shrinks gradually after low utilization intervals
+    for _ in range(2):
+        yield from pool._adapt()
+        assert pool.sizing_stats()['size_limit'] == 3
+    yield from pool._adapt()
+    stats = pool.sizing_stats()
+    assert stats['size_limit'] == 2
+    assert stats['shrink_count'] == 1
+    assert stats['last']['utilization'] == 0
+    assert pool.size == 2
+    assert pool.freesize == 2
+
+    for _ in range(3):
+        yield from pool._adapt()
+    assert pool.sizing_stats()['size_limit'] == 1
+    assert pool.size == 1
+
+    # connections are closed on release when pool is over the limit
+    pool._size_limit = 2
+    conn1 = yield from pool.acquire()
+    conn2 = yield from pool.acquire()
+    pool._size_limit = 1
+    pool.release(conn1)
+    pool.release(conn2)
+    assert conn1.closed
+    assert not conn2.closed
+    assert pool.size == 1
+
+
+@pytest.mark.run_loop
+def test_adaptive_size_background(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=2, adaptive_interval=.05)
+
+    with (yield from pool):
+        conn = yield from pool.acquire(timeout=1)
+        pool.release(conn)
+    assert pool.sizing_stats()['grow_count'] == 1
+    assert pool.size == 2
+
+
+@pytest.mark.run_loop
+def test_pool_stats(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop, minsize=1, maxsize=1)
+    stats = pool.stats.snapshot()
+    assert stats['connections'] == 1
+    assert stats['size'] == 1
+    assert stats['acquire_wait_seconds']['count'] == 0
+
+    redis = yield from pool.acquire()
+    yield from redis.set('key:stats', 'value')
+    conn = redis.connection
+    task = async_task(pool.acquire(), loop=loop)
+    yield from asyncio.sleep(.01, loop=loop)
+    assert pool.stats.snapshot()['waiters'] == 1
+    pool.release(redis)
+    redis = yield from task
+    yield from redis.get('key:stats')
+    pool.release(redis)
+
+    stats = pool.stats.snapshot()
+    # SELECT is sent by create_connection
+    assert stats['commands_sent'] == 3
+    assert stats['replies_parsed'] == 3
+    assert stats['bytes_read'] == conn.stats.bytes_read
+    hist = stats['acquire_wait_seconds']
+    assert hist['count'] == 2
+    assert hist['sum'] >= .01
+    assert hist['buckets'][-1] == (float('inf'), 2)
+    # first acquire didn't wait
+    assert dict(hist['buckets'])[.005] == 1
+
+    # counters of lost connection are kept
+    conn.close()
+    yield from conn.wait_closed()
+    with (yield from pool) as redis:
+        yield from redis.get('key:stats')
+    assert redis.connection is not conn
+    stats = pool.stats.snapshot()
+    assert stats['connections'] == 1
+    assert stats['connections_lost'] == 1
+    assert stats['reconnects'] == 1
+    assert stats['commands_sent'] == 5
+
+
+@pytest.mark.run_loop
+def test_replenish_minsize(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop, minsize=5, maxsize=10)
+    assert pool.size == pool.freesize == 5
+    for conn in pool._pool:
+        conn.close()
+    with (yield from pool):
+        pass
+    yield from asyncio.sleep(.05, loop=loop)
+    assert pool.size == pool.freesize == 5
+
+    # connection lost while used
+    with (yield from pool) as redis:
+        redis.close()
+    assert pool.size == 4
+    yield from asyncio.sleep(.05, loop=loop)
+    assert pool.size == pool.freesize == 5
+    assert pool._fill_task is None
+
+
+@pytest.mark.run_loop
+def test_pool_stats_reconnects(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop, minsize=1, maxsize=1)
+    stats = pool.stats
+
+    # free connection found closed is replaced by acquire()
+    pool._pool[0].close()
+    redis = yield from pool.acquire()
+    assert (stats.connections_lost, stats.reconnects) == (1, 1)
+
+    # waiter replaces connection lost while used
+    task = async_task(pool.acquire(), loop=loop)
+    yield from asyncio.sleep(.01, loop=loop)
+    redis.close()
+    pool.release(redis)
+    redis = yield from task
+    assert (stats.connections_lost, stats.reconnects) == (2, 2)
+
+    # lost connection is re-opened in background to keep minsize
+    redis.close()
+    pool.release(redis)
+    assert pool.size == 0
+    yield from pool._fill_task
+    assert pool.freesize == 1
+    assert (stats.connections_lost, stats.reconnects) == (3, 3)
+    # connections opened after clear() are not reconnects
+    yield from pool.clear()
+    with (yield from pool):
+        pass
+    assert (stats.connections_lost, stats.reconnects) == (3, 3)
+
+    # minsize connections are re-opened
+    pool._pool[0].close()
+    yield from pool._fill_free()
+    assert pool.freesize == 1
+    assert (stats.connections_lost, stats.reconnects) == (4, 4)
+
+
+@pytest.mark.run_loop
+def test_blocking_pool(create_pool, create_redis, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop,
+        minsize=1, maxsize=1, blocking_pool_size=1)
+    other = yield from create_redis(server.tcp_address, loop=loop)
+    redis = Redis(pool)
+    blocking = pool.blocking_pool
+    assert blocking.size == 0
+    assert blocking.maxsize == 1
+
+    yield from redis.delete('key:blocking')
+    fut1 = async_task(redis.blpop('key:blocking'), loop=loop)
+    fut2 = async_task(redis.brpop('key:blocking'), loop=loop)
+    yield from asyncio.sleep(.01, loop=loop)
+    # blocking commands do not take regular connections
+    assert blocking.size == 1
+    assert blocking.waiters_count == 1
+    assert pool.freesize == 1
+    assert (yield from redis.ping()) == b'PONG'
+
+    yield from other.rpush('key:blocking', 'a', 'b')
+    assert (yield from fut1) == [b'key:blocking', b'a']
+    assert (yield from fut2) == [b'key:blocking', b'b']
+    assert blocking.freesize == 1
+
+    yield from pool.select(1)
+    assert blocking.db == 1
+    pool.close()
+    yield from pool.wait_closed()
+    assert blocking.closed
+    assert blocking.size == 0
+    other.close()
+    yield from other.wait_closed()
+
+
+@pytest.mark.run_loop
+def test_blocking_pool_command_timeout(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop, minsize=1, maxsize=1,
+        blocking_pool_size=1, command_timeout=.2)
+    redis = Redis(pool)
+    yield from redis.delete('key:blocking')
+
+    # server-side timeout is longer than command_timeout
+    assert (yield from redis.blpop('key:blocking', timeout=1)) is None
+    conn, = pool.blocking_pool._pool
+    assert not conn.closed
+    assert pool.blocking_pool.stats.snapshot()['errors'] == {}
@@ -1,6 +1,8 @@
 import asyncio
 import pytest
 
+from aioredis import ConnectionClosedError
+from aioredis.pubsub import Channel
 from aioredis.util import create_future
 
 
@@ -272,3 +274,96 @@ def test_subscribe_concurrency(create_redis, server, loop):
     assert ch1.name == b'channel:0'
     assert subs == 1
     assert ch2.name == b'channel:1'
+
+
+def test_channel_overflow(loop):
+    ch = Channel('chan:1', is_pattern=False, loop=loop,
+                 maxsize=2, overflow='drop_oldest')
+    assert (ch.maxsize, ch.overflow, ch.dropped) == (2, 'drop_oldest', 0)
+    for i in range(5):
+        assert ch.put_nowait(i) is None
+    assert ch.dropped == 3
+    assert loop.run_until_complete(ch.get()) == 3
+    assert loop.run_until_complete(ch.get()) == 4
+
+    ch = Channel('chan:1', is_pattern=False, loop=loop,
+                 maxsize=2, overflow='drop_newest')
+    for i in range(5):
+        assert ch.put_nowait(i) is None
+    assert ch.dropped == 3
+    assert loop.run_until_complete(ch.get()) == 0
+    ch.close()
+    # end of stream marker is never dropped
+    assert loop.run_until_complete(ch.get()) == 1
+    assert loop.run_until_complete(ch.get()) is None
+
+    ch = Channel('chan:1', is_pattern=False, loop=loop,
+                 maxsize=2, overflow='disconnect')
+    assert ch.put_nowait(0) is None
+    assert ch.put_nowait(1) is None
+    fut = ch.put_nowait(2)
+    assert fut.done()
+    assert isinstance(fut.exception(), ConnectionClosedError)
+    assert ch.dropped == 1
+
+    ch = Channel('chan:1', is_pattern=False, loop=loop,
+                 maxsize=2, overflow='block_reader')
+    assert ch.put_nowait(0) is None
+    fut = ch.put_nowait(1)
+    assert not fut.done()
+    # messages already read are kept
+    assert ch.put_nowait(2) is fut
+    assert loop.run_until_complete(ch.get()) == 0
+    assert not fut.done()
+    assert loop.run_until_complete(ch.get()) == 1
+    assert fut.done()
+    assert ch.dropped == 0
+
+    fut = ch.put_nowait(3)
+    ch.close()
+    assert fut.done()
+
+    with pytest.raises(AssertionError):
+        Channel('chan:1', is_pattern=False, loop=loop, overflow='drop')
+    with pytest.raises(AssertionError):
+        Channel('chan:1', is_pattern=False, loop=loop, maxsize=-1)
+
+
+@pytest.mark.run_loop
+def test_block_reader(create_connection, redis, server, loop):
+    sub = yield from create_connection(server.tcp_address, loop=loop)
+    ch = Channel('chan:block', is_pattern=False, loop=loop,
+                 maxsize=10, overflow='block_reader')
+    yield from sub.execute_pubsub('subscribe', ch)
+
+    for i in range(10000):
+        redis.publish('chan:block', i)
+    yield from redis.ping()
+    yield from asyncio.sleep(.05, loop=loop)
+    # connection stopped reading
+    assert sub._read_paused is not None
+    assert ch._queue.qsize() < 10000
+
+    for i in range(10000):
+        assert (yield from ch.get()) == str(i).encode()
+    assert ch.dropped == 0
+    yield from asyncio.sleep(0, loop=loop)
+    assert sub._read_paused is None
+    sub.close()
+
+
+@pytest.mark.run_loop
+def test_overflow_disconnect(create_connection, redis, server, loop):
+    sub = yield from create_connection(server.tcp_address, loop=loop)
+    ch = Channel('chan:slow', is_pattern=False, loop=loop,
+                 maxsize=2, overflow='disconnect')
+    yield from sub.execute_pubsub('subscribe', ch)
+
+    for i in range(5):
+        yield from redis.publish('chan:slow', i)
+    yield from sub.wait_closed()
+    assert ch.dropped >= 1
+    assert sub.stats.errors == {'ConnectionClosedError': 1}
+    assert (yield from ch.get()) == b'0'
+    assert (yield from ch.get()) == b'1'
+    assert (yield from ch.get()) is None
@@ -264,3 +264,33 @@ def test_decode_message_for_pattern(loop):
     assert isinstance(res[0], _Sender)
     assert res[1] == b'channel'
     assert res[2] == {'hello': 'world'}
+
+
+@pytest.mark.run_loop
+def test_listener_overflow(create_connection, server, loop):
+    sub = yield from create_connection(server.tcp_address, loop=loop)
+    pub = yield from create_connection(server.tcp_address, loop=loop)
+
+    mpsc = Listener(loop=loop, maxsize=3, overflow='drop_newest')
+    yield from sub.execute_pubsub('subscribe',
+                                  mpsc.channel('channel:1'),
+                                  mpsc.channel('channel:2'))
+    for i in range(5):
+        yield from pub.execute('publish', 'channel:1', i)
+        yield from pub.execute('publish', 'channel:2', i)
+    while mpsc.dropped < 7:
+        yield from asyncio.sleep(.01, loop=loop)
+    assert mpsc.dropped == 7
+    res = []
+    for _ in range(3):
+        ch, msg = yield from mpsc.get()
+        res.append((ch.name, msg))
+    assert res == [(b'channel:1', b'0'), (b'channel:2', b'0'),
+                   (b'channel:1', b'1')]
+
+    mpsc = Listener(loop=loop, maxsize=1, overflow='block_reader')
+    ch = mpsc.channel('channel:1')
+    assert ch.put_nowait(b'1') is not None
+    mpsc.stop()
+    assert ch.put_nowait(b'2') is None
+    assert (yield from mpsc.get()) == (ch, b'1')
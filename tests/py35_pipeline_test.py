@@ -0,0 +1,102 @@
+import gc
+import pytest
+
+from aioredis import ReplyError
+
+
+class _AsyncCommands:
+
+    def __init__(self, commands):
+        self._commands = iter(commands)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._commands)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+@pytest.mark.run_loop
+async def test_bulk(redis):
+    sent = []
+
+    def commands():
+        for i in range(1000):
+            sent.append(i)
+            yield ('HSET', 'key:bulk', 'field:{}'.format(i), i)
+
+    res = []
+    bulk = redis.bulk(commands(), chunk_size=30, window=100)
+    async for r in bulk:
+        # not more than window commands are sent ahead
+        assert len(sent) - len(res) <= 100
+        assert len(bulk._pending) <= 100
+        res.append(r)
+    assert res == [1] * 1000
+    assert await redis.hlen('key:bulk') == 1000
+
+    res = [r async for r in redis.bulk(
+           [('HGET', 'key:bulk', 'field:{}'.format(i)) for i in range(5)],
+           encoding='utf-8')]
+    assert res == ['0', '1', '2', '3', '4']
+    assert [r async for r in redis.bulk([])] == []
+
+
+@pytest.mark.run_loop
+async def test_bulk_async_iterable(redis):
+    commands = _AsyncCommands(
+        ('INCR', 'key:bulk:counter') for _ in range(25))
+    res = [r async for r in redis.bulk(commands, chunk_size=10, window=10)]
+    assert res == list(range(1, 26))
+
+
+@pytest.mark.run_loop
+async def test_bulk_errors(redis):
+    commands = [
+        ('SET', 'key:bulk:str', 'value'),
+        ('INCR', 'key:bulk:str'),
+        ('SET', 'key:bulk:str', None),
+        (),
+        ('GET', 'key:bulk:str'),
+        ]
+    res = [r async for r in redis.bulk(commands, return_exceptions=True)]
+    assert res[0] == b'OK'
+    assert isinstance(res[1], ReplyError)
+    assert isinstance(res[2], TypeError)
+    assert isinstance(res[3], TypeError)
+    assert res[4] == b'value'
+
+    res = []
+    with pytest.raises(ReplyError):
+        async for r in redis.bulk(commands):
+            res.append(r)
+    assert res == [b'OK']
+
+    with pytest.raises(AssertionError):
+        redis.bulk(commands, chunk_size=10, window=5)
+
+
+@pytest.mark.run_loop
+async def test_bulk_error_pending(redis, loop):
+    errors = []
+    loop.set_exception_handler(lambda loop, ctx: errors.append(ctx))
+    commands = ([('SET', 'key:bulk:str', 'value')] +
+                [('INCR', 'key:bulk:str')] * 5 +
+                [('GET', 'key:bulk:str')])
+    bulk = redis.bulk(commands)
+    try:
+        with pytest.raises(ReplyError):
+            async for r in bulk:
+                pass
+        assert not bulk._pending
+        assert [r async for r in bulk] == []
+        assert await redis.get('key:bulk:str') == b'value'
+        del bulk
+        gc.collect()
+        # errors of replies left in flight are not reported
+        assert errors == []
+    finally:
+        loop.set_exception_handler(None)
@@ -18,6 +18,12 @@ def test_recon(server, loop):
     resp = yield from redis.echo('ECHO')
     assert resp == b'ECHO'
     assert conn_id != id(redis._conn._conn)
+    stats = redis.connection.stats.snapshot()
+    assert stats['reconnects'] == 1
+    assert stats['connections'] == 1
+    # SELECT and ECHO on both connections
+    assert stats['commands_sent'] == 4
+    assert stats['errors'] == {'ValueError': 1}
     # FIXME: bad interface
     conn = yield from redis.connection.get_atomic_connection()
     conn.close()
@@ -1,7 +1,8 @@
 import asyncio
+import gc
 import pytest
 
-from aioredis import ReplyError, MultiExecError, WatchVariableError
+from aioredis import ReplyError, MultiExecError, WatchVariableError, Redis
 
 
 @pytest.mark.run_loop
@@ -153,6 +154,74 @@ def test_error_in_connection(redis):
     yield from fut2
 
 
+@pytest.mark.run_loop
+def test_single_write(redis, loop):
+    conn = redis.connection
+    writer = conn._writer
+    writes = []
+    write = writer.write
+    writer.write = lambda data: (writes.append(data), write(data))
+    tr = redis.multi_exec()
+    futs = [tr.incr('foo') for _ in range(10)]
+    sent = conn.stats.commands_sent
+    task = asyncio.ensure_future(tr.execute(), loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+    # MULTI and QUEUED replies have no futures
+    assert [type(w).__name__ for w, *spam in conn._waiters] == (
+        ['_QueuedReplies'] * 11 + ['Future'])
+    assert (yield from task) == list(range(1, 11))
+    assert (yield from asyncio.gather(*futs, loop=loop)) == list(range(1, 11))
+    assert conn.stats.commands_sent == sent + 12
+    assert len(writes) == 1
+    assert writes[0].startswith(b'*1\r\n$5\r\nMULTI\r\n*2\r\n')
+    assert writes[0].endswith(b'*1\r\n$4\r\nEXEC\r\n')
+
+
+@pytest.mark.run_loop
+def test_queued_error(redis):
+    tr = redis.multi_exec()
+    fut1 = tr.incr('foo')
+    fut2 = tr.connection.execute('INCRBY', 'foo')
+    fut3 = tr.incr('foo')
+    with pytest.raises(MultiExecError):
+        yield from tr.execute()
+    # error replied instead of QUEUED is set to its command
+    with pytest.raises(ReplyError) as exc_info:
+        yield from fut2
+    assert 'wrong number of arguments' in str(exc_info.value)
+    with pytest.raises(ReplyError) as exc_info:
+        yield from fut1
+    assert 'EXECABORT' in str(exc_info.value)
+    with pytest.raises(ReplyError):
+        yield from fut3
+    assert not redis.in_transaction
+    assert (yield from redis.get('foo')) is None
+
+
+@pytest.mark.run_loop
+def test_execute_cancelled(redis, loop):
+    tr = redis.multi_exec()
+    fut1 = tr.incr('foo')
+    fut2 = tr.incr('foo')
+    task = asyncio.ensure_future(tr.execute(), loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        yield from task
+    # transaction is executed anyway
+    assert (yield from fut1) == 1
+    assert (yield from fut2) == 2
+
+    tr = redis.multi_exec()
+    fut = tr.incr('foo')
+    task = asyncio.ensure_future(tr.execute(), loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+    redis.close()
+    yield from redis.wait_closed()
+    assert fut.cancelled()
+    assert task.cancelled() or isinstance(task.exception(), MultiExecError)
+
+
 @pytest.mark.run_loop
 def test_watch_unwatch(redis):
     res = yield from redis.watch('key')
@@ -233,9 +302,140 @@ def test_transaction__watch_error(redis, create_redis, server, loop):
     tr = redis.multi_exec()
     fut1 = tr.set('foo', 'foo')
     fut2 = tr.get('bar')
-    with pytest.raises(MultiExecError):
+    with pytest.raises(WatchVariableError):
         yield from tr.execute()
     with pytest.raises(WatchVariableError):
         yield from fut1
     with pytest.raises(WatchVariableError):
         yield from fut2
+
+
+@pytest.mark.run_loop
+def test_transaction_helper(redis, create_redis, server, loop):
+    other = yield from create_redis(
+        server.tcp_address, loop=loop)
+    yield from redis.set('foo', 1)
+    calls = []
+
+    @asyncio.coroutine
+    def incr(client, tr):
+        value = yield from client.get('foo')
+        calls.append(value)
+        if len(calls) == 1:
+            # concurrent change makes transaction re-try
+            yield from other.incr('foo')
+        tr.set('foo', int(value) + 1)
+
+    res = yield from redis.transaction(incr, 'foo', backoff=0)
+    assert res == [True]
+    assert calls == [b'1', b'2']
+    assert (yield from redis.get('foo')) == b'3'
+    assert redis.connection.stats.watch_retries == 1
+
+    # nothing buffered
+    res = yield from redis.transaction(lambda client, tr: None, 'foo')
+    assert res == []
+    assert not redis.in_transaction
+
+
+@pytest.mark.run_loop
+def test_transaction_helper_errors(redis, create_redis, server, loop):
+    other = yield from create_redis(
+        server.tcp_address, loop=loop)
+    calls = []
+
+    @asyncio.coroutine
+    def conflict(client, tr):
+        calls.append(1)
+        yield from other.incr('foo')
+        tr.incr('foo')
+
+    with pytest.raises(WatchVariableError):
+        yield from redis.transaction(conflict, 'foo',
+                                     max_retries=2, backoff=0)
+    assert len(calls) == 3
+    assert redis.connection.stats.watch_retries == 2
+
+    def fail(client, tr):
+        raise ValueError("fail")
+
+    with pytest.raises(ValueError):
+        yield from redis.transaction(fail, 'foo')
+    # keys are un-watched
+    yield from other.incr('foo')
+    tr = redis.multi_exec()
+    tr.incr('foo')
+    assert (yield from tr.execute()) == [5]
+
+    with pytest.raises(AssertionError):
+        yield from redis.transaction(fail, 'foo', max_retries=-1)
+
+
+@pytest.mark.run_loop
+def test_transaction_helper_concurrent(redis, loop):
+    yield from redis.delete('cnt')
+
+    @asyncio.coroutine
+    def incr(client, tr):
+        value = yield from client.get('cnt')
+        yield from asyncio.sleep(0, loop=loop)
+        tr.set('cnt', int(value or 0) + 1)
+
+    yield from asyncio.gather(*[
+        redis.transaction(incr, 'cnt', max_retries=0)
+        for _ in range(20)], loop=loop)
+    # transactions sharing connection don't lose updates
+    assert (yield from redis.get('cnt')) == b'20'
+    assert redis.connection.stats.watch_retries == 0
+
+
+@pytest.mark.run_loop
+def test_transaction_helper_retry_futures(redis, create_redis, server, loop):
+    other = yield from create_redis(
+        server.tcp_address, loop=loop)
+    errors = []
+    loop.set_exception_handler(lambda loop, ctx: errors.append(ctx))
+    calls = []
+
+    @asyncio.coroutine
+    def conflict(client, tr):
+        calls.append(1)
+        if len(calls) == 1:
+            yield from other.incr('foo')
+        tr.incr('foo')
+        tr.get('foo')
+
+    try:
+        res = yield from redis.transaction(conflict, 'foo', backoff=0)
+        assert res == [2, b'2']
+        gc.collect()
+        # futures of re-tried transaction are not reported
+        assert errors == []
+    finally:
+        loop.set_exception_handler(None)
+
+
+@pytest.mark.run_loop
+def test_transaction_helper_pool(create_pool, server, loop):
+    pool = yield from create_pool(
+        server.tcp_address, loop=loop, minsize=1, maxsize=2)
+    redis = Redis(pool)
+    yield from redis.delete('key:tr')
+
+    @asyncio.coroutine
+    def conflict(client, tr):
+        assert len(pool._used) == 1
+        # other connection is used to change key
+        yield from redis.incr('key:tr')
+        tr.get('key:tr')
+
+    with pytest.raises(WatchVariableError):
+        yield from redis.transaction(conflict, 'key:tr',
+                                     max_retries=1, backoff=0)
+    assert not pool._used
+    assert pool.stats.snapshot()['watch_retries'] == 1
+
+    res = yield from redis.transaction(
+        lambda client, tr: tr.incr('key:tr'), 'key:tr')
+    assert res == [3]
+    assert not pool._used